@@ -0,0 +1,167 @@
+"""Message-dispatch throughput: default asyncio + stdlib JSON vs uvloop + orjson.
+
+Each configuration runs in a fresh interpreter (the loop policy and JSON backend
+are process-wide), feeding synthetic messages through ``discord.Client.dispatch``
+to listeners that do the same JSON work as the archive and bug-log paths.
+
+Usage:
+    python benchmarks/dispatch_bench.py --events 20000 --rounds 3 [--json-out results.json]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+CONFIGS = [
+    ("asyncio", "stdlib"),
+    ("asyncio", "orjson"),
+    ("uvloop", "stdlib"),
+    ("uvloop", "orjson"),
+]
+
+
+def _fake_message(index: int) -> SimpleNamespace:
+    author = SimpleNamespace(id=100_000 + index % 500, name=f"survivor{index % 500}", bot=False)
+    return SimpleNamespace(
+        id=1_000_000 + index,
+        content=f"Scouting report {index}: zombies spotted near sector {index % 97} — send backup ✈️",
+        author=author,
+        channel=SimpleNamespace(id=42, name="ops-chat"),
+        guild=SimpleNamespace(id=7, name="Helles Hub"),
+        attachments=[f"https://cdn.example/{index}.png"] if index % 10 == 0 else [],
+    )
+
+
+async def _run_worker(events: int) -> float:
+    import discord
+
+    from utils import jsonio
+
+    client = discord.Client(intents=discord.Intents.none())
+    done = asyncio.Event()
+    handled = 0
+    expected = events * 2
+
+    def _finish_one() -> None:
+        nonlocal handled
+        handled += 1
+        if handled == expected:
+            done.set()
+
+    async def on_message(message):
+        # Archive-style transcript payload.
+        line = jsonio.dumps(
+            {
+                "id": message.id,
+                "channel": message.channel.name,
+                "author": f"{message.author.name} ({message.author.id})",
+                "content": message.content,
+                "attachments": message.attachments,
+            },
+            ensure_ascii=False,
+        )
+        jsonio.loads(line)
+        _finish_one()
+
+    async def on_message_audit(message):
+        # Bug-log style structured line.
+        jsonio.dumps(
+            {"source": "bench", "guild_id": message.guild.id, "user_id": message.author.id, "note": None},
+            ensure_ascii=False,
+        )
+        _finish_one()
+
+    client.on_message = on_message
+    client.on_message_audit = on_message_audit
+
+    async with client:
+        messages = [_fake_message(i) for i in range(events)]
+        started = time.perf_counter()
+        for message in messages:
+            client.dispatch("message", message)
+            client.dispatch("message_audit", message)
+        await done.wait()
+        return time.perf_counter() - started
+
+
+def _worker_main(args: argparse.Namespace) -> None:
+    from utils import jsonio
+
+    if args.loop == "uvloop":
+        import uvloop
+
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    jsonio.set_backend(args.json)
+
+    seconds = asyncio.run(_run_worker(args.events))
+    print(json.dumps({"seconds": seconds, "events": args.events, "json": jsonio.backend_name()}))
+
+
+def _available(loop: str, codec: str) -> bool:
+    if loop == "uvloop" and importlib.util.find_spec("uvloop") is None:
+        return False
+    if codec == "orjson" and importlib.util.find_spec("orjson") is None:
+        return False
+    return True
+
+
+def _run_config(loop: str, codec: str, events: int) -> float:
+    cmd = [sys.executable, __file__, "--worker", "--loop", loop, "--json", codec, "--events", str(events)]
+    output = subprocess.check_output(cmd, cwd=REPO_ROOT, env={**os.environ, "PYTHONHASHSEED": "0"}, text=True)
+    return json.loads(output.strip().splitlines()[-1])["seconds"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=20_000, help="messages dispatched per round")
+    parser.add_argument("--rounds", type=int, default=3, help="fresh-process rounds per configuration")
+    parser.add_argument("--json-out", type=Path, help="write machine-readable results here")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--loop", default="asyncio", help=argparse.SUPPRESS)
+    parser.add_argument("--json", default="stdlib", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        _worker_main(args)
+        return
+
+    results = []
+    baseline = None
+    print(f"Dispatching {args.events:,} messages × 2 listeners, best of {args.rounds} rounds\n")
+    print(f"{'loop':<8} {'json':<7} {'best s':>8} {'median s':>9} {'msg/s':>10} {'speedup':>8}")
+    for loop, codec in CONFIGS:
+        if not _available(loop, codec):
+            print(f"{loop:<8} {codec:<7} {'skipped (not installed)':>38}")
+            continue
+        timings = [_run_config(loop, codec, args.events) for _ in range(args.rounds)]
+        best = min(timings)
+        baseline = baseline or best
+        rate = args.events / best
+        print(
+            f"{loop:<8} {codec:<7} {best:>8.3f} {statistics.median(timings):>9.3f} "
+            f"{rate:>10,.0f} {baseline / best:>7.2f}x"
+        )
+        results.append(
+            {"loop": loop, "json": codec, "timings": timings, "best": best, "messages_per_second": rate}
+        )
+
+    if args.json_out:
+        args.json_out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nSaved results to {args.json_out}")
+
+
+if __name__ == "__main__":
+    main()
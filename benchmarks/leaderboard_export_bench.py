@@ -0,0 +1,159 @@
+"""Leaderboard export cost: in-memory TSV vs streamed gzip parts.
+
+Seeds a throwaway database with ``--rows`` ranked survivors (XP plus profile
+scans), then exports the network XP board both ways:
+
+* ``in_memory`` — the old path: ``fetchall`` every row, join one TSV string.
+* ``streamed`` — ``iter_leaderboard_rows`` chunks into ``stream_export``.
+
+Peak memory is Python-heap allocations from ``tracemalloc``, so SQLite's own
+page cache is not included in either column.
+
+Usage:
+    python benchmarks/leaderboard_export_bench.py --rows 100000 [--part-mb 8] [--json-out results.json]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+
+def _seed(db_path: str, rows: int, guilds: int) -> None:
+    rng = random.Random(7)
+    conn = sqlite3.connect(db_path)
+    conn.executemany(
+        "INSERT INTO user_stats (guild_id, user_id, xp, level) VALUES (?, ?, ?, ?)",
+        ((1 + i % guilds, 10_000 + i, rng.randrange(0, 500_000), rng.randrange(1, 80)) for i in range(rows)),
+    )
+    conn.executemany(
+        """
+        INSERT INTO profile_snapshots (guild_id, user_id, player_name, server, cp, kills, scan_valid)
+        VALUES (?, ?, ?, ?, ?, ?, 1)
+        """,
+        (
+            (1 + i % guilds, 10_000 + i, f"Survivor{i}", str(rng.randrange(1, 900)), rng.randrange(10**9), rng.randrange(10**6))
+            for i in range(0, rows, 2)
+        ),
+    )
+    conn.commit()
+    conn.close()
+
+
+async def _in_memory(db_path: str) -> dict:
+    import aiosqlite
+
+    async with aiosqlite.connect(db_path) as db:
+        db.row_factory = aiosqlite.Row
+        async with db.execute(
+            """
+            SELECT us.guild_id, us.user_id, us.xp, us.level, ps.server
+            FROM user_stats us
+            LEFT JOIN profile_snapshots ps ON ps.guild_id = us.guild_id AND ps.user_id = us.user_id
+            ORDER BY us.level DESC, us.xp DESC
+            """
+        ) as cursor:
+            rows = await cursor.fetchall()
+    lines = ["\t".join(["Rank", "User", "Level", "XP", "Guild", "Server"])]
+    for idx, row in enumerate(rows, start=1):
+        lines.append(
+            "\t".join(
+                map(str, [idx, f"User {row['user_id']}", row["level"], row["xp"], f"Guild {row['guild_id']}", row["server"] or "—"])
+            )
+        )
+    buffer = io.StringIO("\n".join(lines))
+    return {"rows": len(rows), "bytes": len(buffer.getvalue().encode("utf-8")), "parts": 1}
+
+
+async def _streamed(part_bytes: int) -> dict:
+    from database import iter_leaderboard_rows
+    from utils.leaderboard_export import EXPORT_CHUNK_ROWS, stream_export
+
+    export = await stream_export(
+        iter_leaderboard_rows("global", "xp", chunk_size=EXPORT_CHUNK_ROWS),
+        stem="leaderboard_global",
+        header=["Rank", "User", "Level", "XP", "Guild", "Server"],
+        render=lambda rank, row: [
+            rank,
+            f"User {row['user_id']}",
+            row["level"],
+            row["xp"],
+            f"Guild {row['guild_id']}",
+            row["server"],
+        ],
+        note=lambda total: f"{total} rows",
+        part_bytes=part_bytes,
+    )
+    try:
+        sizes = [part.stat().st_size for part in export.parts]
+        return {"rows": export.rows, "bytes": sum(sizes), "parts": len(sizes), "largest_part": max(sizes)}
+    finally:
+        export.cleanup()
+
+
+async def _measure(label: str, factory) -> dict:
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = await factory()
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"path": label, "seconds": seconds, "peak_mb": peak / 1_048_576, **result}
+
+
+async def _run(args: argparse.Namespace, db_path: str) -> list[dict]:
+    from database import init_db
+
+    await init_db()
+    _seed(db_path, args.rows, args.guilds)
+    part_bytes = int(args.part_mb * 1024 * 1024)
+    results = []
+    for _ in range(args.rounds):
+        results.append(await _measure("in_memory", lambda: _in_memory(db_path)))
+        results.append(await _measure("streamed", lambda: _streamed(part_bytes)))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="ranked survivors to seed")
+    parser.add_argument("--guilds", type=int, default=50, help="sectors the survivors are spread across")
+    parser.add_argument("--rounds", type=int, default=2, help="exports per path")
+    parser.add_argument("--part-mb", type=float, default=8.0, help="attachment budget per export part")
+    parser.add_argument("--json-out", type=Path, help="write machine-readable results here")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="leaderboard_bench_") as workdir:
+        db_path = str(Path(workdir) / "bench.db")
+        # database resolves its path at import time, so point it at the scratch file first.
+        os.environ["MARCIA_DB_PATH"] = db_path
+        results = asyncio.run(_run(args, db_path))
+
+    print(f"Exporting {args.rows:,} network XP rows, {args.rounds} round(s) per path\n")
+    print(f"{'path':<10} {'seconds':>8} {'peak MB':>8} {'file MB':>8} {'parts':>6}")
+    for entry in results:
+        print(
+            f"{entry['path']:<10} {entry['seconds']:>8.2f} {entry['peak_mb']:>8.1f} "
+            f"{entry['bytes'] / 1_048_576:>8.2f} {entry['parts']:>6}"
+        )
+
+    if args.json_out:
+        args.json_out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"\nSaved results to {args.json_out}")
+
+
+if __name__ == "__main__":
+    main()
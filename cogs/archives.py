@@ -4,7 +4,6 @@ USE: Local file-system logging for server intel and member activity. All logging
 backfilling or recording events.
 """
 import datetime
-import json
 import os
 from typing import AsyncIterator
 
@@ -12,6 +11,8 @@ import discord
 from discord.ext import commands
 
 from database import is_channel_ignored
+from utils import jsonio
+from utils.boot_timeline import boot_span
 
 class Archives(commands.Cog):
     def __init__(self, bot):
@@ -57,7 +58,7 @@ class Archives(commands.Cog):
                 "joined_at": str(m.joined_at)
             })
         with open(os.path.join(path, "members.json"), "w", encoding="utf-8") as f:
-            json.dump(member_data, f, indent=4)
+            jsonio.dump(member_data, f, indent=4)
 
     def log_action(self, guild, user, action):
         path = self.get_server_path(guild)
@@ -75,7 +76,7 @@ class Archives(commands.Cog):
         """Hydrate the in-memory seeded cache from disk markers."""
         try:
             with open(self._seed_marker_path(guild), "r", encoding="utf-8") as f:
-                payload = json.load(f)
+                payload = jsonio.load(f)
         except FileNotFoundError:
             return
         except Exception:
@@ -98,7 +99,7 @@ class Archives(commands.Cog):
 
         try:
             with open(self._seed_marker_path(guild), "w", encoding="utf-8") as f:
-                json.dump(payload, f, indent=4)
+                jsonio.dump(payload, f, indent=4)
         except Exception:
             return
 
@@ -160,16 +161,17 @@ class Archives(commands.Cog):
     @commands.Cog.listener()
     async def on_ready(self):
         # When bot starts, update info for all servers
-        for guild in self.bot.guilds:
-            await self.update_server_files(guild)
+        with boot_span(self.bot, "archives.server_files", guilds=len(self.bot.guilds)):
+            for guild in self.bot.guilds:
+                await self.update_server_files(guild)
 
-            # Hydrate seeded cache so we do not double-write history on restarts
-            self._restore_seed_state(guild)
+                # Hydrate seeded cache so we do not double-write history on restarts
+                self._restore_seed_state(guild)
 
-            if self._should_log_message(guild):
-                async for channel in self._iter_log_targets(guild):
-                    if channel.id not in self._seeded_channels:
-                        self.bot.loop.create_task(self._seed_chat_history(guild, channel))
+                if self._should_log_message(guild):
+                    async for channel in self._iter_log_targets(guild):
+                        if channel.id not in self._seeded_channels:
+                            self.bot.loop.create_task(self._seed_chat_history(guild, channel))
 
     @commands.Cog.listener()
     async def on_guild_channel_create(self, channel: discord.abc.GuildChannel):
@@ -301,19 +303,20 @@ class Archives(commands.Cog):
             return
 
         try:
-            async for message in channel.history(limit=None, oldest_first=True):
-                content = message.content or "[No content]"
-                line = (
-                    f"MESSAGE {message.id} | #{channel.name} ({channel.id}) | "
-                    f"{message.author} ({message.author.id}): {content}"
-                )
-                line += self._format_attachments(message)
-                self._write_chat_log(
-                    guild,
-                    channel,
-                    line,
-                    timestamp=message.created_at or datetime.datetime.now(),
-                )
+            with boot_span(self.bot, "archives.backfill"):
+                async for message in channel.history(limit=None, oldest_first=True):
+                    content = message.content or "[No content]"
+                    line = (
+                        f"MESSAGE {message.id} | #{channel.name} ({channel.id}) | "
+                        f"{message.author} ({message.author.id}): {content}"
+                    )
+                    line += self._format_attachments(message)
+                    self._write_chat_log(
+                        guild,
+                        channel,
+                        line,
+                        timestamp=message.created_at or datetime.datetime.now(),
+                    )
         except Exception as exc:
             print(
                 f"[Archives] Failed to seed history for {channel} ({channel.id}): {exc}",
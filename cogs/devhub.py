@@ -13,6 +13,7 @@ import discord
 from discord.ext import commands, tasks
 
 from database import activity_metric_totals, command_usage_totals, top_commands, total_active_missions
+from utils.boot_timeline import boot_span
 from utils.patch_notes import PatchNotesStore
 
 DEV_GUILD_ID = 1455313963507257486
@@ -156,18 +157,19 @@ class DevServerManager(commands.Cog):
     async def _bootstrap(self):
         await self.bot.wait_until_ready()
 
-        for guild_id in (DEV_GUILD_ID, TEST_GUILD_ID):
-            guild = self.bot.get_guild(guild_id)
-            if not guild:
-                logger.warning("Managed guild not found (ID: %s)", guild_id)
-                continue
+        with boot_span(self.bot, "devhub.bootstrap"):
+            for guild_id in (DEV_GUILD_ID, TEST_GUILD_ID):
+                guild = self.bot.get_guild(guild_id)
+                if not guild:
+                    logger.warning("Managed guild not found (ID: %s)", guild_id)
+                    continue
 
-            await self._ensure_channels(guild)
-            await self._publish_info_panel(guild)
-            await self._post_patch_notes(guild)
+                await self._ensure_channels(guild)
+                await self._publish_info_panel(guild)
+                await self._post_patch_notes(guild)
 
-            if guild_id == TEST_GUILD_ID:
-                await self._ensure_test_hub_layout(guild)
+                if guild_id == TEST_GUILD_ID:
+                    await self._ensure_test_hub_layout(guild)
 
         if not self.info_updater.is_running():
             self.info_updater.start()
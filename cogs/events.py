@@ -11,6 +11,7 @@ import logging
 from datetime import datetime, timezone, timedelta
 from utils.assets import TIMED_REMINDERS, DRONE_NAMES, MARCIA_STATUSES, MARCIA_SYSTEM_LINES
 from utils.time_utils import now_game, game_to_utc, format_game, utc_to_game
+from utils.boot_timeline import boot_span
 from database import (
     add_mission,
     add_template,
@@ -444,25 +445,26 @@ class Events(commands.Cog):
     async def recover_missions(self):
         """Reloads active missions from SQL on startup."""
         await self.bot.wait_until_ready()
-        all_missions = await get_all_active_missions()
-        for m in all_missions:
-            try:
-                utc_dt = datetime.fromisoformat(m['target_utc']).astimezone(timezone.utc)
-                if utc_dt > datetime.now(timezone.utc):
-                    task_key = f"{m['guild_id']}_{m['codename']}"
-                    self.running_tasks[task_key] = self.bot.loop.create_task(
-                        self.manage_reminders(
-                            m['codename'],
-                            m['description'],
-                            utc_dt,
-                            m['guild_id'],
-                            location=m.get('location'),
-                            ping_role_id=m.get('ping_role_id'),
+        with boot_span(self.bot, "events.recover_missions"):
+            all_missions = await get_all_active_missions()
+            for m in all_missions:
+                try:
+                    utc_dt = datetime.fromisoformat(m['target_utc']).astimezone(timezone.utc)
+                    if utc_dt > datetime.now(timezone.utc):
+                        task_key = f"{m['guild_id']}_{m['codename']}"
+                        self.running_tasks[task_key] = self.bot.loop.create_task(
+                            self.manage_reminders(
+                                m['codename'],
+                                m['description'],
+                                utc_dt,
+                                m['guild_id'],
+                                location=m.get('location'),
+                                ping_role_id=m.get('ping_role_id'),
+                            )
                         )
-                    )
-                else:
-                    await delete_mission(m['guild_id'], m['codename'])
-            except: pass
+                    else:
+                        await delete_mission(m['guild_id'], m['codename'])
+                except: pass
 
     @tasks.loop(minutes=5)
     async def check_duel_reset(self):
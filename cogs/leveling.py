@@ -7,11 +7,11 @@ import discord
 from discord import app_commands
 from discord.errors import HTTPException
 from discord.ext import commands
-import io
 import json
 import os
 import random
 import time
+from collections import OrderedDict
 import aiosqlite
 from datetime import datetime, timezone
 from utils.bug_logging import log_command_exception
@@ -41,7 +41,11 @@ from database import (
     update_scavenge_time,
     update_user_xp,
     add_to_inventory,
+    iter_leaderboard_rows,
+    bump_write_version,
+    table_write_versions,
 )
+from utils.leaderboard_export import EXPORT_CHUNK_ROWS, LeaderboardExport, stream_export
 
 XP_PER_MESSAGE = 12
 BASE_XP = 120
@@ -96,9 +100,73 @@ LEADERBOARD_METRICS = {
     **PROFILE_STAT_LABELS,
 }
 
+LEADERBOARD_CACHE_TTL = float(os.getenv("LEADERBOARD_CACHE_TTL", "60"))
+LEADERBOARD_CACHE_MAX_ENTRIES = 256
+
+
+def _leaderboard_tables(scope: str, metric: str) -> tuple[str, ...]:
+    if metric != "xp":
+        return ("profile_snapshots",)
+    # Network XP rows carry the scanned server, so profile writes can change them too.
+    return ("user_stats", "profile_snapshots") if scope == "global" else ("user_stats",)
+
+
+class LeaderboardCache:
+    """Ranked rows keyed by ``(scope, guild, metric, limit)``.
+
+    An entry is served while it is younger than ``ttl`` and the write versions of
+    the tables behind it match what they were at load time, so switching
+    dropdowns or several members browsing the same board reuse one query.
+    Sector boards watch their own guild's versions, so XP earned elsewhere does
+    not evict them; network boards share ``guild=None`` and the table-wide versions.
+    """
+
+    def __init__(self, ttl: float = LEADERBOARD_CACHE_TTL, max_entries: int = LEADERBOARD_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple, tuple[tuple[int, ...], float, list[dict]]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    async def rows(self, scope: str, guild_id: int, metric: str, limit: int) -> list[dict]:
+        scope = "global" if scope == "global" else "local"
+        key = (scope, None if scope == "global" else guild_id, metric, limit)
+        versions = table_write_versions(key[1], *_leaderboard_tables(scope, metric))
+        entry = self._entries.get(key)
+        if entry and entry[0] == versions and time.monotonic() < entry[1]:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2]
+
+        self.misses += 1
+        rows = [dict(row) for row in await self._load(scope, guild_id, metric, limit)]
+        # Store the versions read before the query: a write that lands mid-query forces a reload next time.
+        self._entries[key] = (versions, time.monotonic() + self.ttl, rows)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return rows
+
+    @staticmethod
+    async def _load(scope: str, guild_id: int, metric: str, limit: int):
+        if metric == "xp":
+            if scope == "global":
+                return await top_global_xp(limit)
+            return await top_xp_leaderboard(guild_id, limit)
+        if scope == "global":
+            return await top_global_profile_stat(metric, limit)
+        return await top_profile_stat(guild_id, metric, limit)
+
+    def summary(self) -> str:
+        lookups = self.hits + self.misses
+        hit_rate = f"{self.hits / lookups:.0%}" if lookups else "—"
+        return f"{len(self._entries)} boards cached | {self.hits} hits / {self.misses} misses ({hit_rate})"
+
+
 class Leveling(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.leaderboard_cache = LeaderboardCache()
 
     async def _safe_send(self, ctx, *, ephemeral: bool = False, **kwargs):
         """Send a response for both message and slash contexts without double-acking."""
@@ -621,7 +689,7 @@ class Leveling(commands.Cog):
             )
 
         if metric == "xp" and scope != "global":
-            rows = await top_xp_leaderboard(guild.id, limit)
+            rows = await self.leaderboard_cache.rows(scope, guild.id, metric, limit)
             if not rows:
                 return discord.Embed(
                     title="🏆 Sector XP",
@@ -648,7 +716,7 @@ class Leveling(commands.Cog):
             return embed
 
         if metric == "xp" and scope == "global":
-            rows = await top_global_xp(limit)
+            rows = await self.leaderboard_cache.rows(scope, guild.id, metric, limit)
             if not rows:
                 return discord.Embed(
                     title="🌐 Network Leaderboard",
@@ -671,12 +739,7 @@ class Leveling(commands.Cog):
                 guild_name = source_guild.name if source_guild else f"Guild {row['guild_id']}"
                 user = self.bot.get_user(row["user_id"])
                 user_display = user.mention if user else f"<@{row['user_id']}>"
-                snapshot = await get_profile_snapshot(row["guild_id"], row["user_id"])
-                server_info = (
-                    f" | Server {snapshot['server']}"
-                    if snapshot and snapshot.get("scan_valid", 1) and snapshot.get("server")
-                    else ""
-                )
+                server_info = f" | Server {row['server']}" if row.get("server") else ""
                 lines.append(
                     f"**{idx}. {user_display}** — Level {row['level']} | {row['xp']:,} XP ({guild_name}{server_info})"
                 )
@@ -688,7 +751,7 @@ class Leveling(commands.Cog):
 
         stat_label, emoji = PROFILE_STAT_LABELS.get(metric, (metric.title(), "📈"))
         if scope == "global":
-            rows = await top_global_profile_stat(metric, limit)
+            rows = await self.leaderboard_cache.rows(scope, guild.id, metric, limit)
             if not rows:
                 return discord.Embed(
                     title=f"{emoji} {stat_label} Leaderboard",
@@ -708,8 +771,7 @@ class Leveling(commands.Cog):
                 user = self.bot.get_user(row["user_id"])
                 user_display = user.mention if user else f"<@{row['user_id']}>"
                 name = row["player_name"] or user_display
-                server_value = row["server"] if "server" in row.keys() else None
-                server_info = f" | Server {server_value}" if server_value else ""
+                server_info = f" | Server {row['server']}" if row.get("server") else ""
                 lines.append(
                     f"**{idx}.** {name} — {self._format_metric(row['value'])} ({guild_name}{server_info})"
                 )
@@ -719,7 +781,7 @@ class Leveling(commands.Cog):
             )
             return embed
 
-        rows = await top_profile_stat(guild.id, metric, limit)
+        rows = await self.leaderboard_cache.rows(scope, guild.id, metric, limit)
         if not rows:
             return discord.Embed(
                 title=f"{emoji} {stat_label} Leaderboard",
@@ -762,87 +824,80 @@ class Leveling(commands.Cog):
         guild: discord.Guild | None,
         scope: str,
         metric: str,
-        limit: int,
-    ) -> tuple[io.StringIO, str, str] | None:
+    ) -> LeaderboardExport | None:
+        """Stream every ranked survivor into gzip TSV parts sized for Discord uploads."""
         if not guild:
             return None
 
-        rows: list[dict] = []
-        headers: list[str]
-        filename: str
-        note: str
+        chunks = iter_leaderboard_rows(scope, metric, guild.id, chunk_size=EXPORT_CHUNK_ROWS)
+
+        def _guild_name(guild_id: int) -> str:
+            source_guild = self.bot.get_guild(guild_id)
+            return source_guild.name if source_guild else f"Guild {guild_id}"
+
+        def _user_name(user_id: int) -> str:
+            user = self.bot.get_user(user_id)
+            return user.name if user else f"User {user_id}"
 
         if metric == "xp" and scope != "global":
-            rows = await top_xp_leaderboard(guild.id, limit)
-            if not rows:
-                return None
-            headers = ["Rank", "User", "Level", "XP"]
-            filename = f"leaderboard_sector_{guild.id}.tsv"
-            note = f"Sector XP leaderboard (top {len(rows)})."
-            lines = ["\t".join(headers)]
-            for idx, row in enumerate(rows, start=1):
+
+            def _render(rank, row):
                 member = guild.get_member(row["user_id"])
                 name = member.display_name if member else f"User {row['user_id']}"
-                lines.append("\t".join(map(str, [idx, name, row["level"], row["xp"]])))
-        elif metric == "xp" and scope == "global":
-            rows = await top_global_xp(limit)
-            if not rows:
-                return None
-            headers = ["Rank", "User", "Level", "XP", "Guild", "Server"]
-            filename = "leaderboard_global.tsv"
-            note = f"Network XP leaderboard (top {len(rows)})."
-            lines = ["\t".join(headers)]
-            for idx, row in enumerate(rows, start=1):
-                source_guild = self.bot.get_guild(row["guild_id"])
-                guild_name = source_guild.name if source_guild else f"Guild {row['guild_id']}"
-                user = self.bot.get_user(row["user_id"])
-                user_display = user.name if user else f"User {row['user_id']}"
-                snapshot = await get_profile_snapshot(row["guild_id"], row["user_id"])
-                server_num = snapshot.get("server") if snapshot and snapshot.get("scan_valid", 1) else "—"
-                lines.append(
-                    "\t".join(
-                        map(
-                            str,
-                            [idx, user_display, row["level"], row["xp"], guild_name, server_num],
-                        )
-                    )
-                )
-        elif scope == "global":
-            stat_label, _ = PROFILE_STAT_LABELS.get(metric, (metric.title(), ""))
-            rows = await top_global_profile_stat(metric, limit)
-            if not rows:
-                return None
-            headers = ["Rank", "User", stat_label, "Server", "Guild"]
-            filename = f"leaderboard_global_{metric}.tsv"
-            note = f"Global {stat_label} leaderboard (top {len(rows)})."
-            lines = ["\t".join(headers)]
-            for idx, row in enumerate(rows, start=1):
-                source_guild = self.bot.get_guild(row["guild_id"])
-                guild_name = source_guild.name if source_guild else f"Guild {row['guild_id']}"
-                user = self.bot.get_user(row["user_id"])
-                user_display = user.name if user else f"User {row['user_id']}"
-                name = row["player_name"] or user_display
-                server_num = row.get("server") or "—"
-                lines.append(
-                    "\t".join(map(str, [idx, name, row["value"], server_num, guild_name]))
-                )
-        else:
-            stat_label, _ = PROFILE_STAT_LABELS.get(metric, (metric.title(), ""))
-            rows = await top_profile_stat(guild.id, metric, limit)
-            if not rows:
-                return None
-            headers = ["Rank", "User", stat_label]
-            filename = f"leaderboard_{metric}_{guild.id}.tsv"
-            note = f"{stat_label} leaderboard (top {len(rows)})."
-            lines = ["\t".join(headers)]
-            for idx, row in enumerate(rows, start=1):
-                member = guild.get_member(row["user_id"])
-                name = row["player_name"] or (member.display_name if member else f"User {row['user_id']}")
-                lines.append("\t".join(map(str, [idx, name, row["value"]])))
+                return [rank, name, row["level"], row["xp"]]
+
+            return await stream_export(
+                chunks,
+                stem=f"leaderboard_sector_{guild.id}",
+                header=["Rank", "User", "Level", "XP"],
+                render=_render,
+                note=lambda total: f"Sector XP leaderboard ({total:,} survivors).",
+            )
+
+        if metric == "xp":
+            return await stream_export(
+                chunks,
+                stem="leaderboard_global",
+                header=["Rank", "User", "Level", "XP", "Guild", "Server"],
+                render=lambda rank, row: [
+                    rank,
+                    _user_name(row["user_id"]),
+                    row["level"],
+                    row["xp"],
+                    _guild_name(row["guild_id"]),
+                    row["server"],
+                ],
+                note=lambda total: f"Network XP leaderboard ({total:,} survivors).",
+            )
+
+        stat_label, _ = PROFILE_STAT_LABELS.get(metric, (metric.title(), ""))
+        if scope == "global":
+            return await stream_export(
+                chunks,
+                stem=f"leaderboard_global_{metric}",
+                header=["Rank", "User", stat_label, "Server", "Guild"],
+                render=lambda rank, row: [
+                    rank,
+                    row["player_name"] or _user_name(row["user_id"]),
+                    row["value"],
+                    row["server"],
+                    _guild_name(row["guild_id"]),
+                ],
+                note=lambda total: f"Global {stat_label} leaderboard ({total:,} survivors).",
+            )
 
-        buffer = io.StringIO("\n".join(lines))
-        buffer.seek(0)
-        return buffer, filename, note
+        def _render_stat(rank, row):
+            member = guild.get_member(row["user_id"])
+            name = row["player_name"] or (member.display_name if member else f"User {row['user_id']}")
+            return [rank, name, row["value"]]
+
+        return await stream_export(
+            chunks,
+            stem=f"leaderboard_{metric}_{guild.id}",
+            header=["Rank", "User", stat_label],
+            render=_render_stat,
+            note=lambda total: f"{stat_label} leaderboard ({total:,} survivors).",
+        )
 
     @commands.hybrid_command(description="Browse XP and profile scan leaderboards from one menu.")
     async def leaderboard(self, ctx):
@@ -894,6 +949,7 @@ class Leveling(commands.Cog):
                             ON CONFLICT(guild_id, user_id, item_id) DO UPDATE SET quantity = quantity + 1
                         ''', (ctx.guild.id, user_id, name))
                 await db.commit()
+            bump_write_version("user_stats", ctx.guild.id)
             
             await ctx.send(f"✅ **Sector Data Restored.** Migrated {len(old_data)} user profiles to database.")
         except Exception as e:
@@ -1052,30 +1108,37 @@ class ExportLeaderboardButton(discord.ui.Button):
                 "Only the original requester can export this leaderboard.", ephemeral=True
             )
 
+        # Full exports can take a few seconds to stream; acknowledge before Discord's 3s window closes.
+        await interaction.response.defer(ephemeral=True, thinking=True)
         export = await self.parent_view.cog._export_leaderboard_data(
             self.parent_view.guild,
             self.parent_view.scope,
             self.parent_view.metric,
-            self.parent_view.limit,
         )
         if not export:
-            return await interaction.response.send_message(
+            return await interaction.followup.send(
                 "No leaderboard data available to export yet.", ephemeral=True
             )
 
-        buffer, filename, note = export
-        file = discord.File(buffer, filename=filename)
-
         try:
-            await interaction.user.send(content=note, file=file)
+            batches = export.batches()
+            for index, batch in enumerate(batches, start=1):
+                content = export.note
+                if len(batches) > 1:
+                    content += f" (message {index}/{len(batches)})"
+                files = [discord.File(path, filename=path.name) for path in batch]
+                await interaction.user.send(content=content, files=files)
         except discord.Forbidden:
-            return await interaction.response.send_message(
+            return await interaction.followup.send(
                 "I couldn't DM you. Please enable DMs from server members and try again.",
                 ephemeral=True,
             )
+        finally:
+            export.cleanup()
 
-        await interaction.response.send_message(
-            f"📤 Sent you **{filename}** with the current leaderboard.", ephemeral=True
+        names = ", ".join(f"**{name}**" for name in export.filenames)
+        await interaction.followup.send(
+            f"📤 Sent you {names} with the full leaderboard ({export.rows:,} rows).", ephemeral=True
         )
 
 
@@ -5,22 +5,24 @@ FEATURES: Channel-scoped intake, scan parsing, profile views, and leaderboard qu
 """
 
 import asyncio
-import importlib.util
-import io
-import json
+import hashlib
+import itertools
 import logging
-import re
 import os
 import random
+import time
+from collections import Counter, defaultdict, deque
 from datetime import datetime, timezone
 from pathlib import Path
 
 import discord
 from discord.errors import HTTPException
 from discord.ext import commands
-import httpx
 
 from database import (
+    clear_rescan_checkpoint,
+    profile_image_store_totals,
+    get_cached_ocr_result,
     get_profile_channel,
     get_profile_snapshot,
     get_profile_snapshots,
@@ -28,107 +30,53 @@ from database import (
     delete_profile_snapshot,
     set_profile_scan_valid,
     set_profile_channel,
+    store_ocr_result,
     upsert_profile_snapshot,
 )
 from utils.assets import PROFILE_SEALS, PROFILE_TAGLINES
 from ocr.diagnostics import collect_ocr_diagnostics
+from ocr.engine import (
+    BOXES_PATH,
+    OcrEngine,
+    ScanImage,
+    default_torch_threads,
+    has_profile_metrics,
+    load_layouts,
+    parse_profile_text,
+    template_version,
+    tesseract_installed,
+    vision_installed,
+)
+from ocr.job_queue import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTAKE,
+    PRIORITY_INTERACTIVE,
+    OcrJobQueue,
+    OcrJobSuperseded,
+    OcrQueueFull,
+    QueueSlot,
+)
+from ocr.image_store import ProfileImageStore
+from ocr.near_duplicates import NearDuplicateIndex
+from ocr.ocr_space import OcrSpaceClient
+from ocr.rescan import RescanProgress, rescan_profiles
+from ocr.worker_pool import OcrWorkerPool
+from utils.boot_timeline import boot_span
+from utils.process_stats import format_bytes
 
-_PIL_SPEC = importlib.util.find_spec("PIL")
-_PYTESSERACT_SPEC = importlib.util.find_spec("pytesseract")
-_CV2_SPEC = importlib.util.find_spec("cv2")
-_EASYOCR_SPEC = importlib.util.find_spec("easyocr")
-
-if _PIL_SPEC:
-    from PIL import Image
-else:  # pragma: no cover - optional dependency guard
-    Image = None
-
-if _PYTESSERACT_SPEC:
-    import pytesseract
-else:  # pragma: no cover - optional dependency guard
-    pytesseract = None
-
-if _CV2_SPEC and _EASYOCR_SPEC:
-    import cv2
-    import easyocr
-    import numpy as np
-else:  # pragma: no cover - optional dependency guard
-    cv2 = None
-    easyocr = None
-    np = None
-
-
-NUMBER_RE = re.compile(r"(?P<value>[\d.,]+)\s*(?P<suffix>[kmbKMB]?)")
-LABEL_HINTS = {
-    "cp": ("cp", "power", "battle power", "total power", "combat power"),
-    "kills": ("kills", "defeats", "defeated", "eliminations", "total kills"),
-    "likes": ("likes", "like", "likes received"),
-    "vip_level": ("vip", "vip level", "vip lvl", "vip lv"),
-    "alliance": ("alliance", "all", "guild"),
-    "server": ("server", "state", "world"),
-}
-
-BOXES_PATH = Path(__file__).resolve().parent.parent / "ocr" / "boxes_ratios.json"
-EASYOCR_LANGS = ["en"]
-EASYOCR_MIN_CONF = 0.45
-EASYOCR_FIELDS = {
-    "name": "player_name",
-    "cp": "cp",
-    "kills": "kills",
-    "alliance": "alliance",
-    "server": "server",
-    "likes": "likes",
-    "vip": "vip_level",
-}
-VERIFY_FIELDS = {"account_btn", "settings_btn"}
-VERIFY_MIN_CONF = 0.25
-OCR_SPACE_API_KEY = os.getenv("OCR_SPACE_API_KEY")
-OCR_SPACE_ENDPOINT = "https://api.ocr.space/parse/image"
-
-
-def _extract_number(chunk: str) -> int | None:
-    match = NUMBER_RE.search(chunk)
-    if not match:
-        return None
-
-    raw = match.group("value").replace(",", "")
-    try:
-        value = float(raw)
-    except ValueError:
-        return None
-
-    suffix = match.group("suffix").lower()
-    if suffix == "k":
-        value *= 1_000
-    elif suffix == "m":
-        value *= 1_000_000
-    elif suffix == "b":
-        value *= 1_000_000_000
-
-    return int(value)
-
-
-def _parse_profile_text(text: str) -> dict:
-    """Pull out the most likely values for each supported field."""
-
-    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
-    results: dict[str, str | int | None] = {}
-
-    if lines:
-        results["player_name"] = lines[0]
 
-    for line in lines:
-        lowered = line.lower()
-        for field, hints in LABEL_HINTS.items():
-            if field in results and results[field] is not None:
-                continue
-            if any(hint in lowered for hint in hints):
-                if field in {"alliance", "server"}:
-                    value = line.split(":", 1)[-1].strip() if ":" in line else line
-                    results[field] = value
-                else:
-                    results[field] = _extract_number(line)
-    return results
+OCR_SPACE_API_KEY = os.getenv("OCR_SPACE_API_KEY")
+OCR_CACHE_MAX_ENTRIES = int(os.getenv("OCR_CACHE_MAX_ENTRIES", "2000"))
+OCR_NEAR_DUP_DISTANCE = int(os.getenv("OCR_NEAR_DUP_DISTANCE", "6"))
+OCR_NEAR_DUP_TTL = float(os.getenv("OCR_NEAR_DUP_TTL", "3600"))
+PROFILE_SCAN_CONCURRENCY = int(os.getenv("PROFILE_SCAN_CONCURRENCY", "2"))
+OCR_QUEUE_MAX = int(os.getenv("OCR_QUEUE_MAX", "50"))
+OCR_WARMUP = os.getenv("OCR_WARMUP", "0").lower() in {"1", "true", "yes"}
+# "roi" reads the template crops with per-field Tesseract settings; "full" keeps the whole-image pass.
+OCR_TESSERACT_MODE = os.getenv("OCR_TESSERACT_MODE", "roi").lower()
+PROFILE_IMAGE_HISTORY = int(os.getenv("PROFILE_IMAGE_HISTORY", "5"))
+PROFILE_IMAGE_MAX_MB = int(os.getenv("PROFILE_IMAGE_MAX_MB", "2048"))
+QUEUE_FULL_MESSAGE = "📥 The scan queue is full right now. Try again in a few minutes."
 
 
 def _format_metric(value: int | None) -> str:
@@ -139,18 +87,51 @@ class ProfileScanner(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.log = logging.getLogger("MarciaOS.ProfileScanner")
-        self._easyocr_reader: easyocr.Reader | None = None
-        self._easyocr_boxes: dict[str, list[float]] | None = None
-        self._easyocr_ready: bool | None = None
-        self._easyocr_failure_reason: str | None = None
+        # In-process scans share one torch pool; size it for the scan concurrency.
+        self.engine = OcrEngine(torch_threads=default_torch_threads(PROFILE_SCAN_CONCURRENCY))
         self._easyocr_lock = asyncio.Lock()
-        self._pytesseract_missing = False
-        self._scan_semaphore = asyncio.Semaphore(
-            int(os.getenv("PROFILE_SCAN_CONCURRENCY", "2"))
+        # Queue workers are the only concurrency cap on OCR (uploads and rescans alike);
+        # cache hits release their reserved slot without entering the queue.
+        self.scan_queue = OcrJobQueue(workers=PROFILE_SCAN_CONCURRENCY, max_pending=OCR_QUEUE_MAX)
+        self._rescan_jobs = itertools.count()
+        # EasyOCR runs in dedicated worker processes unless OCR_WORKERS=0.
+        self.ocr_pool = OcrWorkerPool.from_env(warm_up=OCR_WARMUP)
+        self._warmup_task: asyncio.Task | None = None
+        self.warmup_seconds: float | None = None
+        self.scan_stats: Counter[str] = Counter()
+        # End-to-end seconds of scans that actually ran OCR (cache hits excluded).
+        self.scan_latencies: deque[float] = deque(maxlen=500)
+        self.near_duplicates = NearDuplicateIndex(
+            max_distance=OCR_NEAR_DUP_DISTANCE, ttl=OCR_NEAR_DUP_TTL if OCR_NEAR_DUP_TTL > 0 else None
         )
+        self.layout_stats: defaultdict[str, Counter[str]] = defaultdict(Counter)
+        # Per guild: uploads rejected on the button crops alone and the OCR work that skipped.
+        self.verify_savings: defaultdict[int, Counter[str]] = defaultdict(Counter)
+        self._rescan_task: asyncio.Task | None = None
+        # One pooled client for the cog's lifetime; closed in cog_unload.
+        self.ocr_space = OcrSpaceClient.from_env(OCR_SPACE_API_KEY) if OCR_SPACE_API_KEY else None
+        self.image_store = ProfileImageStore(
+            history=PROFILE_IMAGE_HISTORY,
+            max_bytes=PROFILE_IMAGE_MAX_MB * 1024 * 1024 if PROFILE_IMAGE_MAX_MB > 0 else None,
+        )
+        self._legacy_image_task: asyncio.Task | None = None
+        self.rescan_progress: RescanProgress | None = None
+
+    async def cog_load(self):
+        self.scan_queue.start()
 
     async def cog_unload(self):
-        pass
+        if self._warmup_task:
+            self._warmup_task.cancel()
+        if self._rescan_task:
+            self._rescan_task.cancel()
+        if self._legacy_image_task:
+            self._legacy_image_task.cancel()
+        self.scan_queue.stop()
+        if self.ocr_pool:
+            self.ocr_pool.shutdown()
+        if self.ocr_space:
+            await self.ocr_space.aclose()
 
     async def _safe_send(self, ctx, *, ephemeral: bool = False, **kwargs):
         interaction = getattr(ctx, "interaction", None)
@@ -226,20 +207,20 @@ class ProfileScanner(commands.Cog):
         await self._safe_defer(ctx, ephemeral=True)
 
         try:
-            image_bytes = await image.read()
-        except Exception as exc:  # pragma: no cover - network edge
-            self.log.warning("Could not read attachment: %s", exc)
+            scanned = await self._scan_attachment(ctx.author, image, PRIORITY_INTERACTIVE)
+        except OcrQueueFull:
+            return await self._safe_send(ctx, content=QUEUE_FULL_MESSAGE, ephemeral=True)
+        except OcrJobSuperseded:
+            return await self._safe_send(
+                ctx,
+                content="⏭️ A newer screenshot from you replaced this one in the scan queue.",
+                ephemeral=True,
+            )
+
+        if scanned is None:
             return await self._safe_send(ctx, content="I couldn't read that image.", ephemeral=True)
 
-        cached_path = self._persist_profile_image(
-            ctx.guild.id, ctx.author.id, image_bytes, image.filename
-        )
-        parsed, raw_text, ocr_note = await self._perform_ocr(
-            image_bytes, filename=image.filename, persisted_path=cached_path
-        )
-        payload = self._build_payload(
-            ctx.author, image.url, parsed, raw_text, cached_path
-        )
+        payload, ocr_note = scanned
         if payload.get("ownership_verified") is False:
             return await self._safe_send(
                 ctx,
@@ -340,6 +321,79 @@ class ProfileScanner(commands.Cog):
         if isinstance(message, discord.Message):
             view.bind_message(message)
 
+    @commands.hybrid_command(
+        name="rescan_profiles",
+        description="Re-run OCR on this server's stored profile screenshots after a template update.",
+    )
+    @commands.has_permissions(manage_guild=True)
+    async def rescan_profiles_command(self, ctx, restart: bool = False):
+        if not ctx.guild:
+            return await self._safe_send(ctx, content="Rescans only work inside servers.", ephemeral=True)
+        if self._rescan_task and not self._rescan_task.done():
+            status = self.rescan_progress.summary() if self.rescan_progress else "starting"
+            return await self._safe_send(ctx, content=f"🔁 A rescan is already running: {status}", ephemeral=True)
+
+        await self._safe_defer(ctx, ephemeral=True)
+        if not await self._ensure_easyocr():
+            reason = self.engine.failure_reason or "EasyOCR is not ready."
+            return await self._safe_send(ctx, content=f"⚠️ Can't rescan: {reason}", ephemeral=True)
+
+        message = await self._safe_send(
+            ctx, content="🔁 Rescanning stored profile screenshots…", ephemeral=True
+        )
+        self._rescan_task = asyncio.create_task(
+            self._run_rescan(ctx.guild.id, message if isinstance(message, discord.Message) else None, restart),
+            name=f"profile-rescan-{ctx.guild.id}",
+        )
+
+    async def _run_rescan(self, guild_id: int, message: discord.Message | None, restart: bool) -> None:
+        job = f"guild-{guild_id}"
+        if restart:
+            await clear_rescan_checkpoint(job)
+        last_edit = 0.0
+
+        async def _report(progress: RescanProgress) -> None:
+            nonlocal last_edit
+            self.rescan_progress = progress
+            if message is None or time.monotonic() - last_edit < 10:
+                return
+            last_edit = time.monotonic()
+            try:
+                await message.edit(content=f"🔁 Rescanning… {progress.summary()}")
+            except HTTPException:
+                pass
+
+        try:
+            # Rescan scans run as background queue jobs, behind every upload, on the same workers.
+            progress = await rescan_profiles(
+                self._queue_rescan_scan,
+                job=job,
+                guild_id=guild_id,
+                window=max(1, PROFILE_SCAN_CONCURRENCY),
+                on_progress=_report,
+            )
+        except Exception:
+            self.log.exception("Profile rescan for guild %s failed; rerun /rescan_profiles to resume", guild_id)
+            if message is not None:
+                try:
+                    await message.edit(content="⚠️ Rescan stopped early. Run `/rescan_profiles` again to resume.")
+                except HTTPException:
+                    pass
+            return
+
+        self.rescan_progress = progress
+        if message is not None:
+            try:
+                await message.edit(content=f"✅ Rescan finished: {progress.summary()}")
+            except HTTPException:
+                pass
+
+    async def _queue_rescan_scan(self, image_bytes: bytes) -> dict | None:
+        key = ("rescan", next(self._rescan_jobs))
+        return await self.scan_queue.submit(
+            key, PRIORITY_BACKGROUND, lambda: self._run_easyocr(ScanImage(image_bytes))
+        )
+
     @commands.hybrid_command(
         name="ocr_status",
         description="Check whether profile scan dependencies and templates are ready.",
@@ -351,13 +405,15 @@ class ProfileScanner(commands.Cog):
         easyocr_ready = await self._ensure_easyocr()
         diag = collect_ocr_diagnostics()
         diag.easyocr_ready = bool(easyocr_ready)
-        diag.easyocr_failure = self._easyocr_failure_reason
-        diag.box_count = len(self._easyocr_boxes or {}) or diag.box_count
+        diag.easyocr_failure = self.engine.failure_reason
+        diag.box_count = len(self.engine.boxes or {}) or diag.box_count
         diag.boxes_present = BOXES_PATH.exists()
 
         box_status = (
             f"Loaded {diag.box_count} fields from {BOXES_PATH.name}" if diag.box_count else "No templates loaded"
         )
+        if self.engine.layouts and len(self.engine.layouts):
+            box_status += f" + {len(self.engine.layouts)} calibrated layouts"
         box_details = (
             f"Box file present at {BOXES_PATH}" if diag.boxes_present else "Missing boxes_ratios.json"
         )
@@ -380,9 +436,21 @@ class ProfileScanner(commands.Cog):
         elif diag.easyocr_ready:
             embed.description = "✅ Profile scan dependencies and templates look ready."
         embed.add_field(name="EasyOCR", value=easyocr_label, inline=False)
+        embed.add_field(name="Warm-up", value=self._warmup_summary(), inline=False)
         embed.add_field(name="Templates", value=f"{box_status}\n{box_details}", inline=False)
         embed.add_field(name="Pillow", value="Installed" if diag.pillow else "Missing", inline=True)
         embed.add_field(name="pytesseract", value=pytess_label, inline=True)
+        embed.add_field(name="Scan reuse", value=self._scan_reuse_summary(), inline=False)
+        embed.add_field(name="Fallbacks & latency", value=self._fallback_summary(), inline=False)
+        if self.layout_stats:
+            embed.add_field(name="Layouts", value=self._layout_summary(), inline=False)
+        embed.add_field(name="Scan queue", value=self._queue_summary(), inline=False)
+        embed.add_field(name="Stored screenshots", value=await self._image_store_summary(), inline=False)
+        if self.ocr_space:
+            embed.add_field(name="OCR.space", value=self._ocr_space_summary(), inline=False)
+        if self.rescan_progress:
+            embed.add_field(name="Profile rescan", value=self.rescan_progress.summary(), inline=False)
+        embed.add_field(name="Ownership pre-check", value=self._verify_summary(ctx.guild.id), inline=False)
 
         if diag.install_tips:
             embed.add_field(
@@ -393,9 +461,140 @@ class ProfileScanner(commands.Cog):
 
         await self._safe_send(ctx, embed=embed, ephemeral=True)
 
+    def _ocr_space_summary(self) -> str:
+        snap = self.ocr_space.snapshot()
+        histogram = " ".join(f"{label}:{count}" for label, count in snap["latency"].items() if count)
+        return (
+            f"Circuit: {snap['state']} ({snap['consecutive_failures']} consecutive failures)\n"
+            f"Requests: {snap['succeeded']} ok / {snap['failed']} failed / {snap['short_circuited']} skipped\n"
+            f"Latency: {histogram or 'no requests yet'}"
+        )
+
+    async def _image_store_summary(self) -> str:
+        count, total = await profile_image_store_totals()
+        budget = format_bytes(self.image_store.max_bytes) if self.image_store.max_bytes else "unlimited"
+        return (
+            f"{count} files, {format_bytes(total)} of {budget}\n"
+            f"History per user: {self.image_store.history} | Evicted since restart: {self.image_store.evicted}"
+        )
+
+    def _verify_summary(self, guild_id: int) -> str:
+        savings = self.verify_savings.get(guild_id)
+        if not savings or not savings["rejected"]:
+            return "No uploads rejected on the button check since the last restart."
+        return (
+            f"Rejected early: {savings['rejected']}\n"
+            f"Field crops skipped: {savings['crops_skipped']}\n"
+            f"OCR time saved: ~{savings['seconds_saved']:.1f}s"
+        )
+
+    def _scan_reuse_summary(self) -> str:
+        stats = self.scan_stats
+        total = stats["exact_hits"] + stats["near_hits"] + stats["misses"]
+        if not total:
+            return "No scans since the last restart."
+
+        def _rate(count: int) -> str:
+            return f"{count} ({count / total:.0%})"
+
+        return (
+            f"Exact cache hits: {_rate(stats['exact_hits'])}\n"
+            f"Near-duplicate hits: {_rate(stats['near_hits'])}\n"
+            f"Full OCR runs: {_rate(stats['misses'])}\n"
+            f"Indexed recent scans: {len(self.near_duplicates)}"
+        )
+
+    def _fallback_summary(self) -> str:
+        stats = self.scan_stats
+        scans = stats["easyocr_scans"]
+        if not scans and not self.scan_latencies:
+            return "No OCR runs since the last restart."
+
+        full_text_rate = f"{stats['full_text_fallbacks'] / scans:.0%}" if scans else "—"
+        lines = [
+            f"Full-image EasyOCR: {stats['full_text_fallbacks']}/{scans} scans ({full_text_rate})",
+            f"Tesseract: {stats['tesseract_roi']} ROI / {stats['tesseract_full']} full image"
+            f" | OCR.space: {stats['ocr_space_fallbacks']}",
+            f"Numeric fields settled by variant voting: {stats['variant_overrides']}",
+        ]
+        if self.scan_latencies:
+            ordered = sorted(self.scan_latencies)
+            p50 = ordered[len(ordered) // 2]
+            p95 = ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))]
+            lines.append(f"Scan latency: p50 {p50 * 1000:.0f} ms / p95 {p95 * 1000:.0f} ms")
+        return "\n".join(lines)
+
+    def _warmup_summary(self) -> str:
+        if self._warmup_task and not self._warmup_task.done():
+            return "⏳ Warming up in the background…"
+        if self.engine.warm:
+            took = f" (took {self.warmup_seconds:.1f}s)" if self.warmup_seconds is not None else ""
+            return f"🔥 Warm{took}"
+        if OCR_WARMUP:
+            return "❄️ Cold — warm-up did not finish; check the logs."
+        return "❄️ Cold — the first scan loads the model. Set `OCR_WARMUP=1` to preload it after startup."
+
+    def _queue_summary(self) -> str:
+        stats = self.scan_queue.snapshot()
+        return (
+            f"Depth {stats['depth']}/{stats['capacity']} · downloading {stats['reserved']} · "
+            f"in service {stats['active']}\n"
+            f"Wait p50 {stats['wait_p50']:.1f}s · p95 {stats['wait_p95']:.1f}s\n"
+            f"Service p50 {stats['service_p50']:.1f}s · p95 {stats['service_p95']:.1f}s\n"
+            f"Completed {stats['completed']} · failed {stats['failed']} · "
+            f"rejected {stats['rejected']} · superseded {stats['superseded']}"
+        )
+
+    def _layout_summary(self) -> str:
+        lines = []
+        ranked = sorted(self.layout_stats.items(), key=lambda item: item[1]["scans"], reverse=True)
+        for name, counts in ranked[:10]:
+            scans = counts["scans"]
+            hits = scans - counts["full_text"]
+            lines.append(
+                f"`{name}` — {scans} scans, template hits {hits / scans:.0%}, "
+                f"full-image fallbacks {counts['full_text']}"
+            )
+        return "\n".join(lines)
+
     # --------------------
     # Intake listener
     # --------------------
+    @commands.Cog.listener()
+    async def on_ready(self):
+        if OCR_WARMUP and self._warmup_task is None:
+            self._warmup_task = asyncio.create_task(self._warm_up_engine())
+        if self._legacy_image_task is None:
+            self._legacy_image_task = asyncio.create_task(self._migrate_legacy_images())
+
+    async def _migrate_legacy_images(self) -> None:
+        """One-shot move of pre-store screenshots so they count against the byte budget."""
+        try:
+            moved = await self.image_store.migrate_legacy()
+        except Exception:
+            self.log.exception("Legacy profile image migration failed")
+            return
+        if moved:
+            self.log.info("🗂️ Moved %s legacy profile screenshots into the image store", moved)
+
+    async def _warm_up_engine(self) -> None:
+        """Load the reader (or every pool worker) and run a dummy inference before real scans."""
+        started = time.perf_counter()
+        with boot_span(self.bot, "ocr.warmup"):
+            if not await self._ensure_easyocr():
+                self.log.warning("OCR warm-up skipped: %s", self.engine.failure_reason)
+                return
+
+            if self.ocr_pool:
+                statuses = await self.ocr_pool.warm_all()
+                self.engine.warm = all(status["warm"] for status in statuses)
+            else:
+                loop = asyncio.get_running_loop()
+                await loop.run_in_executor(None, self.engine.warm_up)
+
+        self.warmup_seconds = time.perf_counter() - started
+        self.log.info("🔥 OCR engine warm in %.1fs", self.warmup_seconds)
+
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
         if message.author.bot or not message.guild:
@@ -425,27 +624,61 @@ class ProfileScanner(commands.Cog):
         if not attachment:
             return
 
-        asyncio.create_task(self._process_profile_upload(message, attachment))
+        # The listener already runs as its own task; the queue slot reserved inside
+        # bounds how many uploads get past this point and download their image.
+        try:
+            await self._process_profile_upload(message, attachment)
+        except Exception:
+            self.log.exception("Profile upload scan failed")
+
+    async def _scan_attachment(
+        self, member: discord.Member, attachment: discord.Attachment, priority: int
+    ) -> tuple[dict, str | None] | None:
+        """Reserve a queue slot, then download, OCR, and persist one upload.
+
+        Raises :class:`OcrQueueFull` before anything is downloaded when the queue has
+        no room, and :class:`OcrJobSuperseded` when a newer upload from the same
+        member takes over. Only answered uploads are written to the image store.
+        """
+        slot = self.scan_queue.reserve((member.guild.id, member.id), priority)
+        try:
+            try:
+                image_bytes = await attachment.read()
+            except Exception as exc:  # pragma: no cover - network edge
+                self.log.warning("Could not read attachment: %s", exc)
+                return None
+
+            parsed, raw_text, ocr_note = await self._perform_ocr(
+                image_bytes,
+                filename=attachment.filename,
+                guild_id=member.guild.id,
+                user_id=member.id,
+                slot=slot,
+            )
+        finally:
+            self.scan_queue.release(slot)
+
+        cached_path = await self._persist_profile_image(
+            member.guild.id, member.id, image_bytes, attachment.filename
+        )
+        payload = self._build_payload(member, attachment.url, parsed, raw_text, cached_path)
+        return payload, ocr_note
 
     async def _process_profile_upload(
         self, message: discord.Message, attachment: discord.Attachment
     ) -> None:
         try:
-            image_bytes = await attachment.read()
-        except Exception as exc:  # pragma: no cover - network edge
-            self.log.warning("Could not read attachment: %s", exc)
+            scanned = await self._scan_attachment(message.author, attachment, PRIORITY_INTAKE)
+        except OcrQueueFull:
+            await message.reply(content=QUEUE_FULL_MESSAGE, mention_author=False)
+            return
+        except OcrJobSuperseded:
+            self.log.debug("Profile upload superseded by a newer one from the same user")
+            return
+        if scanned is None:
             return
 
-        cached_path = self._persist_profile_image(
-            message.guild.id, message.author.id, image_bytes, attachment.filename
-        )
-        parsed, raw_text, ocr_note = await self._perform_ocr(
-            image_bytes, filename=attachment.filename, persisted_path=cached_path
-        )
-        payload = self._build_payload(
-            message.author, attachment.url, parsed, raw_text, cached_path
-        )
-
+        payload, ocr_note = scanned
         if payload.get("ownership_verified") is False:
             await message.reply(
                 content=(
@@ -463,338 +696,231 @@ class ProfileScanner(commands.Cog):
         image_bytes: bytes,
         *,
         filename: str | None = None,
-        persisted_path: Path | None = None,
+        guild_id: int | None = None,
+        user_id: int | None = None,
+        slot: QueueSlot | None = None,
     ) -> tuple[dict, str, str | None]:
+        """Answer from the exact or near-duplicate cache, else OCR the image.
+
+        With a reserved ``slot``, a miss runs as a scan queue job keyed by uploader;
+        without one the OCR stages run inline. Queued jobs hold only the raw bytes
+        and near-duplicate key; the image is decoded again once a worker starts.
+        """
+        # Duplicate uploads (re-posts, /scan_profile + channel) skip OCR and the scan queue.
+        image_hash = hashlib.sha256(image_bytes).hexdigest()
+        version = template_version()
+        cached = await get_cached_ocr_result(image_hash, version)
+        if cached:
+            self.scan_stats["exact_hits"] += 1
+            self.log.info("Profile OCR cache hit | sha256=%s", image_hash[:12])
+            return cached["parsed"], cached["raw_ocr"], cached["ocr_note"]
+
+        if slot is not None and slot.superseded:
+            raise OcrJobSuperseded()
+
+        near_key = None
+        if guild_id is not None and user_id is not None and vision_installed():
+            # Throwaway decode: only the small key outlives this call.
+            near_key = await asyncio.to_thread(self.engine.near_duplicate_key, ScanImage(image_bytes))
+        if near_key is not None:
+            previous = self.near_duplicates.find(guild_id, user_id, *near_key)
+            if previous:
+                self.scan_stats["near_hits"] += 1
+                self.log.info("Profile OCR near-duplicate hit | guild=%s user=%s", guild_id, user_id)
+                return dict(previous.parsed), previous.raw_ocr, previous.ocr_note
+        self.scan_stats["misses"] += 1
+
+        if slot is None:
+            return await self._scan_uncached(image_bytes, image_hash, version, near_key, filename, guild_id, user_id)
+        return await self.scan_queue.submit(
+            slot.key,
+            slot.priority,
+            lambda: self._scan_uncached(image_bytes, image_hash, version, near_key, filename, guild_id, user_id),
+            slot=slot,
+        )
+
+    async def _scan_uncached(
+        self,
+        image_bytes: bytes,
+        image_hash: str,
+        version: str,
+        near_key: tuple | None,
+        filename: str | None,
+        guild_id: int | None,
+        user_id: int | None,
+    ) -> tuple[dict, str, str | None]:
+        """EasyOCR, then Tesseract, then OCR.space; stores the result in both caches."""
+        # Decoded lazily on first use, then shared by every local stage below.
+        image = ScanImage(image_bytes)
+        scan_started = time.perf_counter()
+
         parsed: dict[str, str | int | None] = {}
         raw_text = ""
         ocr_note: str | None = None
-
-        async with self._scan_semaphore:
-            temp_path = persisted_path or self._stash_temp_image(image_bytes, filename)
-
-            try:
-                easyocr_results = await self._run_easyocr(image_bytes, temp_path)
-                if easyocr_results:
-                    parsed.update(easyocr_results["parsed"])
-                    raw_text = easyocr_results["raw"]
-                    if not self._has_profile_metrics(parsed):
-                        easyocr_full = await self._run_easyocr_full_text(
-                            image_bytes, temp_path=temp_path
-                        )
-                        if easyocr_full:
-                            raw_text = raw_text or easyocr_full
-                            parsed.update(_parse_profile_text(easyocr_full))
-                elif self._easyocr_ready is False and self._easyocr_failure_reason:
-                    ocr_note = self._easyocr_failure_reason
-
-                if not parsed:
-                    pytesseract_text = await self._run_pytesseract(image_bytes)
-                    raw_text = pytesseract_text or raw_text
-                    if pytesseract_text:
-                        parsed.update(_parse_profile_text(pytesseract_text))
-                    elif ocr_note is None:
-                        if self._pytesseract_missing:
-                            ocr_note = "Pytesseract is installed but the Tesseract binary is missing."
-                        elif not (pytesseract and Image):
-                            ocr_note = (
-                                "Profile scan dependencies are missing; install them from requirements.txt."
-                            )
-                        else:
-                            ocr_note = "Profile scan could not read this image."
-
-                if not parsed and OCR_SPACE_API_KEY:
-                    api_text, api_note = await self._run_ocr_space(image_bytes, filename)
-                    raw_text = raw_text or api_text
-                    if api_text:
-                        parsed.update(_parse_profile_text(api_text))
-                    if ocr_note is None and api_note:
-                        ocr_note = api_note
-            finally:
-                if temp_path and temp_path != persisted_path:
-                    try:
-                        temp_path.unlink(missing_ok=True)
-                    except Exception:  # pragma: no cover - best-effort cleanup
-                        self.log.debug("Temp profile image cleanup failed for %s", temp_path)
-
+        decoded_bytes = 0
+
+        easyocr_started = time.perf_counter()
+        easyocr_results = await self._run_easyocr(image)
+        if easyocr_results:
+            self._record_verify_outcome(guild_id, easyocr_results, time.perf_counter() - easyocr_started)
+            parsed.update(easyocr_results["parsed"])
+            raw_text = easyocr_results["raw"]
+            easyocr_full = easyocr_results.get("full_text")
+            if easyocr_full:
+                raw_text = raw_text or easyocr_full
+                parsed.update(parse_profile_text(easyocr_full))
+            decoded_bytes = easyocr_results.get("decoded_bytes", 0)
+            layout_counts = self.layout_stats[easyocr_results.get("layout", "default")]
+            layout_counts["scans"] += 1
+            self.scan_stats["easyocr_scans"] += 1
+            self.scan_stats["variant_overrides"] += easyocr_results.get("variant_overrides", 0)
+            if easyocr_results.get("full_text_used"):
+                layout_counts["full_text"] += 1
+                self.scan_stats["full_text_fallbacks"] += 1
+        elif self.engine.ready is False and self.engine.failure_reason:
+            ocr_note = self.engine.failure_reason
+
+        if not parsed:
+            pytesseract_parsed, pytesseract_text = await self._run_pytesseract(image)
+            raw_text = pytesseract_text or raw_text
+            if pytesseract_parsed:
+                parsed.update(pytesseract_parsed)
+            elif ocr_note is None:
+                if self.engine.tesseract_missing:
+                    ocr_note = "Pytesseract is installed but the Tesseract binary is missing."
+                elif not tesseract_installed():
+                    ocr_note = (
+                        "Profile scan dependencies are missing; install them from requirements.txt."
+                    )
+                else:
+                    ocr_note = "Profile scan could not read this image."
+
+        if not parsed and self.ocr_space:
+            self.scan_stats["ocr_space_fallbacks"] += 1
+            api_text, api_note = await self.ocr_space.parse(image_bytes, filename)
+            raw_text = raw_text or api_text
+            if api_text:
+                parsed.update(parse_profile_text(api_text))
+            if ocr_note is None and api_note:
+                ocr_note = api_note
+
+        scan_seconds = time.perf_counter() - scan_started
+        self.scan_latencies.append(scan_seconds)
         self.log.info(
-            "Profile OCR summary | fields=%s | raw_lines=%s | note=%s",
+            "Profile OCR summary | fields=%s | raw_lines=%s | decoded=%s | %.0f ms | note=%s",
             {k: v for k, v in parsed.items() if v is not None},
             self._raw_line_count(raw_text),
+            format_bytes(max(decoded_bytes, image.nbytes)),
+            scan_seconds * 1000,
             ocr_note,
         )
 
+        if parsed:
+            await store_ocr_result(
+                image_hash, version, parsed, raw_text, ocr_note, max_entries=OCR_CACHE_MAX_ENTRIES
+            )
+            if near_key is not None:
+                self.near_duplicates.add(guild_id, user_id, *near_key, dict(parsed), raw_text, ocr_note)
         return parsed, raw_text, ocr_note
 
-    async def _run_ocr_space(
-        self, image_bytes: bytes, filename: str | None = None
-    ) -> tuple[str, str | None]:
-        """Fallback to the OCR.space API when local OCR dependencies are unavailable."""
-
-        headers = {"apikey": OCR_SPACE_API_KEY}
-        data = {"language": "eng", "isOverlayRequired": False}
-        files = {"file": (filename or "profile.png", image_bytes, "application/octet-stream")}
-
-        try:
-            async with httpx.AsyncClient(timeout=20) as client:
-                resp = await client.post(
-                    OCR_SPACE_ENDPOINT, headers=headers, data=data, files=files
-                )
-            resp.raise_for_status()
-        except Exception as exc:  # pragma: no cover - network edge
-            self.log.warning("OCR.space request failed: %s", exc)
-            return "", "External OCR request failed."
-
-        try:
-            payload = resp.json()
-        except ValueError:
-            self.log.warning("OCR.space returned non-JSON response")
-            return "", "External OCR response was malformed."
-
-        if payload.get("IsErroredOnProcessing"):
-            msg = payload.get("ErrorMessage") or payload.get("ErrorMessageText")
-            note = msg if isinstance(msg, str) else "External OCR service reported an error."
-            return "", note
-
-        results = payload.get("ParsedResults") or []
-        text_blocks = [item.get("ParsedText", "") for item in results if item]
-        combined = "\n".join(filter(None, text_blocks)).strip()
-
-        if not combined:
-            return "", "External OCR did not return any text."
-
-        return combined, None
-
-    async def _run_pytesseract(self, image_bytes: bytes) -> str:
-        if not (pytesseract and Image):
-            return ""
+    async def _run_pytesseract(self, image: ScanImage) -> tuple[dict, str]:
+        """Template crops first (fast, digit-whitelisted), whole image when they miss the metrics."""
+        if not tesseract_installed():
+            return {}, ""
 
         loop = asyncio.get_running_loop()
-
-        def _scan() -> str:
-            try:
-                with Image.open(io.BytesIO(image_bytes)) as img:
-                    return pytesseract.image_to_string(img)
-            except Exception as exc:
-                # Gracefully handle missing tesseract binaries instead of crashing the task
-                if hasattr(pytesseract, "TesseractNotFoundError") and isinstance(
-                    exc, pytesseract.TesseractNotFoundError
-                ):
-                    self._pytesseract_missing = True
-                    self.log.warning("Tesseract binary missing; skipping pytesseract fallback")
-                    return ""
-                raise
-
-        return await loop.run_in_executor(None, _scan)
-
-    def _stash_temp_image(
-        self, image_bytes: bytes, filename: str | None = None
-    ) -> Path | None:
-        """Persist an uploaded image for OCR routines that prefer file paths."""
-
-        shots_dir = Path(__file__).resolve().parent.parent / "shots" / "temp"
-        shots_dir.mkdir(parents=True, exist_ok=True)
-
-        suffix = Path(filename).suffix if filename else ".png"
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S_%f")
-        temp_path = shots_dir / f"profile_{timestamp}{suffix}"
-
-        try:
-            temp_path.write_bytes(image_bytes)
-        except Exception:
-            self.log.exception("Failed to stash profile image to %s", temp_path)
-            return None
-
-        return temp_path
-
-    def _persist_profile_image(
+        if OCR_TESSERACT_MODE == "roi":
+            roi = await loop.run_in_executor(None, self.engine.scan_tesseract_fields, image)
+            if roi and has_profile_metrics(roi["parsed"]):
+                self.scan_stats["tesseract_roi"] += 1
+                return roi["parsed"], roi["raw"]
+
+        text = await loop.run_in_executor(None, self.engine.scan_tesseract, image)
+        if text:
+            self.scan_stats["tesseract_full"] += 1
+        return parse_profile_text(text), text
+
+    async def _persist_profile_image(
         self, guild_id: int, user_id: int, image_bytes: bytes, filename: str | None = None
     ) -> Path | None:
-        """Save the raw upload so rescans avoid refetching from Discord CDN."""
-
-        base = Path(__file__).resolve().parent.parent / "shots" / "profiles" / str(guild_id)
-        base.mkdir(parents=True, exist_ok=True)
+        """Save an answered upload and return its path (or None).
 
+        Called once the scan has a result, so rejected and superseded uploads never
+        reach the store's history or byte budget. Rescans read the saved file
+        instead of refetching from the Discord CDN.
+        """
         suffix = Path(filename).suffix if filename else ".png"
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S_%f")
-        path = base / f"{user_id}_{timestamp}{suffix}"
-
         try:
-            path.write_bytes(image_bytes)
+            return await self.image_store.put(guild_id, user_id, image_bytes, suffix)
         except Exception:
-            self.log.exception("Failed to persist profile image to %s", path)
+            self.log.exception("Failed to index profile image for guild %s user %s", guild_id, user_id)
             return None
 
-        # Keep a short history per user to avoid filling disk.
-        user_stash = sorted(base.glob(f"{user_id}_*"))
-        for old in user_stash[:-5]:
-            try:
-                old.unlink(missing_ok=True)
-            except Exception:  # pragma: no cover - best-effort cleanup
-                self.log.debug("Could not trim cached profile image %s", old)
-
-        return path
-
     async def _ensure_easyocr(self) -> bool:
-        if self._easyocr_ready is not None:
-            return self._easyocr_ready
-
-        if not (easyocr and cv2 and np):
-            self._easyocr_ready = False
-            self._easyocr_failure_reason = (
-                "EasyOCR unavailable. Install OCR extras with `pip install -r requirements.txt`."
-            )
-            self.log.warning(self._easyocr_failure_reason)
-            return False
+        """Load the EasyOCR stack off the event loop the first time a scan needs it."""
+        if self.engine.ready is not None:
+            return self.engine.ready
 
         async with self._easyocr_lock:
-            if self._easyocr_ready is not None:
-                return self._easyocr_ready
+            if self.engine.ready is not None:
+                return self.engine.ready
 
-            if not BOXES_PATH.exists():
-                self._easyocr_ready = False
-                self._easyocr_failure_reason = f"OCR bounding boxes not found at {BOXES_PATH}."
-                self.log.warning(self._easyocr_failure_reason)
-                return False
+            if self.ocr_pool:
+                return await self._ensure_worker_pool()
 
             loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.engine.load)
 
-            def _load():
-                with BOXES_PATH.open("r", encoding="utf-8") as fp:
-                    data = json.load(fp)
-                boxes = data.get("template_ratios") or {}
-                reader = easyocr.Reader(EASYOCR_LANGS, gpu=False)
-                return boxes, reader
-
-            boxes, reader = await loop.run_in_executor(None, _load)
-            self._easyocr_boxes = boxes
-            self._easyocr_reader = reader
-            self._easyocr_ready = bool(boxes)
-            self._easyocr_failure_reason = None if self._easyocr_ready else "OCR templates are empty."
-            if not self._easyocr_ready:
-                self.log.warning(self._easyocr_failure_reason)
-            return self._easyocr_ready
-
-    async def _run_easyocr(self, image_bytes: bytes, temp_path: Path | None = None):
-        ready = await self._ensure_easyocr()
-        if not ready or not self._easyocr_reader or not self._easyocr_boxes:
-            return None
-
-        loop = asyncio.get_running_loop()
-
-        def _scan():
-            if temp_path and temp_path.exists():
-                img = cv2.imread(str(temp_path))
-            else:
-                arr = np.frombuffer(image_bytes, dtype=np.uint8)
-                img = cv2.imdecode(arr, cv2.IMREAD_COLOR)
-            if img is None:
-                return None
-
-            results: dict[str, str | int | None] = {}
-            raw_lines: list[str] = []
-
-            verification_hits: set[str] = set()
-
-            for field, ratios in self._easyocr_boxes.items():
-                crop = self._crop_by_ratio(img, ratios)
-                if crop is None:
-                    continue
-
-                proc = self._preprocess_crop(crop)
-                detections = self._easyocr_reader.readtext(proc)
-                if not detections:
-                    continue
-
-                detections.sort(key=lambda item: item[2], reverse=True)
-                best_text = detections[0][1].strip()
-                best_conf = float(detections[0][2])
-                raw_lines.append(f"{field}: {best_text} ({best_conf:.2f})")
-
-                if field in VERIFY_FIELDS:
-                    if best_conf >= VERIFY_MIN_CONF:
-                        verification_hits.add(field)
-                    continue
-
-                if best_conf < EASYOCR_MIN_CONF:
-                    continue
-
-                mapped = EASYOCR_FIELDS.get(field)
-                if not mapped:
-                    continue
-
-                if mapped in {"cp", "kills", "likes", "vip_level"}:
-                    cleaned = re.sub(r"[^\d]", "", best_text)
-                    if cleaned:
-                        results[mapped] = int(cleaned)
-                elif mapped == "server":
-                    results[mapped] = best_text
-                else:
-                    results[mapped] = best_text
-
-            if verification_hits:
-                results["ownership_verified"] = len(verification_hits) == len(VERIFY_FIELDS)
-            else:
-                results["ownership_verified"] = None
-
-            raw = "\n".join(raw_lines)
-            return {"parsed": results, "raw": raw}
+    async def _ensure_worker_pool(self) -> bool:
+        """Spin up an OCR worker and mirror its reader state onto ``self.engine``."""
+        try:
+            status = await self.ocr_pool.status()
+        except Exception:
+            self.log.exception("OCR worker pool failed to start; falling back to in-process OCR")
+            self.ocr_pool.shutdown()
+            self.ocr_pool = None
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.engine.load)
+
+        self.engine.ready = status["ready"]
+        self.engine.failure_reason = status["failure_reason"]
+        self.engine.load_seconds = status["load_seconds"]
+        self.engine.warm = status["warm"]
+        if BOXES_PATH.exists():
+            self.engine.layouts = load_layouts(BOXES_PATH)
+            self.engine.boxes = self.engine.layouts.default
+        return self.engine.ready
+
+    def _record_verify_outcome(self, guild_id: int, result: dict, seconds: float) -> None:
+        """Track full-scan cost and what each early ownership rejection saved against it."""
+        stats = self.scan_stats
+        if not result.get("rejected_early"):
+            stats["full_scans"] += 1
+            stats["full_scan_seconds"] += seconds
+            return
 
-        return await loop.run_in_executor(None, _scan)
+        savings = self.verify_savings[guild_id]
+        savings["rejected"] += 1
+        savings["crops_skipped"] += result.get("skipped_crops", 0)
+        if stats["full_scans"]:
+            average = stats["full_scan_seconds"] / stats["full_scans"]
+            savings["seconds_saved"] += max(0.0, average - seconds)
 
-    async def _run_easyocr_full_text(
-        self, image_bytes: bytes, temp_path: Path | None = None
-    ) -> str:
+    async def _run_easyocr(self, image: ScanImage) -> dict | None:
+        """Template scan plus full-text fallback, in a worker process or the thread pool."""
         ready = await self._ensure_easyocr()
-        if not ready or not self._easyocr_reader:
-            return ""
-
-        loop = asyncio.get_running_loop()
-
-        def _scan() -> str:
-            if temp_path and temp_path.exists():
-                img = cv2.imread(str(temp_path))
-            else:
-                arr = np.frombuffer(image_bytes, dtype=np.uint8)
-                img = cv2.imdecode(arr, cv2.IMREAD_COLOR)
-            if img is None:
-                return ""
-
-            detections = self._easyocr_reader.readtext(img)
-            if not detections:
-                return ""
-            return "\n".join(item[1].strip() for item in detections if item[1].strip())
-
-        return await loop.run_in_executor(None, _scan)
-
-    @staticmethod
-    def _has_profile_metrics(parsed: dict[str, str | int | None]) -> bool:
-        return any(
-            parsed.get(field)
-            for field in ("player_name", "cp", "kills", "likes", "vip_level", "alliance", "server")
-        )
-
-    def _crop_by_ratio(self, img, box):
-        h, w = img.shape[:2]
-        x1 = int(w * box[0])
-        y1 = int(h * box[1])
-        x2 = int(w * box[2])
-        y2 = int(h * box[3])
-
-        x1 = max(0, min(x1, w - 1))
-        x2 = max(1, min(x2, w))
-        y1 = max(0, min(y1, h - 1))
-        y2 = max(1, min(y2, h))
-
-        if x2 <= x1 or y2 <= y1:
+        if not ready:
             return None
 
-        return img[y1:y2, x1:x2]
+        if self.ocr_pool:
+            try:
+                return await self.ocr_pool.scan(image.data)
+            except Exception:
+                self.log.exception("OCR worker scan failed")
+                return None
 
-    def _preprocess_crop(self, crop):
-        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
-        gray = cv2.resize(gray, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
-        gray = cv2.GaussianBlur(gray, (3, 3), 0)
-        return gray
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.engine.scan_easyocr, image)
 
     def _build_payload(
         self,
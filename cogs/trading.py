@@ -9,6 +9,7 @@ import aiosqlite
 import logging
 import asyncio
 from utils.assets import FISH_NAMES
+from utils.boot_timeline import boot_span
 from database import DB_PATH, ensure_seed_trade_pool
 
 logger = logging.getLogger('MarciaOS.Trading')
@@ -248,14 +249,15 @@ class Trading(commands.Cog):
         
         logger.info("📡 Re-anchoring Trade Terminals...")
         try:
-            async with aiosqlite.connect(DB_PATH) as db:
-                # Add table check here just in case
-                await db.execute("CREATE TABLE IF NOT EXISTS settings (guild_id INTEGER PRIMARY KEY, trade_channel_id INTEGER)")
-                async with db.execute("SELECT guild_id, trade_channel_id FROM settings WHERE trade_channel_id IS NOT NULL") as cursor:
-                    async for guild_id, channel_id in cursor:
-                        channel = self.bot.get_channel(channel_id)
-                        if channel:
-                            await self.re_anchor_menu(channel)
+            with boot_span(self.bot, "trading.re_anchor"):
+                async with aiosqlite.connect(DB_PATH) as db:
+                    # Add table check here just in case
+                    await db.execute("CREATE TABLE IF NOT EXISTS settings (guild_id INTEGER PRIMARY KEY, trade_channel_id INTEGER)")
+                    async with db.execute("SELECT guild_id, trade_channel_id FROM settings WHERE trade_channel_id IS NOT NULL") as cursor:
+                        async for guild_id, channel_id in cursor:
+                            channel = self.bot.get_channel(channel_id)
+                            if channel:
+                                await self.re_anchor_menu(channel)
         except Exception as e:
             logger.error(f"Error in Trading on_ready: {e}")
 
@@ -619,6 +619,9 @@ class Utility(commands.Cog):
             value="UTC-2 (Dark War Survival global time)",
             inline=False,
         )
+        leveling = self.bot.get_cog("Leveling")
+        if leveling:
+            embed.add_field(name="Leaderboard Cache", value=leveling.leaderboard_cache.summary(), inline=False)
         embed.set_footer(text="Need a deeper check? Open /setup and tap Sector Audit.")
         await self._safe_send(ctx, embed=embed)
 
@@ -3,16 +3,19 @@ FILE: database.py
 USE: Persistent storage for multi-server configurations and trading.
 FEATURES: Server-specific trading network, settings, and migration logic.
 """
-import json
+import multiprocessing
 import os
 import shutil
 import time
+from collections import Counter
 from pathlib import Path
+from typing import AsyncIterator
 
 import aiosqlite
 from datetime import datetime, timezone
 import logging
 
+from utils import jsonio
 from utils.time_utils import GAME_TZ
 from utils.assets import REMINDER_TEMPLATE_STARTER
 
@@ -124,7 +127,9 @@ def _resolve_db_path() -> Path:
 
 
 DB_PATH_OBJ = _resolve_db_path()
-_snapshot_db(DB_PATH_OBJ)
+# Spawned helper processes (OCR workers) re-import main; only the bot process takes backups.
+if multiprocessing.parent_process() is None:
+    _snapshot_db(DB_PATH_OBJ)
 DB_PATH = str(DB_PATH_OBJ)
 
 # Seed fish trade listings captured before data loss so we can repopulate wiped hosts.
@@ -142,6 +147,25 @@ if _seed_env:
         logger.warning("Invalid MARCIA_SEED_GUILD_ID value %r; seed restore disabled", _seed_env)
 _TRADE_SEED_CACHE: dict | None = None
 
+# Bumped after every committed write that can reorder a leaderboard, per
+# ``(table, guild_id)`` and table-wide under ``(table, None)``. Readers that cache
+# ranked rows store the versions they saw and treat any change as a miss: sector
+# boards compare their guild's counter, network boards the table-wide one.
+# The counters are per process; writes from other processes (the rescan CLI) only
+# show up once a cached entry's TTL runs out.
+_WRITE_VERSIONS: Counter[tuple[str, int | None]] = Counter()
+
+
+def table_write_versions(guild_id: int | None, *tables: str) -> tuple[int, ...]:
+    """Current in-process write versions for ``tables`` in one guild (None: across all guilds)."""
+    return tuple(_WRITE_VERSIONS[(table, guild_id)] for table in tables)
+
+
+def bump_write_version(table: str, guild_id: int) -> None:
+    """Record a committed write to ``table`` in ``guild_id``; call after commit so readers see the rows."""
+    _WRITE_VERSIONS[(table, guild_id)] += 1
+    _WRITE_VERSIONS[(table, None)] += 1
+
 async def init_db():
     """Initializes the database and migrates legacy data if found."""
     logger.info("🗄️ Database path: %s", DB_PATH)
@@ -232,10 +256,58 @@ async def init_db():
                 local_image_path TEXT,
                 raw_ocr TEXT,
                 last_updated INTEGER,
+                rescanned_at INTEGER,
                 PRIMARY KEY (guild_id, user_id)
             )
         ''')
 
+        # OCR results keyed by image SHA-256 + template version so duplicate uploads skip OCR.
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS ocr_result_cache (
+                image_sha256 TEXT,
+                template_version TEXT,
+                parsed TEXT,
+                raw_ocr TEXT,
+                ocr_note TEXT,
+                created_at INTEGER,
+                last_used INTEGER,
+                PRIMARY KEY (image_sha256, template_version)
+            )
+        ''')
+
+        # Content-addressed profile screenshots: one file per distinct image, refs per uploader.
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS profile_image_blobs (
+                sha256 TEXT PRIMARY KEY,
+                path TEXT,
+                size_bytes INTEGER,
+                last_used INTEGER
+            )
+        ''')
+
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS profile_image_refs (
+                guild_id INTEGER,
+                user_id INTEGER,
+                sha256 TEXT,
+                stored_at INTEGER,
+                PRIMARY KEY (guild_id, user_id, sha256)
+            )
+        ''')
+
+        # Resume points for bulk profile rescans: last (guild_id, user_id) fully written per job.
+        await db.execute('''
+            CREATE TABLE IF NOT EXISTS profile_rescan_checkpoints (
+                job TEXT PRIMARY KEY,
+                template_version TEXT,
+                guild_id INTEGER,
+                user_id INTEGER,
+                processed INTEGER DEFAULT 0,
+                changed INTEGER DEFAULT 0,
+                updated_at INTEGER
+            )
+        ''')
+
         await db.execute('''
             CREATE TABLE IF NOT EXISTS reminder_template_seed (
                 guild_id INTEGER PRIMARY KEY
@@ -388,6 +460,16 @@ async def init_db():
         await db.execute("CREATE INDEX IF NOT EXISTS idx_user_stats_guild ON user_stats(guild_id)")
         await db.execute("CREATE INDEX IF NOT EXISTS idx_inventory_guild ON user_inventory(guild_id)")
         await db.execute("CREATE INDEX IF NOT EXISTS idx_feedback_guild ON feedback_entries(guild_id)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_ocr_cache_last_used ON ocr_result_cache(last_used)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_image_blobs_last_used ON profile_image_blobs(last_used)")
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_image_refs_owner ON profile_image_refs(guild_id, user_id, stored_at)"
+        )
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_image_refs_sha ON profile_image_refs(sha256)")
+        await db.execute("CREATE INDEX IF NOT EXISTS idx_image_blobs_path ON profile_image_blobs(path)")
+        await db.execute(
+            "CREATE INDEX IF NOT EXISTS idx_profile_snapshots_image ON profile_snapshots(local_image_path)"
+        )
 
         async with db.execute("PRAGMA table_info(user_stats)") as cursor:
             existing_columns = {row[1] async for row in cursor}
@@ -422,6 +504,7 @@ async def init_db():
         await _ensure_column(db, "profile_snapshots", "local_image_path", "TEXT")
         await _ensure_column(db, "profile_snapshots", "ownership_verified", "INTEGER")
         await _ensure_column(db, "profile_snapshots", "scan_valid", "INTEGER")
+        await _ensure_column(db, "profile_snapshots", "rescanned_at", "INTEGER")
 
     print("📡 MARCIA OS | Database Core Synchronized (Trading, Missions & Config).")
 
@@ -471,7 +554,7 @@ def _load_trade_seed() -> dict:
 
     try:
         with _SEED_FILE.open("r", encoding="utf-8") as fp:
-            _TRADE_SEED_CACHE = json.load(fp)
+            _TRADE_SEED_CACHE = jsonio.load(fp)
     except Exception as e:
         logger.warning("Could not load trade seed file: %s", e)
         _TRADE_SEED_CACHE = {}
@@ -665,14 +748,16 @@ async def total_active_missions() -> int:
 
 
 async def top_global_xp(limit: int = 10) -> list[aiosqlite.Row]:
-    """Return highest XP survivors across all guilds."""
+    """Return highest XP survivors across all guilds, with their scanned server when valid."""
     async with aiosqlite.connect(DB_PATH) as db:
         db.row_factory = aiosqlite.Row
         async with db.execute(
             """
-            SELECT guild_id, user_id, xp, level
-            FROM user_stats
-            ORDER BY level DESC, xp DESC
+            SELECT us.guild_id, us.user_id, us.xp, us.level,
+                   CASE WHEN COALESCE(ps.scan_valid, 1) = 1 THEN ps.server END AS server
+            FROM user_stats us
+            LEFT JOIN profile_snapshots ps ON ps.guild_id = us.guild_id AND ps.user_id = us.user_id
+            ORDER BY us.level DESC, us.xp DESC
             LIMIT ?
             """,
             (limit,),
@@ -881,6 +966,335 @@ async def upsert_profile_snapshot(
             ),
         )
         await db.commit()
+    bump_write_version("profile_snapshots", guild_id)
+
+
+# --- OCR RESULT CACHE ---
+
+async def get_cached_ocr_result(image_sha256: str, template_version: str) -> dict | None:
+    """Return a cached ``{"parsed", "raw_ocr", "ocr_note"}`` entry and mark it recently used."""
+    async with aiosqlite.connect(DB_PATH) as db:
+        async with db.execute(
+            """
+            SELECT parsed, raw_ocr, ocr_note FROM ocr_result_cache
+            WHERE image_sha256 = ? AND template_version = ?
+            """,
+            (image_sha256, template_version),
+        ) as cursor:
+            row = await cursor.fetchone()
+        if not row:
+            return None
+
+        await db.execute(
+            "UPDATE ocr_result_cache SET last_used = ? WHERE image_sha256 = ? AND template_version = ?",
+            (int(time.time()), image_sha256, template_version),
+        )
+        await db.commit()
+    return {"parsed": jsonio.loads(row[0]), "raw_ocr": row[1] or "", "ocr_note": row[2]}
+
+
+async def store_ocr_result(
+    image_sha256: str,
+    template_version: str,
+    parsed: dict,
+    raw_ocr: str,
+    ocr_note: str | None,
+    *,
+    max_entries: int = 2000,
+) -> None:
+    """Cache an OCR result, evicting the least recently used rows beyond ``max_entries``."""
+    now_ts = int(time.time())
+    async with aiosqlite.connect(DB_PATH) as db:
+        await db.execute(
+            """
+            INSERT OR REPLACE INTO ocr_result_cache (
+                image_sha256, template_version, parsed, raw_ocr, ocr_note, created_at, last_used
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (image_sha256, template_version, jsonio.dumps(parsed), raw_ocr, ocr_note, now_ts, now_ts),
+        )
+        await db.execute(
+            """
+            DELETE FROM ocr_result_cache WHERE rowid IN (
+                SELECT rowid FROM ocr_result_cache ORDER BY last_used DESC, rowid DESC LIMIT -1 OFFSET ?
+            )
+            """,
+            (max_entries,),
+        )
+        await db.commit()
+
+
+# --- PROFILE IMAGE STORE ---
+
+async def get_profile_image_blob(sha256: str) -> dict | None:
+    async with aiosqlite.connect(DB_PATH) as db:
+        db.row_factory = aiosqlite.Row
+        async with db.execute(
+            "SELECT sha256, path, size_bytes, last_used FROM profile_image_blobs WHERE sha256 = ?", (sha256,)
+        ) as cursor:
+            row = await cursor.fetchone()
+    return dict(row) if row else None
+
+
+async def _delete_orphan_blobs(db: aiosqlite.Connection, shas: list[str]) -> list[str]:
+    paths = []
+    for sha in shas:
+        async with db.execute(
+            """
+            SELECT path FROM profile_image_blobs
+            WHERE sha256 = ? AND NOT EXISTS (SELECT 1 FROM profile_image_refs WHERE sha256 = ?)
+            """,
+            (sha, sha),
+        ) as cursor:
+            row = await cursor.fetchone()
+        if row:
+            await db.execute("DELETE FROM profile_image_blobs WHERE sha256 = ?", (sha,))
+            paths.append(row[0])
+    return paths
+
+
+async def record_profile_image(
+    guild_id: int,
+    user_id: int,
+    sha256: str,
+    path: str,
+    size_bytes: int,
+    *,
+    history: int = 5,
+    max_bytes: int | None = None,
+) -> list[str]:
+    """Index an upload, trim the user's history, and evict LRU blobs beyond ``max_bytes``.
+
+    A screenshot that a profile snapshot still points at (``local_image_path``) is
+    never trimmed or evicted, so rescans can always reread every current profile;
+    the budget may be exceeded by those. Returns the paths of blobs no longer
+    referenced; the caller deletes the files.
+    """
+    now_ts = int(time.time())
+    async with aiosqlite.connect(DB_PATH) as db:
+        await db.execute(
+            """
+            INSERT INTO profile_image_blobs (sha256, path, size_bytes, last_used) VALUES (?, ?, ?, ?)
+            ON CONFLICT(sha256) DO UPDATE SET last_used = excluded.last_used
+            """,
+            (sha256, path, size_bytes, now_ts),
+        )
+        await db.execute(
+            """
+            INSERT INTO profile_image_refs (guild_id, user_id, sha256, stored_at) VALUES (?, ?, ?, ?)
+            ON CONFLICT(guild_id, user_id, sha256) DO UPDATE SET stored_at = excluded.stored_at
+            """,
+            (guild_id, user_id, sha256, now_ts),
+        )
+
+        async with db.execute(
+            """
+            SELECT sha256 FROM profile_image_refs
+            WHERE guild_id = ? AND user_id = ?
+            ORDER BY stored_at DESC, rowid DESC LIMIT -1 OFFSET ?
+            """,
+            (guild_id, user_id, history),
+        ) as cursor:
+            trimmed = [row[0] for row in await cursor.fetchall()]
+        async with db.execute(
+            """
+            SELECT b.sha256 FROM profile_snapshots s
+            JOIN profile_image_blobs b ON b.path = s.local_image_path
+            WHERE s.guild_id = ? AND s.user_id = ?
+            """,
+            (guild_id, user_id),
+        ) as cursor:
+            current = await cursor.fetchone()
+        if current:
+            # Rejected uploads also land here; they must not push out the snapshot's own screenshot.
+            trimmed = [sha for sha in trimmed if sha != current[0]]
+        for sha in trimmed:
+            await db.execute(
+                "DELETE FROM profile_image_refs WHERE guild_id = ? AND user_id = ? AND sha256 = ?",
+                (guild_id, user_id, sha),
+            )
+        evicted = await _delete_orphan_blobs(db, trimmed)
+
+        if max_bytes is not None:
+            async with db.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM profile_image_blobs") as cursor:
+                total = (await cursor.fetchone())[0]
+            # Oldest-used first; the upload being recorded and live snapshot images are never victims.
+            while total > max_bytes:
+                async with db.execute(
+                    """
+                    SELECT sha256, path, size_bytes FROM profile_image_blobs b
+                    WHERE sha256 != ?
+                      AND NOT EXISTS (SELECT 1 FROM profile_snapshots s WHERE s.local_image_path = b.path)
+                    ORDER BY last_used, rowid LIMIT 50
+                    """,
+                    (sha256,),
+                ) as cursor:
+                    victims = await cursor.fetchall()
+                if not victims:
+                    break
+                for victim_sha, victim_path, victim_size in victims:
+                    if total <= max_bytes:
+                        break
+                    evicted.append(victim_path)
+                    total -= victim_size or 0
+                    await db.execute("DELETE FROM profile_image_refs WHERE sha256 = ?", (victim_sha,))
+                    await db.execute("DELETE FROM profile_image_blobs WHERE sha256 = ?", (victim_sha,))
+        await db.commit()
+    return evicted
+
+
+async def relink_profile_image(old_path: str, new_path: str) -> None:
+    """Point snapshots that reference ``old_path`` at ``new_path`` (legacy image migration)."""
+    async with aiosqlite.connect(DB_PATH) as db:
+        await db.execute(
+            "UPDATE profile_snapshots SET local_image_path = ? WHERE local_image_path = ?", (new_path, old_path)
+        )
+        await db.commit()
+
+
+async def profile_image_store_totals() -> tuple[int, int]:
+    """``(blob count, total bytes)`` held by the profile image store."""
+    async with aiosqlite.connect(DB_PATH) as db:
+        async with db.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM profile_image_blobs"
+        ) as cursor:
+            row = await cursor.fetchone()
+    return (row[0], row[1]) if row else (0, 0)
+
+
+# --- PROFILE RESCANS ---
+
+RESCAN_COLUMNS = (
+    "player_name",
+    "alliance",
+    "server",
+    "cp",
+    "kills",
+    "likes",
+    "vip_level",
+    "ownership_verified",
+    "raw_ocr",
+)
+
+
+async def count_rescannable_profiles(guild_id: int | None = None, after: tuple[int, int] | None = None) -> int:
+    """Snapshots with a stored image, optionally one guild and past a ``(guild_id, user_id)`` key."""
+    clauses = ["local_image_path IS NOT NULL"]
+    params: list = []
+    if guild_id is not None:
+        clauses.append("guild_id = ?")
+        params.append(guild_id)
+    if after is not None:
+        clauses.append("(guild_id, user_id) > (?, ?)")
+        params.extend(after)
+    async with aiosqlite.connect(DB_PATH) as db:
+        async with db.execute(
+            f"SELECT COUNT(*) FROM profile_snapshots WHERE {' AND '.join(clauses)}", params
+        ) as cursor:
+            row = await cursor.fetchone()
+    return row[0] if row else 0
+
+
+async def get_rescannable_profiles(
+    guild_id: int | None = None, after: tuple[int, int] | None = None, limit: int = 100
+) -> list[dict]:
+    """Next page of snapshots with a stored image, in ``(guild_id, user_id)`` order (keyset paging)."""
+    clauses = ["local_image_path IS NOT NULL"]
+    params: list = []
+    if guild_id is not None:
+        clauses.append("guild_id = ?")
+        params.append(guild_id)
+    if after is not None:
+        clauses.append("(guild_id, user_id) > (?, ?)")
+        params.extend(after)
+    async with aiosqlite.connect(DB_PATH) as db:
+        db.row_factory = aiosqlite.Row
+        async with db.execute(
+            f"""
+            SELECT guild_id, user_id, local_image_path, last_updated, {', '.join(RESCAN_COLUMNS)}
+            FROM profile_snapshots
+            WHERE {' AND '.join(clauses)}
+            ORDER BY guild_id, user_id
+            LIMIT ?
+            """,
+            (*params, limit),
+        ) as cursor:
+            rows = await cursor.fetchall()
+    return [dict(row) for row in rows]
+
+
+async def get_rescan_checkpoint(job: str) -> dict | None:
+    async with aiosqlite.connect(DB_PATH) as db:
+        db.row_factory = aiosqlite.Row
+        async with db.execute(
+            """
+            SELECT job, template_version, guild_id, user_id, processed, changed, updated_at
+            FROM profile_rescan_checkpoints WHERE job = ?
+            """,
+            (job,),
+        ) as cursor:
+            row = await cursor.fetchone()
+    return dict(row) if row else None
+
+
+async def clear_rescan_checkpoint(job: str) -> None:
+    async with aiosqlite.connect(DB_PATH) as db:
+        await db.execute("DELETE FROM profile_rescan_checkpoints WHERE job = ?", (job,))
+        await db.commit()
+
+
+async def apply_profile_rescans(
+    updates: list[tuple[int, int, int | None, dict]],
+    *,
+    job: str,
+    template_version: str,
+    last_key: tuple[int, int],
+    processed: int,
+    changed: int,
+) -> int:
+    """Write changed columns for a page of rescans and advance the job checkpoint in one transaction.
+
+    ``updates`` holds ``(guild_id, user_id, last_updated, {column: value})`` where
+    ``last_updated`` is the value read when the row was paged. A row whose
+    ``last_updated`` moved since (the member uploaded a new screenshot mid-job) is
+    left alone, so stale re-OCR never overwrites a fresh scan. Rescans stamp
+    ``rescanned_at`` and keep ``last_updated`` as the upload time. Only
+    ``RESCAN_COLUMNS`` are written. ``changed`` is the job's running total before
+    this page; returns how many rows this page actually updated.
+    """
+    now_ts = int(time.time())
+    applied = 0
+    touched_guilds: set[int] = set()
+    async with aiosqlite.connect(DB_PATH) as db:
+        for guild_id, user_id, seen_updated, fields in updates:
+            columns = [column for column in RESCAN_COLUMNS if column in fields]
+            if not columns:
+                continue
+            assignments = ", ".join(f"{column} = ?" for column in columns)
+            cursor = await db.execute(
+                f"""
+                UPDATE profile_snapshots SET {assignments}, rescanned_at = ?
+                WHERE guild_id = ? AND user_id = ? AND last_updated IS ?
+                """,
+                (*(fields[column] for column in columns), now_ts, guild_id, user_id, seen_updated),
+            )
+            if cursor.rowcount:
+                applied += cursor.rowcount
+                touched_guilds.add(guild_id)
+        await db.execute(
+            """
+            INSERT OR REPLACE INTO profile_rescan_checkpoints (
+                job, template_version, guild_id, user_id, processed, changed, updated_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (job, template_version, last_key[0], last_key[1], processed, changed + applied, now_ts),
+        )
+        await db.commit()
+    for guild_id in touched_guilds:
+        bump_write_version("profile_snapshots", guild_id)
+    return applied
 
 
 async def get_profile_snapshot(guild_id: int, user_id: int):
@@ -928,6 +1342,7 @@ async def set_profile_scan_valid(guild_id: int, user_id: int, is_valid: bool) ->
             (int(is_valid), guild_id, user_id),
         )
         await db.commit()
+    bump_write_version("profile_snapshots", guild_id)
 
 
 async def delete_profile_snapshot(guild_id: int, user_id: int) -> None:
@@ -937,6 +1352,7 @@ async def delete_profile_snapshot(guild_id: int, user_id: int) -> None:
             (guild_id, user_id),
         )
         await db.commit()
+    bump_write_version("profile_snapshots", guild_id)
 
 
 async def top_profile_stat(guild_id: int, column: str, limit: int = 10):
@@ -992,6 +1408,57 @@ async def top_global_profile_stat(column: str, limit: int = 10):
         ) as cursor:
             return await cursor.fetchall()
 
+
+_EXPORT_STAT_COLUMNS = ("cp", "kills", "likes", "vip_level", "level")
+
+
+async def iter_leaderboard_rows(
+    scope: str, metric: str, guild_id: int | None = None, *, chunk_size: int = 1000
+) -> AsyncIterator[list[aiosqlite.Row]]:
+    """Yield every ranked row for a leaderboard in order, ``chunk_size`` rows at a time.
+
+    The query runs on one cursor and rows are pulled with ``fetchmany``, so an
+    export never materializes the full ranking. Network XP rows carry the
+    survivor's scanned server from a join instead of one lookup per row.
+    """
+    if metric == "xp" and scope == "global":
+        query = """
+            SELECT us.guild_id, us.user_id, us.xp, us.level,
+                   CASE WHEN COALESCE(ps.scan_valid, 1) = 1 THEN ps.server END AS server
+            FROM user_stats us
+            LEFT JOIN profile_snapshots ps ON ps.guild_id = us.guild_id AND ps.user_id = us.user_id
+            ORDER BY us.level DESC, us.xp DESC
+        """
+        params: tuple = ()
+    elif metric == "xp":
+        query = """
+            SELECT user_id, xp, level
+            FROM user_stats
+            WHERE guild_id = ?
+            ORDER BY level DESC, xp DESC
+        """
+        params = (guild_id,)
+    elif metric in _EXPORT_STAT_COLUMNS:
+        scope_filter = "" if scope == "global" else "guild_id = ? AND"
+        query = f"""
+            SELECT guild_id, user_id, player_name, server, {metric} AS value
+            FROM profile_snapshots
+            WHERE {scope_filter} {metric} IS NOT NULL AND COALESCE(scan_valid, 1) = 1
+            ORDER BY {metric} DESC
+        """
+        params = () if scope == "global" else (guild_id,)
+    else:
+        return
+
+    async with aiosqlite.connect(DB_PATH) as db:
+        db.row_factory = aiosqlite.Row
+        async with db.execute(query, params) as cursor:
+            while True:
+                rows = await cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                yield rows
+
 # --- LEVELING HELPERS ---
 
 async def _ensure_user(db: aiosqlite.Connection, guild_id: int, user_id: int) -> None:
@@ -1045,6 +1512,7 @@ async def update_user_xp(guild_id: int, user_id: int, xp_delta: int, new_level:
                 (xp_delta, new_level, guild_id, user_id),
             )
         await db.commit()
+    bump_write_version("user_stats", guild_id)
 
 
 async def add_to_inventory(guild_id: int, user_id: int, item_name: str, quantity: int, rarity: str):
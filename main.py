@@ -4,6 +4,7 @@ USE: Central entry point for Marcia OS.
 FEATURES: Handles initialization, Cog loading, SQL database connectivity, and persistent views.
 """
 import asyncio
+import importlib.util
 import logging
 import os
 import sys
@@ -11,6 +12,7 @@ from pathlib import Path
 import random
 import time
 
+_PROCESS_T0 = time.perf_counter()
 BASE_DIR = Path(__file__).resolve().parent
 
 
@@ -31,8 +33,13 @@ from discord.errors import HTTPException
 from discord.ext import commands
 from dotenv import load_dotenv
 
+from utils import jsonio
 from utils.assets import MARCIA_QUOTES
 from utils.bug_logging import log_command_exception
+from utils.boot_timeline import BootTimeline
+from utils.loop_monitor import LoopLagMonitor
+from utils.process_stats import current_rss_bytes, format_bytes
+from utils.command_sync import load_sync_state, needs_sync, save_sync_state, tree_fingerprint
 from cogs.trading import FishControlView
 from database import init_db, increment_command_usage, is_channel_ignored
 
@@ -48,9 +55,25 @@ def configure_logging() -> None:
         )
 
 
+def configure_event_loop() -> str:
+    """Install uvloop when `MARCIA_UVLOOP=1` and it is available; return the loop name."""
+    if os.getenv("MARCIA_UVLOOP", "").lower() not in {"1", "true", "yes"}:
+        return "asyncio"
+    if importlib.util.find_spec("uvloop") is None:
+        logger.warning("MARCIA_UVLOOP is set but uvloop is not installed; using asyncio.")
+        return "asyncio"
+
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return "uvloop"
+
+
 # Load environment variables
 load_dotenv()
 TOKEN = os.getenv("TOKEN")
+jsonio.set_backend(os.getenv("MARCIA_JSON_BACKEND", "stdlib"))
+FORCE_COMMAND_SYNC = os.getenv("MARCIA_FORCE_SYNC", "").lower() in {"1", "true", "yes"}
 COG_DIR = BASE_DIR / "cogs"
 
 class MarciaBot(commands.Bot):
@@ -71,6 +94,10 @@ class MarciaBot(commands.Bot):
         )
         self._recent_interactions: dict[int, float] = {}
         self._interaction_dedupe_window = 120.0
+        self.cog_load_stats: list[dict] = []
+        self.boot_timeline = BootTimeline(origin=_PROCESS_T0)
+        self._boot_report_task: asyncio.Task | None = None
+        self.loop_monitor = LoopLagMonitor.from_env()
 
     def _should_process_interaction(self, interaction: discord.Interaction) -> bool:
         now = time.monotonic()
@@ -85,32 +112,78 @@ class MarciaBot(commands.Bot):
 
     async def setup_hook(self):
         """Pre-connection setup: Initializing DB, Loading Cogs, and Persistence."""
+        timeline = self.boot_timeline
+        timeline.mark("setup_hook")
+        if self.loop_monitor:
+            self.loop_monitor.start()
         logger.info("📡 Connecting to Central Intelligence Database...")
         try:
-            await init_db()
+            with timeline.span("init_db"):
+                await init_db()
             logger.info("✔ Database Initialized.")
         except Exception as e:
             logger.error(f"✘ Database Failure: {e}")
+            timeline.write_report()
             return
 
         # 1. Register Persistent Views (Makes Trading buttons work after restart)
-        self.add_view(FishControlView(self, persistent=True))
+        with timeline.span("persistent_views"):
+            self.add_view(FishControlView(self, persistent=True))
         logger.info("✔ Persistent Views Registered.")
 
         # 2. Automatically load all cogs
         logger.info("🛰️ Initializing system modules...")
-        await self._load_cogs()
+        with timeline.span("load_cogs"):
+            await self._load_cogs()
 
         # 2.5. Guard slash commands from ignored channels
         self.tree.interaction_check = self._interaction_channel_gate
 
-        # 3. Sync slash commands so `/` autocomplete stays fresh
+        # 3. Sync slash commands so `/` autocomplete stays fresh (skipped when unchanged)
         try:
-            synced = await self.tree.sync()
-            logger.info("✔ Slash commands synced (%d registered).", len(synced))
+            with timeline.span("tree_sync"):
+                await self.sync_command_tree(force=FORCE_COMMAND_SYNC)
         except Exception:
             logger.exception("✘ Slash command sync failed")
 
+    async def sync_command_tree(self, *, force: bool = False) -> int | None:
+        """Push the global command tree only when its fingerprint changed.
+
+        Returns the number of synced commands, or ``None`` when the sync was skipped.
+        """
+        fingerprint, command_count = tree_fingerprint(self.tree)
+        state = load_sync_state()
+        if not force and not needs_sync(state, fingerprint, self.application_id):
+            logger.info(
+                "✔ Slash commands unchanged (%d registered, fingerprint %s); skipped sync, saved ~%.2fs.",
+                command_count,
+                fingerprint[:12],
+                state.sync_seconds,
+            )
+            return None
+
+        started = time.perf_counter()
+        synced = await self.tree.sync()
+        elapsed = time.perf_counter() - started
+        save_sync_state(
+            fingerprint,
+            application_id=self.application_id,
+            command_count=len(synced),
+            sync_seconds=elapsed,
+        )
+        logger.info(
+            "✔ Slash commands synced (%d registered) in %.2fs%s.",
+            len(synced),
+            elapsed,
+            " [forced]" if force else "",
+        )
+        return len(synced)
+
+    async def close(self):
+        if self.loop_monitor:
+            self.loop_monitor.stop()
+        await super().close()
+
     async def _interaction_channel_gate(self, interaction: discord.Interaction) -> bool:
         """Block slash commands inside ignored channels without spamming responses."""
         if interaction.guild and interaction.channel_id:
@@ -147,6 +220,10 @@ class MarciaBot(commands.Bot):
 
     async def on_ready(self):
         """Final system check once online."""
+        self.boot_timeline.mark("gateway_ready")
+        if self._boot_report_task is None:
+            self._boot_report_task = asyncio.create_task(self.boot_timeline.finalize())
+
         logger.info("-" * 30)
         logger.info("MARCIA OS ONLINE")
         logger.info(f"User: {self.user} (ID: {self.user.id})")
@@ -281,6 +358,7 @@ class MarciaBot(commands.Bot):
 
     async def on_command_completion(self, ctx):
         """Log message-command usage for analytics dashboards."""
+        self.boot_timeline.mark("first_response")
         try:
             await increment_command_usage(getattr(ctx.guild, "id", None), ctx.command.qualified_name)
         except Exception:
@@ -288,6 +366,7 @@ class MarciaBot(commands.Bot):
 
     async def on_app_command_completion(self, interaction: discord.Interaction, command: discord.app_commands.Command):
         """Log slash-command usage so `/` analytics stay accurate."""
+        self.boot_timeline.mark("first_response")
         try:
             await increment_command_usage(getattr(interaction.guild, "id", None), command.qualified_name)
         except Exception:
@@ -385,21 +464,74 @@ class MarciaBot(commands.Bot):
         )
 
     async def _load_cogs(self):
-        """Load all discovered cogs in a deterministic order."""
+        """Load all discovered cogs in a deterministic order and report their cost."""
         COG_DIR.mkdir(exist_ok=True)
+        self.cog_load_stats = []
         for cog_path in sorted(COG_DIR.glob("*.py")):
             if cog_path.stem.startswith("__"):
                 continue
 
+            rss_before = current_rss_bytes()
+            started = time.perf_counter()
+            loaded = False
             try:
                 await self.load_extension(f"cogs.{cog_path.stem}")
+                loaded = True
                 logger.info("✔ Module Loaded: %s", cog_path.name)
             except Exception:
                 logger.exception("✘ Module Failed [%s]", cog_path.name)
+            rss_after = current_rss_bytes()
+
+            entry = {
+                "cog": cog_path.stem,
+                "loaded": loaded,
+                "seconds": round(time.perf_counter() - started, 4),
+                "rss_delta_bytes": (
+                    rss_after - rss_before
+                    if rss_before is not None and rss_after is not None
+                    else None
+                ),
+            }
+            self.cog_load_stats.append(entry)
+            self.boot_timeline.record(
+                f"cog:{cog_path.stem}",
+                start=started,
+                seconds=entry["seconds"],
+                kind="cog_load",
+                loaded=loaded,
+                rss_delta_bytes=entry["rss_delta_bytes"],
+            )
+
+        self._log_cog_load_report()
+
+    def _log_cog_load_report(self) -> None:
+        """Summarize per-cog import time and RSS growth, slowest first."""
+        if not self.cog_load_stats:
+            return
+        total = sum(entry["seconds"] for entry in self.cog_load_stats)
+        logger.info(
+            "📊 Cog startup report: %d modules in %.2fs (RSS now %s)",
+            len(self.cog_load_stats),
+            total,
+            format_bytes(current_rss_bytes()),
+        )
+        for entry in sorted(self.cog_load_stats, key=lambda e: e["seconds"], reverse=True):
+            logger.info(
+                "   %-18s %7.3fs  RSS Δ %s%s",
+                entry["cog"],
+                entry["seconds"],
+                format_bytes(entry["rss_delta_bytes"]),
+                "" if entry["loaded"] else "  [failed]",
+            )
 
 async def main():
     configure_logging()
     logger.info("📂 Working directory pinned to %s", BASE_DIR)
+    logger.info(
+        "⚙️ Runtime: %s loop, %s JSON",
+        type(asyncio.get_running_loop()).__module__.split(".")[0],
+        jsonio.backend_name(),
+    )
 
     if not TOKEN:
         logger.error("✘ TOKEN missing. Please set the TOKEN environment variable before starting Marcia OS.")
@@ -412,13 +544,34 @@ async def main():
     @commands.is_owner()
     async def sync(ctx):
         await ctx.defer()
-        fmt = await bot.tree.sync()
-        await ctx.send(f"📡 Synced {len(fmt)} command trees.")
+        synced = await bot.sync_command_tree(force=True)
+        await ctx.send(f"📡 Synced {synced or 0} command trees.")
+
+    # Event-loop lag percentiles and the call sites that blocked it (Owner only)
+    @bot.command(hidden=True)
+    @commands.is_owner()
+    async def looplag(ctx):
+        monitor = bot.loop_monitor
+        if not monitor or not monitor.running:
+            return await ctx.send("⏱️ Loop lag monitor is disabled (`MARCIA_LOOP_MONITOR=0`).")
+
+        stats = monitor.snapshot()
+        lines = [
+            f"Samples: {stats['samples']} (every {monitor.interval * 1000:.0f}ms)",
+            "Lag p50 / p90 / p99 / max: "
+            + " / ".join(f"{stats[key] * 1000:.1f}ms" for key in ("p50", "p90", "p99", "max")),
+            f"Stalls over {monitor.threshold * 1000:.0f}ms: {stats['stalls']}",
+        ]
+        if stats["top_call_sites"]:
+            lines.append("Top blocking call sites:")
+            lines.extend(f"• `{site}` ×{count}" for site, count in stats["top_call_sites"])
+        await ctx.send("\n".join(lines))
 
     async with bot:
         await bot.start(TOKEN)
 
 if __name__ == "__main__":
+    configure_event_loop()
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
@@ -0,0 +1,549 @@
+"""Offline accuracy and latency benchmark for the OCR engine paths.
+
+Runs each engine path over a folder of screenshots and, when a label file is
+given, scores the parsed fields against ground truth. Paths:
+
+    batched    template boxes, one batched ``recognize`` call (bot default, with
+               numeric variant voting unless ``OCR_NUMERIC_VARIANTS=0``)
+    batched_plain  the same without numeric variants
+    per_field  template boxes, ``readtext`` (CRAFT detection) per crop
+    pipeline   what the bot runs: button pre-check (``OCR_VERIFY_FIRST``), batched
+               template + full-text fallback
+    pipeline_plain  the pipeline without numeric variants (compare fallback rates)
+    full_text  EasyOCR detection + recognition over the whole screenshot
+    tesseract  whole-image pytesseract pass
+    tesseract_roi  pytesseract per template crop (digit whitelists, threaded)
+
+Each path runs in a fresh interpreter, so its peak RSS is its own high-water
+mark (reader load included) rather than the heaviest path measured before it.
+Every scan decodes a fresh ``ScanImage``, so ``decode`` is reported as its own
+stage next to the recognition stages. ``--trace-allocations`` adds a tracemalloc
+pass with per-scan peak allocations.
+
+``--resolutions`` instead rescales every screenshot to each capture size recorded
+in ``boxes_ratios.json`` metadata (or 720/1080/1440px when none are recorded) and
+runs the batched path twice per size: with crops normalized to ``OCR_CROP_HEIGHT``
+and with the old fixed 2x upscale.
+
+``--matrix`` measures throughput instead: for every combination of torch
+threads (``--threads``), worker processes (``--concurrency``) and quantization
+(``--quantize on,off``) it starts a warm worker pool, keeps every worker busy,
+and reports images/s, latency percentiles, and accuracy, fastest first.
+
+Labels are JSON (``{"1.webp": {"cp": 123, ...}}`` or a list of objects with a
+``file`` key) or CSV with a ``file`` column; other columns are snapshot fields
+such as ``player_name``, ``cp``, ``kills``, ``likes``, ``vip_level``,
+``alliance``, ``server``.
+
+Usage:
+    python ocr/benchmark.py [--input shots] [--labels labels.csv] [--paths batched,pipeline]
+        [--rounds 3] [--trace-allocations] [--resolutions] [--json-out results.json]
+    python ocr/benchmark.py --matrix [--threads 1,2,4] [--concurrency 1,2] [--quantize on,off]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+import itertools
+import os
+import json
+import re
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from ocr.engine import (  # noqa: E402
+    NUMERIC_FIELDS,
+    TARGET_CROP_HEIGHT,
+    VERIFY_FIRST,
+    OcrEngine,
+    ScanImage,
+    has_profile_metrics,
+    load_template_data,
+    parse_profile_text,
+    tesseract_installed,
+    vision_modules,
+)
+from ocr.worker_pool import OcrWorkerPool  # noqa: E402
+from utils.process_stats import format_bytes, peak_rss_bytes  # noqa: E402
+
+IMAGE_EXTS = (".png", ".jpg", ".jpeg", ".webp")
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _latency(samples: list[float]) -> dict:
+    ordered = sorted(samples)
+    return {
+        "mean": statistics.mean(ordered),
+        "p50": _percentile(ordered, 50),
+        "p90": _percentile(ordered, 90),
+        "p95": _percentile(ordered, 95),
+        "p99": _percentile(ordered, 99),
+        "samples": len(ordered),
+    }
+
+
+def _list_images(folder: Path) -> list[Path]:
+    if not folder.is_dir():
+        raise SystemExit(f"Input folder '{folder}' is missing. Drop profile screenshots inside first.")
+    images = sorted(p for p in folder.iterdir() if p.suffix.lower() in IMAGE_EXTS)
+    if not images:
+        raise SystemExit(f"No screenshots found in '{folder}'.")
+    return images
+
+
+def load_labels(path: Path) -> dict[str, dict]:
+    """Read ground truth keyed by file name from a JSON or CSV label file."""
+    if path.suffix.lower() == ".csv":
+        with path.open(newline="", encoding="utf-8") as fp:
+            rows = list(csv.DictReader(fp))
+    else:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        if isinstance(data, dict):
+            return {name: dict(fields) for name, fields in data.items()}
+        rows = data
+
+    labels = {}
+    for row in rows:
+        row = dict(row)
+        name = row.pop("file", None)
+        if name:
+            labels[name] = {field: value for field, value in row.items() if value not in (None, "")}
+    return labels
+
+
+def normalize(field: str, value):
+    """Compare numbers by digits and text case- and whitespace-insensitively."""
+    if value is None or value == "":
+        return None
+    if field in NUMERIC_FIELDS:
+        digits = re.sub(r"[^\d]", "", str(value))
+        return int(digits) if digits else None
+    return " ".join(str(value).split()).casefold()
+
+
+def _timed(stages: dict, name: str, fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    stages[name] = time.perf_counter() - started
+    return result
+
+
+def _decode(image: ScanImage, stages: dict) -> None:
+    _timed(stages, "decode", lambda: image.bgr)
+
+
+def run_batched(engine: OcrEngine, image: ScanImage, stages: dict) -> dict:
+    _decode(image, stages)
+    result = _timed(stages, "template", engine.scan_template, image, batched=True)
+    return (result or {}).get("parsed", {})
+
+
+def run_batched_plain(engine: OcrEngine, image: ScanImage, stages: dict) -> dict:
+    _decode(image, stages)
+    result = _timed(stages, "template", engine.scan_template, image, batched=True, variants=False)
+    return (result or {}).get("parsed", {})
+
+
+def _run_pipeline(engine: OcrEngine, image: ScanImage, stages: dict, **template_options) -> dict:
+    # Same stages as OcrEngine.scan_easyocr: button pre-check, template, full-text fallback.
+    _decode(image, stages)
+    result = _timed(
+        stages, "template", engine.scan_template, image, verify_first=VERIFY_FIRST, **template_options
+    ) or {"parsed": {}}
+    parsed = dict(result["parsed"])
+    if not result.get("rejected_early") and not has_profile_metrics(parsed):
+        text = _timed(stages, "full_text", engine.scan_full_text, image)
+        parsed.update(parse_profile_text(text))
+    return parsed
+
+
+def run_pipeline_plain(engine: OcrEngine, image: ScanImage, stages: dict) -> dict:
+    return _run_pipeline(engine, image, stages, variants=False)
+
+
+def run_per_field(engine: OcrEngine, image: ScanImage, stages: dict) -> dict:
+    _decode(image, stages)
+    result = _timed(stages, "template", engine.scan_template, image, batched=False)
+    return (result or {}).get("parsed", {})
+
+
+def run_pipeline(engine: OcrEngine, image: ScanImage, stages: dict) -> dict:
+    return _run_pipeline(engine, image, stages)
+
+
+def run_full_text(engine: OcrEngine, image: ScanImage, stages: dict) -> dict:
+    _decode(image, stages)
+    text = _timed(stages, "full_text", engine.scan_full_text, image)
+    return parse_profile_text(text)
+
+
+def run_tesseract(engine: OcrEngine, image: ScanImage, stages: dict) -> dict:
+    _decode(image, stages)
+    text = _timed(stages, "tesseract", engine.scan_tesseract, image)
+    return parse_profile_text(text)
+
+
+def run_tesseract_roi(engine: OcrEngine, image: ScanImage, stages: dict) -> dict:
+    _decode(image, stages)
+    result = _timed(stages, "tesseract_roi", engine.scan_tesseract_fields, image)
+    return (result or {}).get("parsed", {})
+
+
+PATHS = {
+    "batched": run_batched,
+    "batched_plain": run_batched_plain,
+    "per_field": run_per_field,
+    "pipeline": run_pipeline,
+    "pipeline_plain": run_pipeline_plain,
+    "full_text": run_full_text,
+    "tesseract": run_tesseract,
+    "tesseract_roi": run_tesseract_roi,
+}
+
+
+def _score(parsed: dict, expected: dict, tally: dict) -> None:
+    for field, value in expected.items():
+        counts = tally[field]
+        counts["labelled"] += 1
+        if normalize(field, parsed.get(field)) == normalize(field, value):
+            counts["correct"] += 1
+
+
+def benchmark_path(
+    name: str,
+    engine: OcrEngine,
+    payloads: dict[str, bytes],
+    labels: dict[str, dict],
+    *,
+    rounds: int,
+    trace_allocations: bool,
+) -> dict:
+    run = PATHS[name]
+    first = next(iter(payloads.values()))
+    run(engine, ScanImage(first), {})  # untimed warm-up
+
+    end_to_end: list[float] = []
+    stage_samples: dict[str, list[float]] = defaultdict(list)
+    tally: dict[str, dict[str, int]] = defaultdict(lambda: {"correct": 0, "labelled": 0})
+    for round_index in range(rounds):
+        for file_name, data in payloads.items():
+            stages: dict[str, float] = {}
+            started = time.perf_counter()
+            parsed = run(engine, ScanImage(data), stages)
+            end_to_end.append(time.perf_counter() - started)
+            for stage, seconds in stages.items():
+                stage_samples[stage].append(seconds)
+            if round_index == 0 and file_name in labels:
+                _score(parsed, labels[file_name], tally)
+
+    report = {
+        "latency": {
+            "end_to_end": _latency(end_to_end),
+            "stages": {stage: _latency(samples) for stage, samples in stage_samples.items()},
+        },
+        "peak_rss_bytes": peak_rss_bytes(),
+    }
+    if "template" in stage_samples:
+        # Share of scans whose template pass missed the metrics and paid for full-image OCR.
+        report["full_text_rate"] = len(stage_samples.get("full_text", ())) / len(end_to_end)
+    if tally:
+        correct = sum(counts["correct"] for counts in tally.values())
+        labelled = sum(counts["labelled"] for counts in tally.values())
+        report["accuracy"] = {
+            "overall": correct / labelled if labelled else None,
+            "fields": {
+                field: {**counts, "rate": counts["correct"] / counts["labelled"]}
+                for field, counts in sorted(tally.items())
+            },
+        }
+
+    if trace_allocations:
+        # Separate pass: tracemalloc slows every allocation down.
+        peaks = []
+        tracemalloc.start()
+        for data in payloads.values():
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            run(engine, ScanImage(data), {})
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+        tracemalloc.stop()
+        report["allocations"] = {"peak_bytes_mean": statistics.mean(peaks), "peak_bytes_max": max(peaks)}
+    return report
+
+
+# Common phone capture widths (720p, 1080p, 1440p), swept when the templates record no sizes.
+STANDARD_SHORT_SIDES = (720, 1080, 1440)
+
+
+def template_short_sides(boxes_path: Path) -> list[int]:
+    """Distinct short sides of the captures recorded in the template metadata.
+
+    Templates picked before ``box_picker.py`` recorded ``image_sizes`` only carry
+    the (tiny) reference size; those sweep ``STANDARD_SHORT_SIDES`` as well, so
+    the large-capture downscale path is always measured.
+    """
+    meta = load_template_data(boxes_path).get("meta") or {}
+    sizes = [min(size) for size in (meta.get("image_sizes") or {}).values() if size]
+    if not sizes:
+        sizes.extend(STANDARD_SHORT_SIDES)
+    if meta.get("reference_size_px"):
+        sizes.append(min(meta["reference_size_px"]))
+    return sorted(set(sizes))
+
+
+def _rescale(data: bytes, short_side: int) -> bytes:
+    cv2, np = vision_modules()
+    img = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), cv2.IMREAD_COLOR)
+    scale = short_side / min(img.shape[:2])
+    interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_CUBIC
+    resized = cv2.resize(img, None, fx=scale, fy=scale, interpolation=interpolation)
+    # PNG so the sweep measures scaling, not extra compression artefacts.
+    return cv2.imencode(".png", resized)[1].tobytes()
+
+
+def benchmark_resolutions(
+    engine: OcrEngine, payloads: dict[str, bytes], labels: dict[str, dict], *, rounds: int
+) -> dict:
+    """Batched template path per capture size, normalized crops vs fixed 2x."""
+    results = {}
+    for short_side in template_short_sides(engine.boxes_path):
+        scaled = {name: _rescale(data, short_side) for name, data in payloads.items()}
+        for mode, crop_height in (("normalized", TARGET_CROP_HEIGHT), ("fixed_2x", None)):
+            engine.crop_height = crop_height
+            report = benchmark_path("batched", engine, scaled, labels, rounds=rounds, trace_allocations=False)
+            # One process serves the whole sweep, so its RSS high-water mark says nothing per row.
+            report["peak_rss_bytes"] = None
+            results[f"{short_side}px/{mode}"] = report
+    engine.crop_height = TARGET_CROP_HEIGHT
+    return results
+
+
+async def _run_matrix_cell(
+    payloads: dict[str, bytes], labels: dict[str, dict], *, threads: int, concurrency: int, quantize: bool, rounds: int
+) -> dict:
+    pool = OcrWorkerPool(concurrency, warm_up=True, torch_threads=threads, quantize=quantize)
+    try:
+        statuses = await pool.warm_all()
+        if not all(status["ready"] for status in statuses):
+            return {"skipped": statuses[0]["failure_reason"] or "worker failed to load"}
+
+        slots = asyncio.Semaphore(concurrency)
+        latencies: list[float] = []
+        tally: dict[str, dict[str, int]] = defaultdict(lambda: {"correct": 0, "labelled": 0})
+
+        async def _one(file_name: str, data: bytes, score: bool) -> None:
+            async with slots:
+                started = time.perf_counter()
+                result = await pool.scan(data) or {}
+                latencies.append(time.perf_counter() - started)
+            parsed = dict(result.get("parsed") or {})
+            if result.get("full_text"):
+                parsed.update(parse_profile_text(result["full_text"]))
+            if score and file_name in labels:
+                _score(parsed, labels[file_name], tally)
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _one(file_name, data, round_index == 0)
+                for round_index in range(rounds)
+                for file_name, data in payloads.items()
+            )
+        )
+        wall = time.perf_counter() - started
+    finally:
+        pool.shutdown(wait=True)
+
+    labelled = sum(counts["labelled"] for counts in tally.values())
+    return {
+        "throughput": len(latencies) / wall if wall else 0.0,
+        "latency": {"end_to_end": _latency(latencies)},
+        "accuracy": sum(counts["correct"] for counts in tally.values()) / labelled if labelled else None,
+    }
+
+
+def benchmark_matrix(
+    payloads: dict[str, bytes],
+    labels: dict[str, dict],
+    *,
+    threads: list[int],
+    concurrency: list[int],
+    quantize: list[bool],
+    rounds: int,
+) -> dict:
+    """Throughput per torch threads × worker count × quantization, each in a fresh warm pool."""
+    results = {}
+    for thread_count, workers, quantized in itertools.product(threads, concurrency, quantize):
+        name = f"t{thread_count}×c{workers}×{'int8' if quantized else 'fp32'}"
+        print(f"… {name}", flush=True)
+        results[name] = asyncio.run(
+            _run_matrix_cell(
+                payloads, labels, threads=thread_count, concurrency=workers, quantize=quantized, rounds=rounds
+            )
+        )
+    return results
+
+
+def _print_matrix(results: dict) -> None:
+    print(f"{os.cpu_count()} CPU cores\n")
+    print(f"{'config':<16} {'img/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'accuracy':>9}")
+    ranked = sorted(results.items(), key=lambda item: -item[1].get("throughput", -1))
+    for name, report in ranked:
+        if "skipped" in report:
+            print(f"{name:<16} skipped: {report['skipped']}")
+            continue
+        e2e = report["latency"]["end_to_end"]
+        accuracy = report["accuracy"]
+        print(
+            f"{name:<16} {report['throughput']:>7.2f} {e2e['p50'] * 1000:>8.1f} "
+            f"{e2e['p95'] * 1000:>8.1f} "
+            f"{f'{accuracy:.1%}' if accuracy is not None else '—':>9}"
+        )
+
+
+def _print_report(results: dict) -> None:
+    width = max(13, *(len(name) + 1 for name in results))
+    print(f"{'path':<{width}} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'accuracy':>9} {'peak RSS':>10}  stages (p50 ms)")
+    for name, report in results.items():
+        if "skipped" in report:
+            print(f"{name:<{width}} skipped: {report['skipped']}")
+            continue
+        e2e = report["latency"]["end_to_end"]
+        accuracy = report.get("accuracy", {}).get("overall")
+        stages = ", ".join(
+            f"{stage} {stats['p50'] * 1000:.0f}" for stage, stats in report["latency"]["stages"].items()
+        )
+        print(
+            f"{name:<{width}} {e2e['p50'] * 1000:>8.1f} {e2e['p90'] * 1000:>8.1f} {e2e['p99'] * 1000:>8.1f} "
+            f"{f'{accuracy:.1%}' if accuracy is not None else '—':>9} "
+            f"{format_bytes(report['peak_rss_bytes']):>10}  {stages}"
+        )
+        if name.startswith("pipeline"):
+            print(f"{'':<{width}}   full-image fallback on {report['full_text_rate']:.0%} of scans")
+        for field, counts in report.get("accuracy", {}).get("fields", {}).items():
+            print(f"{'':<{width}}   {field:<12} {counts['correct']}/{counts['labelled']} ({counts['rate']:.0%})")
+
+
+def _worker_main(args: argparse.Namespace) -> None:
+    """Benchmark one path in this (fresh) process and print its report as JSON."""
+    engine = OcrEngine()
+    if not engine.load():
+        print(json.dumps({"skipped": engine.failure_reason}))
+        return
+    payloads = {path.name: path.read_bytes() for path in _list_images(args.input)}
+    labels = load_labels(args.labels) if args.labels else {}
+    report = benchmark_path(
+        args.worker_path, engine, payloads, labels, rounds=args.rounds, trace_allocations=args.trace_allocations
+    )
+    print(json.dumps(report))
+
+
+def _run_path_process(name: str, args: argparse.Namespace) -> dict:
+    cmd = [sys.executable, __file__, "--worker-path", name, "--input", str(args.input), "--rounds", str(args.rounds)]
+    if args.labels:
+        cmd += ["--labels", str(args.labels)]
+    if args.trace_allocations:
+        cmd.append("--trace-allocations")
+    output = subprocess.check_output(cmd, cwd=REPO_ROOT, text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", type=Path, default=REPO_ROOT / "shots", help="folder of screenshots")
+    parser.add_argument("--labels", type=Path, help="ground-truth JSON or CSV keyed by file name")
+    parser.add_argument(
+        "--paths", default=",".join(PATHS), help=f"comma-separated subset of: {', '.join(PATHS)}"
+    )
+    parser.add_argument("--rounds", type=int, default=3, help="timed passes over the folder per path")
+    parser.add_argument("--trace-allocations", action="store_true", help="add a tracemalloc pass per path")
+    parser.add_argument(
+        "--resolutions", action="store_true", help="sweep the batched path over the template capture sizes"
+    )
+    parser.add_argument("--matrix", action="store_true", help="throughput matrix over worker pools")
+    parser.add_argument("--threads", default="1,2,4", help="--matrix: torch intra-op threads per worker")
+    parser.add_argument("--concurrency", default="1,2", help="--matrix: worker processes")
+    parser.add_argument("--quantize", default="on,off", help="--matrix: int8 quantization on and/or off")
+    parser.add_argument("--json-out", type=Path, help="write machine-readable results here")
+    parser.add_argument("--worker-path", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.matrix:
+        images = _list_images(args.input)
+        labels = load_labels(args.labels) if args.labels else {}
+        payloads = {path.name: path.read_bytes() for path in images}
+        results = benchmark_matrix(
+            payloads,
+            labels,
+            threads=[int(value) for value in args.threads.split(",") if value.strip()],
+            concurrency=[int(value) for value in args.concurrency.split(",") if value.strip()],
+            quantize=[value.strip() == "on" for value in args.quantize.split(",") if value.strip()],
+            rounds=args.rounds,
+        )
+        print(f"\n{len(images)} screenshots × {args.rounds} rounds per configuration")
+        _print_matrix(results)
+        if args.json_out:
+            report = {"images": len(images), "rounds": args.rounds, "cpu_count": os.cpu_count(), "matrix": results}
+            args.json_out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+            print(f"\nSaved results to {args.json_out}")
+        return
+
+    if args.worker_path:
+        _worker_main(args)
+        return
+
+    paths = [name.strip() for name in args.paths.split(",") if name.strip()]
+    unknown = [name for name in paths if name not in PATHS]
+    if unknown:
+        raise SystemExit(f"Unknown path(s): {', '.join(unknown)}")
+
+    images = _list_images(args.input)
+    labels = load_labels(args.labels) if args.labels else {}
+    engine = OcrEngine()
+    # Paths load their own reader in a subprocess; only the resolution sweep needs one here.
+    if not (engine.load() if args.resolutions else engine.load_templates()):
+        raise SystemExit(engine.failure_reason or f"OCR templates not found at {engine.boxes_path}.")
+    payloads = {path.name: path.read_bytes() for path in images}
+
+    results: dict[str, dict] = {}
+    if args.resolutions:
+        paths = []
+        results = benchmark_resolutions(engine, payloads, labels, rounds=args.rounds)
+    for name in paths:
+        if name.startswith("tesseract") and not tesseract_installed():
+            results[name] = {"skipped": "pytesseract is not installed"}
+            continue
+        results[name] = _run_path_process(name, args)
+
+    labelled = sum(name in labels for name in payloads)
+    print(f"{len(images)} screenshots ({labelled} labelled) × {args.rounds} rounds\n")
+    _print_report(results)
+
+    if args.json_out:
+        report = {
+            "images": len(images),
+            "labelled": labelled,
+            "rounds": args.rounds,
+            "template_layouts": len(engine.layouts or ()),
+            "paths": results,
+        }
+        args.json_out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nSaved results to {args.json_out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,25 @@
+"""Pick OCR bounding boxes on profile screenshots.
+
+Default mode picks boxes on the first screenshot in ``shots/``. ``--calibrate``
+walks every screenshot, records per-image picks, and rebuilds the per-layout box
+sets (keyed by aspect ratio and resolution bucket) in ``ocr/boxes_ratios.json``.
+``--rebuild`` re-aggregates saved picks without opening a window.
+"""
+import argparse
 import os
 import json
+import statistics
+import sys
+from pathlib import Path
+
 import cv2
 
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from ocr.layouts import layout_key  # noqa: E402
+
 INPUT_DIR = "shots"
 OUT_FILE = "boxes_ratios.json"
 
@@ -30,7 +48,120 @@ def clamp01(v: float) -> float:
     return max(0.0, min(1.0, v))
 
 
+def pick_boxes(img, fields) -> dict:
+    """Let the user drag one rectangle per field; returns ratio boxes."""
+    scaled_h, scaled_w = img.shape[:2]
+    boxes_ratios = {}
+
+    for field in fields:
+        while True:
+            print(f"Select region for: {field}")
+            x, y, w, h = cv2.selectROI("image", img, showCrosshair=True, fromCenter=False)
+            x, y, w, h = int(x), int(y), int(w), int(h)
+
+            if w <= 0 or h <= 0:
+                print("Nothing selected. Try again.\n")
+                continue
+
+            # Convert from scaled pixels -> ratios (0..1) relative to scaled image
+            x1r = clamp01(x / scaled_w)
+            y1r = clamp01(y / scaled_h)
+            x2r = clamp01((x + w) / scaled_w)
+            y2r = clamp01((y + h) / scaled_h)
+
+            boxes_ratios[field] = [x1r, y1r, x2r, y2r]
+            print(f"Saved {field} ratios: {boxes_ratios[field]}\n")
+            break
+
+    return boxes_ratios
+
+
+def _median_boxes(per_image: dict, images: list[str]) -> dict:
+    medians = {}
+    for field, picks in per_image.items():
+        boxes = [picks[name] for name in images if name in picks]
+        if boxes:
+            medians[field] = [statistics.median(coords) for coords in zip(*boxes)]
+    return medians
+
+
+def rebuild_layouts(data: dict) -> dict:
+    """Group calibrated images by layout key and store median boxes per layout."""
+    meta = data.setdefault("meta", {})
+    sizes = meta.get("image_sizes") or {}
+    per_image = data.get("per_image_ratios") or {}
+
+    groups: dict[str, list[str]] = {}
+    for name, (width, height) in sorted(sizes.items()):
+        groups.setdefault(layout_key(width, height), []).append(name)
+
+    data["layouts"] = {
+        key: {"source_images": names, "ratios": _median_boxes(per_image, names)}
+        for key, names in sorted(groups.items())
+    }
+    all_images = sorted({name for picks in per_image.values() for name in picks})
+    if all_images:
+        data["template_ratios"] = _median_boxes(per_image, all_images)
+        meta["template_images"] = all_images
+        meta["template_count"] = len(all_images)
+    return data["layouts"]
+
+
+def calibrate(input_dir: Path, boxes_path: Path, *, redo: bool = False, interactive: bool = True) -> None:
+    data = json.loads(boxes_path.read_text(encoding="utf-8")) if boxes_path.exists() else {}
+    meta = data.setdefault("meta", {})
+    fields = meta.get("all_fields") or FIELDS
+    sizes = meta.setdefault("image_sizes", {})
+    per_image = data.setdefault("per_image_ratios", {})
+
+    # Older template files lack sizes for images picked before calibration existed.
+    picked = {name for picks in per_image.values() for name in picks}
+    for name in sorted(picked - sizes.keys()):
+        img0 = cv2.imread(str(input_dir / name)) if (input_dir / name).is_file() else None
+        if img0 is not None:
+            sizes[name] = [img0.shape[1], img0.shape[0]]
+
+    if interactive:
+        cv2.namedWindow("image", cv2.WINDOW_NORMAL)
+        cv2.resizeWindow("image", WINDOW_W, WINDOW_H)
+        for name in list_images(str(input_dir)):
+            if name in sizes and not redo:
+                continue
+            img0 = cv2.imread(str(input_dir / name))
+            if img0 is None:
+                print(f"Skipping unreadable '{name}'.")
+                continue
+
+            h0, w0 = img0.shape[:2]
+            print(f"\n{name}: {w0}x{h0} -> layout {layout_key(w0, h0)}")
+            img = cv2.resize(img0, None, fx=SCALE, fy=SCALE, interpolation=cv2.INTER_CUBIC) if SCALE != 1 else img0
+            for field, box in pick_boxes(img, fields).items():
+                per_image.setdefault(field, {})[name] = box
+            sizes[name] = [w0, h0]
+            # Save after every image so a long calibration session can be resumed.
+            boxes_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        cv2.destroyAllWindows()
+
+    layouts = rebuild_layouts(data)
+    boxes_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    print(f"\nSaved {len(layouts)} layouts to '{boxes_path}':")
+    for key, entry in layouts.items():
+        print(f"  {key}: {len(entry['source_images'])} images")
+
+
 def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calibrate", action="store_true", help="pick boxes on every screenshot and rebuild layouts")
+    parser.add_argument("--rebuild", action="store_true", help="rebuild layouts from saved picks only")
+    parser.add_argument("--redo", action="store_true", help="with --calibrate, re-pick images already calibrated")
+    parser.add_argument("--input", type=Path, default=REPO_ROOT / INPUT_DIR, help="screenshot folder")
+    parser.add_argument("--boxes", type=Path, default=Path(__file__).resolve().parent / OUT_FILE, help="template file")
+    args = parser.parse_args()
+
+    if args.calibrate or args.rebuild:
+        calibrate(args.input, args.boxes, redo=args.redo, interactive=args.calibrate)
+        return
+
     files = list_images(INPUT_DIR)
     if not files:
         raise SystemExit(f"No images found in '{INPUT_DIR}'. Put screenshots in that folder.")
@@ -52,35 +183,13 @@ def main():
     if SCALE != 1:
         img = cv2.resize(img0, None, fx=SCALE, fy=SCALE, interpolation=cv2.INTER_CUBIC)
 
-    scaled_h, scaled_w = img.shape[:2]
-
     cv2.namedWindow("image", cv2.WINDOW_NORMAL)
     cv2.resizeWindow("image", WINDOW_W, WINDOW_H)
 
     print("\nROI Picker (Saves ratios, works across phones)")
     print("For each field: drag a rectangle, press ENTER to accept. Press ESC to redo.\n")
 
-    boxes_ratios = {}
-
-    for field in FIELDS:
-        while True:
-            print(f"Select region for: {field}")
-            x, y, w, h = cv2.selectROI("image", img, showCrosshair=True, fromCenter=False)
-            x, y, w, h = int(x), int(y), int(w), int(h)
-
-            if w <= 0 or h <= 0:
-                print("Nothing selected. Try again.\n")
-                continue
-
-            # Convert from scaled pixels -> ratios (0..1) relative to scaled image
-            x1r = clamp01(x / scaled_w)
-            y1r = clamp01(y / scaled_h)
-            x2r = clamp01((x + w) / scaled_w)
-            y2r = clamp01((y + h) / scaled_h)
-
-            boxes_ratios[field] = [x1r, y1r, x2r, y2r]
-            print(f"Saved {field} ratios: {boxes_ratios[field]}\n")
-            break
+    boxes_ratios = pick_boxes(img, FIELDS)
 
     cv2.destroyAllWindows()
 
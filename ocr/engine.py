@@ -0,0 +1,904 @@
+"""Lazy OCR engine facade shared by the profile scanner and CLI helpers.
+
+EasyOCR drags in torch, OpenCV, and NumPy, which costs seconds and hundreds of MB
+of RSS at import time. Importing this module only checks that those packages are
+installed; the heavy modules load the first time a scan actually needs them.
+"""
+from __future__ import annotations
+
+import hashlib
+import importlib
+import io
+import logging
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib.util import find_spec
+from pathlib import Path
+
+from ocr.layouts import LayoutRegistry
+from utils import jsonio
+
+logger = logging.getLogger("MarciaOS.OCR")
+
+BOXES_PATH = Path(__file__).resolve().parent / "boxes_ratios.json"
+EASYOCR_LANGS = ["en"]
+EASYOCR_MIN_CONF = 0.45
+# Numeric readings (plain crop plus variants) that must agree before a vote overrides the plain crop.
+VOTE_MIN_AGREEMENT = 2
+EASYOCR_FIELDS = {
+    "name": "player_name",
+    "cp": "cp",
+    "kills": "kills",
+    "alliance": "alliance",
+    "server": "server",
+    "likes": "likes",
+    "vip": "vip_level",
+}
+NUMERIC_FIELDS = {"cp", "kills", "likes", "vip_level"}
+NUMERIC_TEMPLATE_FIELDS = {field for field, column in EASYOCR_FIELDS.items() if column in NUMERIC_FIELDS}
+VERIFY_FIELDS = {"account_btn", "settings_btn"}
+VERIFY_MIN_CONF = 0.25
+# A single button read this clearly, with the other one absent, rejects the upload before field OCR.
+VERIFY_REJECT_CONF = 0.5
+VERIFY_FIRST = os.getenv("OCR_VERIFY_FIRST", "1").lower() in {"1", "true", "yes"}
+PROFILE_METRIC_FIELDS = ("player_name", "cp", "kills", "likes", "vip_level", "alliance", "server")
+NUMBER_RE = re.compile(r"(?P<value>[\d.,]+)\s*(?P<suffix>[kmbKMB]?)")
+LABEL_HINTS = {
+    "cp": ("cp", "power", "battle power", "total power", "combat power"),
+    "kills": ("kills", "defeats", "defeated", "eliminations", "total kills"),
+    "likes": ("likes", "like", "likes received"),
+    "vip_level": ("vip", "vip level", "vip lvl", "vip lv"),
+    "alliance": ("alliance", "all", "guild"),
+    "server": ("server", "state", "world"),
+}
+
+# Per-field Tesseract settings: one text line per crop, digits only for counters.
+TESSERACT_LINE_CONFIG = "--psm 7"
+TESSERACT_DIGITS_CONFIG = "--psm 7 -c tessedit_char_whitelist=0123456789,."
+TESSERACT_FIELD_CONFIGS = {
+    "cp": TESSERACT_DIGITS_CONFIG,
+    "kills": TESSERACT_DIGITS_CONFIG,
+    "likes": TESSERACT_DIGITS_CONFIG,
+    "vip": TESSERACT_DIGITS_CONFIG,
+}
+TESSERACT_THREADS = int(os.getenv("OCR_TESSERACT_THREADS", "4"))
+
+# Template boxes hug one line of text, so crop height tracks glyph height. Every crop is
+# scaled to this height (EasyOCR's recognizer works at 64 px) instead of a fixed 2x.
+TARGET_CROP_HEIGHT = int(os.getenv("OCR_CROP_HEIGHT", "64"))
+CROP_SCALE_LIMITS = (0.25, 4.0)
+# Whole-image passes (full-text detection, Tesseract) run on a copy no larger than this short side.
+MAX_SHORT_SIDE = int(os.getenv("OCR_MAX_SHORT_SIDE", "1080"))
+
+# Extra renderings of numeric crops recognized in the same batch and voted on per field.
+NUMERIC_VARIANTS = ("otsu", "inverted", "sharpened")
+NUMERIC_VOTING = os.getenv("OCR_NUMERIC_VARIANTS", "1").lower() in {"1", "true", "yes"}
+
+# Torch threading per OCR process. 0 splits the cores evenly across concurrent scans.
+TORCH_THREADS = int(os.getenv("OCR_TORCH_THREADS", "0"))
+TORCH_INTEROP_THREADS = int(os.getenv("OCR_TORCH_INTEROP_THREADS", "1"))
+# EasyOCR's own dynamic int8 quantization of the CPU models (its default); OCR_QUANTIZE=0 keeps fp32.
+QUANTIZE = os.getenv("OCR_QUANTIZE", "1").lower() in {"1", "true", "yes"}
+
+_EASYOCR_MODULES = ("easyocr", "cv2", "numpy")
+_VISION_MODULES = ("cv2", "numpy")
+_TESSERACT_MODULES = ("PIL", "pytesseract")
+_loaded: dict[str, object] = {}
+_template_versions: dict[tuple[str, int], str] = {}
+_tesseract_pool: ThreadPoolExecutor | None = None
+
+
+def easyocr_installed() -> bool:
+    """Return True when EasyOCR and its vision stack can be imported."""
+    return all(find_spec(name) is not None for name in _EASYOCR_MODULES)
+
+
+def vision_installed() -> bool:
+    """Return True when OpenCV and NumPy can be imported."""
+    return all(find_spec(name) is not None for name in _VISION_MODULES)
+
+
+def tesseract_installed() -> bool:
+    """Return True when Pillow and pytesseract can be imported."""
+    return all(find_spec(name) is not None for name in _TESSERACT_MODULES)
+
+
+def _lazy_import(name: str):
+    module = _loaded.get(name)
+    if module is None:
+        started = time.perf_counter()
+        module = importlib.import_module(name)
+        _loaded[name] = module
+        logger.info("Imported %s in %.2fs", name, time.perf_counter() - started)
+    return module
+
+
+def vision_modules():
+    """Return ``(cv2, numpy)``, importing them on first use."""
+    return _lazy_import("cv2"), _lazy_import("numpy")
+
+
+def tesseract_modules():
+    """Return ``(pytesseract, PIL.Image)``, importing them on first use."""
+    return _lazy_import("pytesseract"), _lazy_import("PIL.Image")
+
+
+def default_torch_threads(concurrency: int) -> int:
+    """Intra-op threads per scan so ``concurrency`` scans never oversubscribe the cores."""
+    if TORCH_THREADS > 0:
+        return TORCH_THREADS
+    return max(1, (os.cpu_count() or 1) // max(1, concurrency))
+
+
+def configure_torch(threads: int | None, interop_threads: int | None) -> None:
+    """Apply torch thread counts for this process (inter-op only sticks before first use)."""
+    torch = _lazy_import("torch")
+    if threads:
+        torch.set_num_threads(threads)
+    if interop_threads:
+        try:
+            torch.set_num_interop_threads(interop_threads)
+        except RuntimeError:
+            # Already fixed by an earlier parallel op in this process.
+            logger.debug("torch inter-op threads already set; keeping %d", torch.get_num_interop_threads())
+
+
+def load_template_data(path: Path = BOXES_PATH) -> dict:
+    with Path(path).open("r", encoding="utf-8") as fp:
+        return jsonio.load(fp)
+
+
+def load_template_boxes(path: Path = BOXES_PATH) -> dict[str, list[float]]:
+    return load_template_data(path).get("template_ratios") or {}
+
+
+def load_layouts(path: Path = BOXES_PATH) -> LayoutRegistry:
+    return LayoutRegistry.from_template_data(load_template_data(path))
+
+
+def template_version(path: Path = BOXES_PATH) -> str:
+    """Short content hash of the template file; it changes whenever boxes are re-picked."""
+    path = Path(path)
+    try:
+        mtime = path.stat().st_mtime_ns
+    except OSError:
+        return "missing"
+    key = (str(path), mtime)
+    version = _template_versions.get(key)
+    if version is None:
+        version = hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+        _template_versions[key] = version
+    return version
+
+
+def ratio_to_pixels(w: int, h: int, box) -> tuple[int, int, int, int] | None:
+    """Pixel ``(x1, y1, x2, y2)`` for a ratio box on a ``w`` × ``h`` image, or None when empty."""
+    x1 = int(w * box[0])
+    y1 = int(h * box[1])
+    x2 = int(w * box[2])
+    y2 = int(h * box[3])
+
+    x1 = max(0, min(x1, w - 1))
+    x2 = max(1, min(x2, w))
+    y1 = max(0, min(y1, h - 1))
+    y2 = max(1, min(y2, h))
+
+    if x2 <= x1 or y2 <= y1:
+        return None
+    return x1, y1, x2, y2
+
+
+def crop_by_ratio(img, box):
+    """Crop ``img`` with a ``[x1, y1, x2, y2]`` ratio box, or return None when empty."""
+    h, w = img.shape[:2]
+    pixels = ratio_to_pixels(w, h, box)
+    if pixels is None:
+        return None
+    x1, y1, x2, y2 = pixels
+    return img[y1:y2, x1:x2]
+
+
+def crop_scale(crop_height: int, target: int = TARGET_CROP_HEIGHT) -> float:
+    """Resize factor that brings a ``crop_height`` px crop to ``target`` px, within ``CROP_SCALE_LIMITS``."""
+    low, high = CROP_SCALE_LIMITS
+    return min(high, max(low, target / max(1, crop_height)))
+
+
+def preprocess_crop(crop, scale: float = 2.0):
+    cv2, _ = vision_modules()
+    gray = crop if crop.ndim == 2 else cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
+    if abs(scale - 1) > 0.05:
+        # Area averaging keeps strokes solid when shrinking; cubic keeps edges when enlarging.
+        interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_CUBIC
+        gray = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=interpolation)
+    gray = cv2.GaussianBlur(gray, (3, 3), 0)
+    return gray
+
+
+def crop_variants(proc) -> dict[str, object]:
+    """Binarized, inverted, and sharpened copies of a preprocessed grey crop."""
+    cv2, np = vision_modules()
+    _, otsu = cv2.threshold(proc, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    kernel = np.array([[0, -1, 0], [-1, 5, -1], [0, -1, 0]], dtype=np.float32)
+    return {
+        "otsu": otsu,
+        "inverted": cv2.bitwise_not(proc),
+        "sharpened": cv2.filter2D(proc, -1, kernel),
+    }
+
+
+def vote_numeric(detections: dict[str, tuple[str, float]]) -> tuple[dict[str, tuple[str, float]], int]:
+    """Fold ``field#variant`` readings into one reading per numeric field.
+
+    Readings are grouped by their digits and the group read by the most crops
+    wins, ties going to the higher single confidence. The variants are copies of
+    one crop, so their errors are correlated: confidences are never added, and
+    the winner reports the best confidence inside its group. A winner that
+    disagrees with the plain crop's reading, or that lifts it over
+    ``EASYOCR_MIN_CONF``, replaces it only when at least ``VOTE_MIN_AGREEMENT``
+    readings agree. Returns the merged detections and how many fields a variant changed.
+    """
+    merged = {field: hit for field, hit in detections.items() if "#" not in field}
+    candidates: dict[str, list[tuple[str, float]]] = {}
+    for key, (text, conf) in detections.items():
+        field = key.partition("#")[0]
+        if field in NUMERIC_TEMPLATE_FIELDS:
+            candidates.setdefault(field, []).append((text, conf))
+
+    overridden = 0
+    for field, readings in candidates.items():
+        groups: dict[str, list[tuple[str, float]]] = {}
+        for text, conf in readings:
+            digits = re.sub(r"[^\d]", "", text)
+            if digits:
+                groups.setdefault(digits, []).append((text, conf))
+        if not groups:
+            continue
+        digits, winner = max(groups.items(), key=lambda item: (len(item[1]), max(conf for _, conf in item[1])))
+        voted = max(winner, key=lambda reading: reading[1])
+        base = merged.get(field)
+        base_digits = re.sub(r"[^\d]", "", base[0]) if base else ""
+        if base_digits and len(winner) < VOTE_MIN_AGREEMENT:
+            # A lone reading never outvotes the plain crop.
+            continue
+        rescued = base is not None and base[1] < EASYOCR_MIN_CONF <= voted[1]
+        if base_digits != digits or rescued:
+            overridden += 1
+        merged[field] = voted
+    return merged, overridden
+
+
+def interpret_fields(detections: dict[str, tuple[str, float]]) -> dict:
+    """Map best ``(text, confidence)`` pairs per template field to snapshot columns."""
+    results: dict[str, str | int | bool | None] = {}
+    verification_hits: set[str] = set()
+
+    for field, (text, conf) in detections.items():
+        if field in VERIFY_FIELDS:
+            if conf >= VERIFY_MIN_CONF:
+                verification_hits.add(field)
+            continue
+
+        if conf < EASYOCR_MIN_CONF:
+            continue
+
+        mapped = EASYOCR_FIELDS.get(field)
+        if not mapped:
+            continue
+
+        if mapped in NUMERIC_FIELDS:
+            cleaned = re.sub(r"[^\d]", "", text)
+            if cleaned:
+                results[mapped] = int(cleaned)
+        else:
+            results[mapped] = text
+
+    if verification_hits:
+        results["ownership_verified"] = len(verification_hits) == len(VERIFY_FIELDS)
+    else:
+        results["ownership_verified"] = None
+    return results
+
+
+def interpret_tesseract_fields(detections: dict[str, tuple[str, float]]) -> dict:
+    """:func:`interpret_fields` for Tesseract ROI reads, which only judge ownership on both buttons.
+
+    Tesseract often drops one of the small button crops, and one noisy read would
+    otherwise turn into ``ownership_verified=False`` and reject the upload. The
+    whole-image Tesseract pass never gave a verdict, so without both reads this
+    path gives none either.
+    """
+    parsed = interpret_fields(detections)
+    if not VERIFY_FIELDS <= detections.keys():
+        parsed["ownership_verified"] = None
+    return parsed
+
+
+def confident_ownership_failure(detections: dict[str, tuple[str, float]]) -> bool:
+    """True when one self-view button reads clearly and the other is missing.
+
+    That is the same ``ownership_verified=False`` verdict :func:`interpret_fields`
+    would reach after a full scan, with a margin so borderline reads still get
+    full extraction.
+    """
+    hits = [detections[field][1] for field in VERIFY_FIELDS if field in detections]
+    strong = [conf for conf in hits if conf >= VERIFY_REJECT_CONF]
+    weak = [conf for conf in hits if conf >= VERIFY_MIN_CONF]
+    return len(strong) == 1 and len(weak) == 1
+
+
+def dhash(image: "ScanImage", size: int = 8) -> int | None:
+    """64-bit difference hash of the whole card; re-encodes and small crops stay within a few bits."""
+    gray = image.gray
+    if gray is None:
+        return None
+    cv2, _ = vision_modules()
+    small = cv2.resize(gray, (size + 1, size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    value = 0
+    for bit in bits:
+        value = (value << 1) | int(bit)
+    return value
+
+
+ROI_SIGNATURE_SIZE = (96, 16)
+
+
+def roi_signature(crop):
+    """Fixed-size grey thumbnail of one field crop, compared with :func:`roi_distance`."""
+    cv2, _ = vision_modules()
+    return cv2.resize(crop, ROI_SIGNATURE_SIZE, interpolation=cv2.INTER_AREA)
+
+
+def roi_distance(a, b, window: int = 4) -> float:
+    """Largest local difference between two :func:`roi_signature` thumbnails.
+
+    Both are contrast-normalized, then the per-column mean absolute difference is
+    smoothed over about half a digit's width. One changed digit leaves a band
+    around 0.5 or higher. Re-encodes and moderate rescales stay near 0.3 or below
+    because their noise is spread across the whole crop rather than concentrated.
+    """
+    _, np = vision_modules()
+    left = a.astype(np.float32)
+    right = b.astype(np.float32)
+    left = (left - left.mean()) / (left.std() + 1e-6)
+    right = (right - right.mean()) / (right.std() + 1e-6)
+    columns = np.abs(left - right).mean(axis=0)
+    return float(np.convolve(columns, np.ones(window) / window, mode="valid").max())
+
+
+def extract_number(chunk: str) -> int | None:
+    match = NUMBER_RE.search(chunk)
+    if not match:
+        return None
+
+    raw = match.group("value").replace(",", "")
+    try:
+        value = float(raw)
+    except ValueError:
+        return None
+
+    suffix = match.group("suffix").lower()
+    if suffix == "k":
+        value *= 1_000
+    elif suffix == "m":
+        value *= 1_000_000
+    elif suffix == "b":
+        value *= 1_000_000_000
+
+    return int(value)
+
+
+def parse_profile_text(text: str) -> dict:
+    """Pull the most likely field values out of free-form OCR text (full-image passes)."""
+
+    lines = [ln.strip() for ln in text.splitlines() if ln.strip()]
+    results: dict[str, str | int | None] = {}
+
+    if lines:
+        results["player_name"] = lines[0]
+
+    for line in lines:
+        lowered = line.lower()
+        for field, hints in LABEL_HINTS.items():
+            if field in results and results[field] is not None:
+                continue
+            if any(hint in lowered for hint in hints):
+                if field in {"alliance", "server"}:
+                    value = line.split(":", 1)[-1].strip() if ":" in line else line
+                    results[field] = value
+                else:
+                    results[field] = extract_number(line)
+    return results
+
+
+def _tesseract_executor() -> ThreadPoolExecutor:
+    # Each pytesseract call runs the tesseract binary in a subprocess, so threads overlap fully.
+    global _tesseract_pool
+    if _tesseract_pool is None:
+        _tesseract_pool = ThreadPoolExecutor(max_workers=max(1, TESSERACT_THREADS), thread_name_prefix="tesseract")
+    return _tesseract_pool
+
+
+def has_profile_metrics(parsed: dict) -> bool:
+    return any(parsed.get(field) for field in PROFILE_METRIC_FIELDS)
+
+
+class ScanImage:
+    """One upload, decoded once and shared by every OCR stage of a scan.
+
+    The BGR array, its grayscale copy, and any resized variants are built on
+    first use and cached, so the template, full-text, and Tesseract passes
+    never re-read or re-decode the file. Template crops are views into
+    ``gray`` rather than copies.
+    """
+
+    def __init__(self, data: bytes):
+        self.data = data
+        self._bgr = None
+        self._decoded = False
+        self._variants: dict[object, object] = {}
+
+    @property
+    def bgr(self):
+        """Decoded colour array, or None when the bytes are not an image."""
+        if not self._decoded:
+            cv2, np = vision_modules()
+            self._bgr = cv2.imdecode(np.frombuffer(self.data, dtype=np.uint8), cv2.IMREAD_COLOR)
+            self._decoded = True
+        return self._bgr
+
+    @property
+    def gray(self):
+        if "gray" not in self._variants:
+            cv2, _ = vision_modules()
+            bgr = self.bgr
+            self._variants["gray"] = None if bgr is None else cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+        return self._variants["gray"]
+
+    def resized(self, scale: float):
+        """Grayscale copy scaled by ``scale`` (cached per scale)."""
+        key = ("gray", round(scale, 4))
+        if key not in self._variants:
+            cv2, _ = vision_modules()
+            gray = self.gray
+            interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_CUBIC
+            self._variants[key] = (
+                None if gray is None else cv2.resize(gray, None, fx=scale, fy=scale, interpolation=interpolation)
+            )
+        return self._variants[key]
+
+    def bounded(self, max_short_side: int = MAX_SHORT_SIDE, *, gray: bool = False):
+        """Colour (or grey) array shrunk so its short side is at most ``max_short_side``."""
+        base = self.gray if gray else self.bgr
+        if base is None:
+            return None
+        scale = max_short_side / min(base.shape[:2])
+        if scale >= 1:
+            return base
+        if gray:
+            return self.resized(scale)
+        key = ("bgr", round(scale, 4))
+        if key not in self._variants:
+            cv2, _ = vision_modules()
+            self._variants[key] = cv2.resize(base, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        return self._variants[key]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the decoded array and every cached variant."""
+        arrays = [self._bgr, *self._variants.values()]
+        return sum(arr.nbytes for arr in arrays if arr is not None)
+
+
+class OcrEngine:
+    """Owns the EasyOCR reader and template boxes; every method here is blocking."""
+
+    def __init__(
+        self,
+        boxes_path: Path = BOXES_PATH,
+        *,
+        langs: list[str] | None = None,
+        gpu: bool = False,
+        crop_height: int | None = TARGET_CROP_HEIGHT,
+        torch_threads: int | None = None,
+        interop_threads: int | None = TORCH_INTEROP_THREADS,
+        quantize: bool = QUANTIZE,
+        numeric_variants: bool = NUMERIC_VOTING,
+    ):
+        self.boxes_path = Path(boxes_path)
+        self.langs = langs or EASYOCR_LANGS
+        self.gpu = gpu
+        self.torch_threads = torch_threads
+        self.interop_threads = interop_threads
+        self.quantize = quantize
+        self.numeric_variants = numeric_variants
+        self.reader = None
+        self.boxes: dict[str, list[float]] | None = None
+        self.layouts: LayoutRegistry | None = None
+        # None keeps the old fixed 2x crop upscale (benchmark comparisons).
+        self.crop_height = crop_height
+        # (layout, width, height, crop height) -> {field: (pixel box, scale)}; screenshots repeat a few sizes.
+        self._crop_plans: dict[tuple, dict[str, tuple[tuple[int, int, int, int], float]]] = {}
+        self.ready: bool | None = None
+        self.failure_reason: str | None = None
+        self.load_seconds: float | None = None
+        self.tesseract_missing = False
+        self.warm = False
+        self.warmup_seconds: float | None = None
+
+    def load_templates(self) -> bool:
+        """Read the layout registry (cheap; no OCR imports). Returns True when boxes exist."""
+        if self.layouts is None and self.boxes_path.exists():
+            self.layouts = load_layouts(self.boxes_path)
+            self.boxes = self.layouts.default
+        return bool(self.boxes)
+
+    def load(self) -> bool:
+        """Import EasyOCR, read templates, and build the reader once."""
+        if self.ready is not None:
+            return self.ready
+
+        if not easyocr_installed():
+            self.ready = False
+            self.failure_reason = (
+                "EasyOCR unavailable. Install OCR extras with `pip install -r requirements.txt`."
+            )
+            logger.warning(self.failure_reason)
+            return False
+
+        if not self.boxes_path.exists():
+            self.ready = False
+            self.failure_reason = f"OCR bounding boxes not found at {self.boxes_path}."
+            logger.warning(self.failure_reason)
+            return False
+
+        started = time.perf_counter()
+        easyocr = _lazy_import("easyocr")
+        vision_modules()
+        self.load_templates()
+        configure_torch(self.torch_threads, self.interop_threads)
+        self.reader = easyocr.Reader(self.langs, gpu=self.gpu, quantize=self.quantize)
+        self.load_seconds = time.perf_counter() - started
+
+        self.ready = bool(self.boxes)
+        self.failure_reason = None if self.ready else "OCR templates are empty."
+        if self.ready:
+            torch = _lazy_import("torch")
+            logger.info(
+                "EasyOCR reader loaded in %.2fs (torch threads %d/%d, %s)",
+                self.load_seconds,
+                torch.get_num_threads(),
+                torch.get_num_interop_threads(),
+                "int8" if self.quantize and not self.gpu else "fp32",
+            )
+        else:
+            logger.warning(self.failure_reason)
+        return self.ready
+
+    def warm_up(self) -> bool:
+        """Load the reader and run one detector + recognizer pass on a tiny synthetic card.
+
+        Torch's first inference pays for kernel selection and allocator growth;
+        doing it here keeps that off the first real user's scan.
+        """
+        if not self.load():
+            return False
+        if self.warm:
+            return True
+
+        cv2, np = vision_modules()
+        started = time.perf_counter()
+        width, height = 240, 520
+        card = np.full((height, width, 3), 255, dtype=np.uint8)
+        for ratios in (self.boxes or {}).values():
+            x = int(ratios[0] * width)
+            y = int(ratios[3] * height) - 3
+            cv2.putText(card, "12,345", (x, y), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (0, 0, 0), 1, cv2.LINE_AA)
+
+        image = ScanImage(cv2.imencode(".png", card)[1].tobytes())
+        self.scan_template(image)
+        self.scan_full_text(image)
+        self.warmup_seconds = time.perf_counter() - started
+        self.warm = True
+        logger.info("EasyOCR warm-up inference finished in %.2fs", self.warmup_seconds)
+        return True
+
+    def scan_template(
+        self,
+        image: ScanImage,
+        *,
+        batched: bool = True,
+        verify_first: bool = False,
+        variants: bool | None = None,
+    ) -> dict | None:
+        """OCR each template box and return ``{"parsed": {...}, "raw": str, "layout": str}``.
+
+        Boxes come from the layout registered for the image's aspect and
+        resolution bucket, or the median ``template_ratios`` when none matches.
+
+        ``batched`` recognizes every field crop in one ``Reader.recognize`` call and
+        skips CRAFT text detection; ``batched=False`` keeps the older per-field
+        ``readtext`` loop for comparisons.
+
+        ``verify_first`` reads the self-view buttons on their own first. On a
+        confident ownership failure the remaining crops are skipped and the result
+        carries ``rejected_early=True`` and ``skipped_crops``.
+
+        ``variants`` (default ``self.numeric_variants``) adds the
+        :func:`crop_variants` of every numeric crop to the batched call and
+        settles each numeric field with :func:`vote_numeric`; the result then
+        carries ``variant_overrides``.
+        """
+        if not self.load() or not self.reader or not self.boxes:
+            return None
+
+        prepared = self.template_crops(image)
+        if prepared is None:
+            return None
+
+        layout, crops = prepared
+        recognize = self._recognize_batch if batched else self._readtext_per_field
+        detections: dict[str, tuple[str, float]] = {}
+        if verify_first and VERIFY_FIELDS <= crops.keys():
+            detections = recognize({field: crops.pop(field) for field in VERIFY_FIELDS})
+            if confident_ownership_failure(detections):
+                raw_lines = [f"{field}: {text} ({conf:.2f})" for field, (text, conf) in detections.items()]
+                return {
+                    "parsed": interpret_fields(detections),
+                    "raw": "\n".join(raw_lines),
+                    "layout": layout,
+                    "rejected_early": True,
+                    "skipped_crops": len(crops),
+                }
+
+        use_variants = batched and (self.numeric_variants if variants is None else variants)
+        if use_variants:
+            for field in NUMERIC_TEMPLATE_FIELDS & crops.keys():
+                for name, variant in crop_variants(crops[field]).items():
+                    crops[f"{field}#{name}"] = variant
+
+        detections.update(recognize(crops))
+        overrides = 0
+        if use_variants:
+            detections, overrides = vote_numeric(detections)
+        raw_lines = [f"{field}: {text} ({conf:.2f})" for field, (text, conf) in detections.items()]
+        result = {"parsed": interpret_fields(detections), "raw": "\n".join(raw_lines), "layout": layout}
+        if use_variants:
+            result["variant_overrides"] = overrides
+        return result
+
+    def crop_plan(self, width: int, height: int) -> tuple[str, dict[str, tuple[tuple[int, int, int, int], float]]]:
+        """Layout name plus pixel box and resize factor per field, cached per layout and size."""
+        layout, boxes = self.layouts.select(width, height)
+        key = (layout, width, height, self.crop_height)
+        plan = self._crop_plans.get(key)
+        if plan is None:
+            plan = {}
+            for field, ratios in boxes.items():
+                pixels = ratio_to_pixels(width, height, ratios)
+                if pixels is not None:
+                    scale = crop_scale(pixels[3] - pixels[1], self.crop_height) if self.crop_height else 2.0
+                    plan[field] = (pixels, scale)
+            if len(self._crop_plans) >= 256:
+                self._crop_plans.clear()
+            self._crop_plans[key] = plan
+        return layout, plan
+
+    def template_crops(self, image: ScanImage) -> tuple[str, dict] | None:
+        """``(layout, {field: preprocessed crop})`` normalized to ``TARGET_CROP_HEIGHT``."""
+        gray = image.gray
+        if gray is None or self.layouts is None:
+            return None
+
+        height, width = gray.shape[:2]
+        layout, plan = self.crop_plan(width, height)
+        crops = {
+            field: preprocess_crop(gray[y1:y2, x1:x2], scale)
+            for field, ((x1, y1, x2, y2), scale) in plan.items()
+        }
+        return layout, crops
+
+    def near_duplicate_key(self, image: ScanImage) -> tuple[int, tuple] | None:
+        """Whole-card :func:`dhash` plus a :func:`roi_signature` per numeric template box.
+
+        The card hash alone cannot see a changed CP or kill count, so near-duplicate
+        matches also compare every numeric crop. None without templates.
+        """
+        gray = image.gray
+        if gray is None or not self.load_templates():
+            return None
+
+        height, width = gray.shape[:2]
+        _, plan = self.crop_plan(width, height)
+        fields = sorted(NUMERIC_TEMPLATE_FIELDS & plan.keys())
+        if not fields:
+            return None
+        rois = tuple(
+            roi_signature(gray[y1:y2, x1:x2]) for (x1, y1, x2, y2), _ in (plan[field] for field in fields)
+        )
+        return dhash(image), rois
+
+    def _readtext_per_field(self, crops: dict) -> dict[str, tuple[str, float]]:
+        detections: dict[str, tuple[str, float]] = {}
+        for field, proc in crops.items():
+            found = self.reader.readtext(proc)
+            if not found:
+                continue
+
+            found.sort(key=lambda item: item[2], reverse=True)
+            detections[field] = (found[0][1].strip(), float(found[0][2]))
+        return detections
+
+    def _recognize_batch(self, crops: dict) -> dict[str, tuple[str, float]]:
+        """Stack the grey crops on one canvas and recognize them as known text boxes."""
+        if not crops:
+            return {}
+
+        _, np = vision_modules()
+        gap = 8
+        width = max(proc.shape[1] for proc in crops.values())
+        height = sum(proc.shape[0] for proc in crops.values()) + gap * (len(crops) - 1)
+        canvas = np.full((height, width), 255, dtype=np.uint8)
+
+        # EasyOCR may reorder boxes (it sorts by top edge), so map results back by y offset.
+        horizontal_list: list[list[int]] = []
+        field_by_top: dict[int, str] = {}
+        y = 0
+        for field, proc in crops.items():
+            h, w = proc.shape[:2]
+            canvas[y : y + h, :w] = proc
+            horizontal_list.append([0, w, y, y + h])
+            field_by_top[y] = field
+            y += h + gap
+
+        found = self.reader.recognize(
+            canvas,
+            horizontal_list=horizontal_list,
+            free_list=[],
+            batch_size=len(horizontal_list),
+            detail=1,
+        )
+
+        detections: dict[str, tuple[str, float]] = {}
+        for box, text, conf in found:
+            field = field_by_top.get(int(box[0][1]))
+            text = text.strip()
+            if field is None or not text:
+                continue
+            if field not in detections or conf > detections[field][1]:
+                detections[field] = (text, float(conf))
+        return detections
+
+    def scan_full_text(self, image: ScanImage) -> str:
+        """Run detection + recognition over the whole screenshot."""
+        if not self.load() or not self.reader:
+            return ""
+
+        if image.bgr is None:
+            return ""
+
+        # Detection cost grows with pixel count; 1440p captures are shrunk first.
+        found = self.reader.readtext(image.bounded())
+        if not found:
+            return ""
+        return "\n".join(item[1].strip() for item in found if item[1].strip())
+
+    def scan_easyocr(self, image: ScanImage) -> dict | None:
+        """Template pass plus a full-text pass when the template found no profile metrics.
+
+        Someone else's profile (see ``VERIFY_FIRST``) stops after the button crops.
+        """
+        result = self.scan_template(image, verify_first=VERIFY_FIRST)
+        if result is None:
+            return None
+        result["full_text_used"] = not result.get("rejected_early") and not has_profile_metrics(result["parsed"])
+        result["full_text"] = self.scan_full_text(image) if result["full_text_used"] else ""
+        return result
+
+    def scan_tesseract_fields(self, image: ScanImage) -> dict | None:
+        """Tesseract over the template crops with per-field PSM/whitelists, crops in parallel.
+
+        Returns the same ``{"parsed", "raw", "layout"}`` shape as :meth:`scan_template`,
+        or None when Tesseract, OpenCV, or the templates are unavailable.
+        """
+        if not (tesseract_installed() and vision_installed()) or self.tesseract_missing:
+            return None
+        if not self.load_templates():
+            return None
+        prepared = self.template_crops(image)
+        if prepared is None:
+            return None
+
+        pytesseract, _ = tesseract_modules()
+        layout, crops = prepared
+
+        def _read(field: str, proc) -> tuple[str, float] | None:
+            data = pytesseract.image_to_data(
+                proc,
+                config=TESSERACT_FIELD_CONFIGS.get(field, TESSERACT_LINE_CONFIG),
+                output_type=pytesseract.Output.DICT,
+            )
+            words = [
+                (text.strip(), float(conf))
+                for text, conf in zip(data["text"], data["conf"])
+                if text.strip() and float(conf) >= 0
+            ]
+            if not words:
+                return None
+            # Tesseract reports 0-100 per word; average to match EasyOCR's 0-1 scale.
+            return " ".join(text for text, _ in words), sum(conf for _, conf in words) / len(words) / 100
+
+        try:
+            futures = {field: _tesseract_executor().submit(_read, field, proc) for field, proc in crops.items()}
+            found = {field: future.result() for field, future in futures.items()}
+        except Exception as exc:
+            if isinstance(exc, getattr(pytesseract, "TesseractNotFoundError", ())):
+                self.tesseract_missing = True
+                logger.warning("Tesseract binary missing; skipping pytesseract fallback")
+                return None
+            raise
+
+        detections = {field: hit for field, hit in found.items() if hit}
+        raw_lines = [f"{field}: {text} ({conf:.2f})" for field, (text, conf) in detections.items()]
+        return {"parsed": interpret_tesseract_fields(detections), "raw": "\n".join(raw_lines), "layout": layout}
+
+    def scan_tesseract(self, image: ScanImage) -> str:
+        """Whole-image pytesseract pass; returns "" when Tesseract is unavailable."""
+        if not tesseract_installed():
+            return ""
+
+        pytesseract, Image = tesseract_modules()
+        try:
+            if vision_installed():
+                gray = image.bounded(gray=True)
+                if gray is None:
+                    return ""
+                return pytesseract.image_to_string(gray)
+            with Image.open(io.BytesIO(image.data)) as img:
+                return pytesseract.image_to_string(img)
+        except Exception as exc:
+            # Gracefully handle missing tesseract binaries instead of crashing the task
+            if hasattr(pytesseract, "TesseractNotFoundError") and isinstance(
+                exc, pytesseract.TesseractNotFoundError
+            ):
+                self.tesseract_missing = True
+                logger.warning("Tesseract binary missing; skipping pytesseract fallback")
+                return ""
+            raise
+
+
+__all__ = [
+    "BOXES_PATH",
+    "EASYOCR_FIELDS",
+    "OcrEngine",
+    "ScanImage",
+    "TESSERACT_FIELD_CONFIGS",
+    "VERIFY_FIELDS",
+    "confident_ownership_failure",
+    "crop_by_ratio",
+    "configure_torch",
+    "crop_scale",
+    "crop_variants",
+    "default_torch_threads",
+    "dhash",
+    "roi_distance",
+    "roi_signature",
+    "easyocr_installed",
+    "has_profile_metrics",
+    "interpret_fields",
+    "interpret_tesseract_fields",
+    "load_layouts",
+    "load_template_boxes",
+    "load_template_data",
+    "parse_profile_text",
+    "preprocess_crop",
+    "ratio_to_pixels",
+    "template_version",
+    "tesseract_installed",
+    "vision_installed",
+    "vision_modules",
+    "vote_numeric",
+]
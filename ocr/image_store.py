@@ -0,0 +1,135 @@
+"""Content-addressed store for uploaded profile screenshots.
+
+Files are named by their SHA-256, so the same screenshot posted twice (or in
+two guilds) is written once. Ownership and recency live in SQLite
+(``profile_image_refs`` / ``profile_image_blobs``): trimming a user's history
+and enforcing the global byte budget are indexed queries, never directory scans.
+Blobs are only deleted once no uploader references them.
+
+Screenshots saved before the store existed (``shots/profiles/<guild>/<user>_<timestamp>.png``)
+are moved in by :meth:`ProfileImageStore.migrate_legacy`, oldest first, so they
+count against the same history and byte budget.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import logging
+import os
+from pathlib import Path
+
+from database import get_profile_image_blob, record_profile_image, relink_profile_image
+
+logger = logging.getLogger("MarciaOS.ImageStore")
+
+STORE_ROOT = Path(__file__).resolve().parent.parent / "shots" / "profiles" / "blobs"
+# Pre-store layout: one directory per guild id holding ``<user_id>_<timestamp><ext>`` files.
+LEGACY_ROOT = STORE_ROOT.parent
+
+
+class ProfileImageStore:
+    """Hash-named screenshot files with per-user history and an LRU byte budget."""
+
+    def __init__(self, root: Path = STORE_ROOT, *, history: int = 5, max_bytes: int | None = None):
+        self.root = Path(root)
+        self.history = max(1, history)
+        self.max_bytes = max_bytes
+        self.evicted = 0
+
+    def path_for(self, sha256: str, suffix: str) -> Path:
+        # Two-character fan-out keeps any one directory small.
+        return self.root / sha256[:2] / f"{sha256}{suffix}"
+
+    async def put(self, guild_id: int, user_id: int, image_bytes: bytes, suffix: str = ".png") -> Path | None:
+        """Store ``image_bytes`` for this uploader and return the file path (None on failure)."""
+        sha256 = hashlib.sha256(image_bytes).hexdigest()
+        existing = await get_profile_image_blob(sha256)
+        path = Path(existing["path"]) if existing else self.path_for(sha256, suffix.lower() or ".png")
+        try:
+            await asyncio.to_thread(self._write_once, path, image_bytes)
+        except OSError:
+            logger.exception("Failed to persist profile image to %s", path)
+            return None
+
+        evicted = await record_profile_image(
+            guild_id,
+            user_id,
+            sha256,
+            str(path),
+            len(image_bytes),
+            history=self.history,
+            max_bytes=self.max_bytes,
+        )
+        if evicted:
+            self.evicted += len(evicted)
+            await asyncio.to_thread(self._unlink_all, evicted)
+        return path
+
+    async def migrate_legacy(self, legacy_root: Path = LEGACY_ROOT) -> int:
+        """Move pre-store screenshots into the store and repoint snapshots at them.
+
+        Each legacy file is deleted once its blob is indexed, so the migration runs
+        once; later calls find nothing to do. Returns how many files were moved.
+        """
+        moved = 0
+        for guild_id, user_id, legacy in await asyncio.to_thread(self._legacy_files, Path(legacy_root)):
+            try:
+                image_bytes = await asyncio.to_thread(legacy.read_bytes)
+            except OSError:
+                logger.warning("Could not read legacy profile image %s", legacy)
+                continue
+            stored = await self.put(guild_id, user_id, image_bytes, legacy.suffix)
+            if stored is None:
+                continue
+            await relink_profile_image(str(legacy), str(stored))
+            await asyncio.to_thread(self._unlink_all, [str(legacy)])
+            moved += 1
+        if moved:
+            await asyncio.to_thread(self._remove_empty_dirs, Path(legacy_root))
+        return moved
+
+    @staticmethod
+    def _legacy_files(legacy_root: Path) -> list[tuple[int, int, Path]]:
+        if not legacy_root.is_dir():
+            return []
+        found = []
+        for guild_dir in legacy_root.iterdir():
+            if not guild_dir.is_dir() or not guild_dir.name.isdigit():
+                continue
+            for path in guild_dir.iterdir():
+                user_part = path.name.split("_", 1)[0]
+                if path.is_file() and user_part.isdigit() and not path.name.endswith(".tmp"):
+                    found.append((int(guild_dir.name), int(user_part), path))
+        # Timestamps sort lexically, so each user's newest upload is recorded last and survives the history trim.
+        found.sort(key=lambda item: item[2].name)
+        return found
+
+    @staticmethod
+    def _remove_empty_dirs(legacy_root: Path) -> None:
+        for guild_dir in legacy_root.iterdir():
+            if guild_dir.is_dir() and guild_dir.name.isdigit():
+                try:
+                    guild_dir.rmdir()
+                except OSError:
+                    pass  # Still holds files we could not read; leave it.
+
+    @staticmethod
+    def _write_once(path: Path, image_bytes: bytes) -> None:
+        if path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename so a crash never leaves a truncated file under a valid hash.
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_bytes(image_bytes)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _unlink_all(paths: list[str]) -> None:
+        for raw in paths:
+            try:
+                Path(raw).unlink(missing_ok=True)
+            except OSError:  # pragma: no cover - best-effort cleanup
+                logger.debug("Could not remove evicted profile image %s", raw)
+
+
+__all__ = ["LEGACY_ROOT", "ProfileImageStore", "STORE_ROOT"]
@@ -0,0 +1,235 @@
+"""Bounded, prioritized queue for profile scan jobs.
+
+Interactive ``/scan_profile`` requests outrank channel intake, which outranks
+background rescans. Each user keeps at most one slot (a newer upload replaces
+the older one), and a full queue is reported to the caller instead of piling up
+tasks that hold image bytes. Callers :meth:`OcrJobQueue.reserve` a slot before
+downloading anything, so a rejected upload costs no memory; the slot becomes a
+job on :meth:`OcrJobQueue.submit` or is released when a cache hit answers it.
+Jobs are zero-argument coroutine factories, so OCR only starts once a worker
+picks the job up, and the workers are the only cap on concurrent OCR.
+"""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Hashable
+
+logger = logging.getLogger("MarciaOS.OCRQueue")
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_INTAKE = 1
+# Rescans: never rejected (callers bound their own window) and never count against intake room.
+PRIORITY_BACKGROUND = 2
+
+
+class OcrQueueFull(Exception):
+    """Raised by :meth:`OcrJobQueue.submit` when no slot is free for that priority."""
+
+
+class OcrJobSuperseded(Exception):
+    """Set on a pending job's future when a newer upload from the same user replaces it."""
+
+
+@dataclass
+class QueueSlot:
+    """Room held for one user's upload between :meth:`OcrJobQueue.reserve` and ``submit``."""
+
+    key: Hashable
+    priority: int
+    superseded: bool = False
+
+
+@dataclass
+class _Job:
+    key: Hashable
+    priority: int
+    factory: Callable[[], Awaitable[Any]]
+    future: asyncio.Future
+    enqueued_at: float = field(default_factory=time.perf_counter)
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class OcrJobQueue:
+    """Priority queue drained by a fixed number of worker tasks."""
+
+    def __init__(
+        self,
+        *,
+        workers: int = 2,
+        max_pending: int = 50,
+        interactive_reserve: int = 5,
+        sample_size: int = 500,
+    ):
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        # Slots intake cannot use, so /scan_profile still gets in during a flood.
+        self.interactive_reserve = min(interactive_reserve, self.max_pending - 1)
+        self._queue: asyncio.PriorityQueue = asyncio.PriorityQueue()
+        self._pending: dict[Hashable, _Job] = {}
+        self._reserved: dict[Hashable, QueueSlot] = {}
+        self._seq = itertools.count()
+        self._tasks: list[asyncio.Task] = []
+        self._active = 0
+        self.counters: Counter[str] = Counter()
+        self.wait_times: deque[float] = deque(maxlen=sample_size)
+        self.service_times: deque[float] = deque(maxlen=sample_size)
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"ocr-queue-worker-{index}")
+            for index in range(self.workers)
+        ]
+
+    def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        for job in self._pending.values():
+            if not job.future.done():
+                job.future.cancel()
+        self._pending.clear()
+        self._reserved.clear()
+
+    @property
+    def depth(self) -> int:
+        return len(self._pending)
+
+    def _held_keys(self) -> set[Hashable]:
+        # Users holding room: reserved slots plus queued uploads (background jobs have their own window).
+        return self._reserved.keys() | {
+            key for key, job in self._pending.items() if job.priority < PRIORITY_BACKGROUND
+        }
+
+    def _admit(self, key: Hashable, priority: int) -> None:
+        if priority >= PRIORITY_BACKGROUND or key in self._held_keys():
+            return
+        limit = self.max_pending if priority == PRIORITY_INTERACTIVE else self.max_pending - self.interactive_reserve
+        if len(self._held_keys()) >= limit:
+            self.counters["rejected"] += 1
+            raise OcrQueueFull()
+
+    def reserve(self, key: Hashable, priority: int) -> QueueSlot:
+        """Claim room for ``key`` before its image is downloaded or decoded.
+
+        Never waits: raises :class:`OcrQueueFull` when no slot is free for
+        ``priority``. A user who already holds a slot or a queued job reuses it, and
+        their older slot is marked superseded. Pass the slot to :meth:`submit`, or
+        :meth:`release` it when the upload is answered without OCR.
+        """
+        self._admit(key, priority)
+        previous = self._reserved.get(key)
+        if previous is not None:
+            previous.superseded = True
+            self.counters["superseded"] += 1
+        slot = QueueSlot(key, priority)
+        self._reserved[key] = slot
+        return slot
+
+    def release(self, slot: QueueSlot) -> None:
+        """Give back a slot that was never submitted; a no-op once it has been."""
+        if self._reserved.get(slot.key) is slot:
+            del self._reserved[slot.key]
+
+    def submit(
+        self,
+        key: Hashable,
+        priority: int,
+        factory: Callable[[], Awaitable[Any]],
+        *,
+        slot: QueueSlot | None = None,
+    ) -> asyncio.Future:
+        """Queue ``factory`` for ``key`` and return a future for its result.
+
+        With a ``slot`` from :meth:`reserve` the room is already held; without one,
+        raises :class:`OcrQueueFull` when the queue has no room for ``priority``.
+        Raises :class:`OcrJobSuperseded` if a newer upload took over ``slot``.
+        """
+        if slot is not None:
+            if slot.superseded:
+                raise OcrJobSuperseded()
+            self.release(slot)
+        else:
+            self._admit(key, priority)
+
+        previous = self._pending.pop(key, None)
+        if previous is not None:
+            # Same user uploaded again before the last one ran: keep only the newest.
+            priority = min(priority, previous.priority)
+            self.counters["superseded"] += 1
+            if not previous.future.done():
+                previous.future.set_exception(OcrJobSuperseded())
+
+        job = _Job(key, priority, factory, asyncio.get_running_loop().create_future())
+        self._pending[key] = job
+        self._queue.put_nowait((priority, next(self._seq), job))
+        self.counters["submitted"] += 1
+        return job.future
+
+    async def _worker(self) -> None:
+        while True:
+            _, _, job = await self._queue.get()
+            if job.future.done():
+                # Superseded or cancelled while waiting.
+                continue
+            if self._pending.get(job.key) is job:
+                del self._pending[job.key]
+
+            started = time.perf_counter()
+            self.wait_times.append(started - job.enqueued_at)
+            self._active += 1
+            try:
+                result = await job.factory()
+            except asyncio.CancelledError:
+                job.future.cancel()
+                raise
+            except Exception as exc:
+                self.counters["failed"] += 1
+                if not job.future.done():
+                    job.future.set_exception(exc)
+            else:
+                self.counters["completed"] += 1
+                if not job.future.done():
+                    job.future.set_result(result)
+            finally:
+                self._active -= 1
+                self.service_times.append(time.perf_counter() - started)
+
+    def snapshot(self) -> dict:
+        """Queue depth, in-flight jobs, wait/service percentiles (seconds), and counters."""
+        waits = sorted(self.wait_times)
+        services = sorted(self.service_times)
+        return {
+            "depth": self.depth,
+            "reserved": len(self._reserved),
+            "active": self._active,
+            "capacity": self.max_pending,
+            "wait_p50": _percentile(waits, 50),
+            "wait_p95": _percentile(waits, 95),
+            "service_p50": _percentile(services, 50),
+            "service_p95": _percentile(services, 95),
+            **{name: self.counters[name] for name in ("submitted", "completed", "failed", "rejected", "superseded")},
+        }
+
+
+__all__ = [
+    "OcrJobQueue",
+    "QueueSlot",
+    "OcrJobSuperseded",
+    "OcrQueueFull",
+    "PRIORITY_BACKGROUND",
+    "PRIORITY_INTAKE",
+    "PRIORITY_INTERACTIVE",
+]
@@ -0,0 +1,45 @@
+"""Append-only JSONL results for resumable OCR batch runs.
+
+Each scanned image becomes one line: ``{"file": ..., "parsed": ...}`` on success
+or ``{"file": ..., "error": ...}`` on failure. A rerun reads the file back and
+skips only the successes, so errored images are retried. Kept free of the OCR
+stack so the resume rules can be checked without EasyOCR installed.
+"""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TextIO
+
+
+def completed_files(output: Path) -> set[str]:
+    """Files with a successful record in ``output``; errored files are retried on resume."""
+    done = set()
+    if not output.exists():
+        return done
+    with output.open("r", encoding="utf-8") as fp:
+        for line in fp:
+            try:
+                record = json.loads(line)
+                name = record["file"]
+            except (ValueError, KeyError, TypeError):
+                # A crash can leave a truncated last line; that file is simply rescanned.
+                continue
+            if "error" not in record or "parsed" in record:
+                done.add(name)
+    return done
+
+
+def append_record(fp: TextIO, record: dict) -> None:
+    """Write one result line and flush it, so a crash loses at most the line in progress."""
+    fp.write(json.dumps(record, ensure_ascii=False) + "\n")
+    fp.flush()
+
+
+def format_eta(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:d}:{minutes:02d}:{secs:02d}"
+
+
+__all__ = ["append_record", "completed_files", "format_eta"]
@@ -0,0 +1,87 @@
+"""Screen-layout registry for profile templates.
+
+Phones with different aspect ratios shift the profile card, so one median box
+set misreads some of them and pushes scans into the slow full-image pass.
+``boxes_ratios.json`` can hold a ``layouts`` map of per-layout box sets keyed by
+:func:`layout_key`; selection is a dict lookup on the image size, falling back
+to the same aspect at the nearest calibrated resolution and then to the median
+``template_ratios``.
+Layouts are calibrated offline with ``python ocr/box_picker.py --calibrate``.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+DEFAULT_LAYOUT = "default"
+ASPECT_STEP = 0.02
+# Short-side pixel limits for the resolution buckets; anything larger is "high".
+RESOLUTION_BUCKETS = ((540, "low"), (1080, "mid"))
+RESOLUTION_ORDER = {name: rank for rank, name in enumerate([name for _, name in RESOLUTION_BUCKETS] + ["high"])}
+
+Box = list[float]
+
+
+def aspect_bucket(width: int, height: int) -> str:
+    aspect = width / height if height else 0.0
+    return f"{round(aspect / ASPECT_STEP) * ASPECT_STEP:.2f}"
+
+
+def resolution_bucket(width: int, height: int) -> str:
+    short_side = min(width, height)
+    for limit, name in RESOLUTION_BUCKETS:
+        if short_side < limit:
+            return name
+    return "high"
+
+
+def layout_key(width: int, height: int) -> str:
+    """``"<aspect>@<resolution>"``, e.g. ``"0.46@mid"`` for a 720×1560 capture."""
+    return f"{aspect_bucket(width, height)}@{resolution_bucket(width, height)}"
+
+
+@dataclass
+class LayoutRegistry:
+    default: dict[str, Box]
+    layouts: dict[str, dict[str, Box]]
+
+    def __post_init__(self):
+        # Aspect index so an uncalibrated resolution still gets the right shape.
+        self._by_aspect: dict[str, dict[str, str]] = {}
+        for key in self.layouts:
+            aspect, _, resolution = key.partition("@")
+            self._by_aspect.setdefault(aspect, {})[resolution] = key
+
+    @classmethod
+    def from_template_data(cls, data: dict) -> "LayoutRegistry":
+        layouts = {
+            key: entry["ratios"]
+            for key, entry in (data.get("layouts") or {}).items()
+            if entry.get("ratios")
+        }
+        return cls(default=data.get("template_ratios") or {}, layouts=layouts)
+
+    def select(self, width: int, height: int) -> tuple[str, dict[str, Box]]:
+        """Return ``(layout name, boxes)`` for an image of ``width`` × ``height``."""
+        key = layout_key(width, height)
+        boxes = self.layouts.get(key)
+        if boxes:
+            return key, boxes
+
+        aspect, _, resolution = key.partition("@")
+        calibrated = self._by_aspect.get(aspect)
+        if calibrated:
+            wanted = RESOLUTION_ORDER[resolution]
+            # Nearest resolution bucket; on a tie the larger one, since shrinking crops loses less than enlarging.
+            nearest = min(
+                calibrated,
+                key=lambda name: (abs(RESOLUTION_ORDER.get(name, wanted) - wanted), -RESOLUTION_ORDER.get(name, 0)),
+            )
+            fallback = calibrated[nearest]
+            return fallback, self.layouts[fallback]
+        return DEFAULT_LAYOUT, self.default
+
+    def __len__(self) -> int:
+        return len(self.layouts)
+
+
+__all__ = ["DEFAULT_LAYOUT", "LayoutRegistry", "layout_key"]
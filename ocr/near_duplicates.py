@@ -0,0 +1,89 @@
+"""Per-guild index of recent profile scans, searched by perceptual-hash distance.
+
+Re-compressed or lightly cropped re-uploads of the same card miss the exact
+SHA-256 cache but land within a few bits of the original hashes; those reuse the
+uploader's previous parse instead of paying for another EasyOCR pass.
+
+A match needs the whole-card dHash to be close *and* every numeric field's ROI
+signature to be within ``roi_threshold`` (see ``OcrEngine.near_duplicate_key``
+and :func:`ocr.engine.roi_distance`): a card whose layout is unchanged
+but whose CP or kills went up is a different scan. Entries older than ``ttl``
+seconds are ignored so a stale parse cannot be served indefinitely.
+"""
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+
+from ocr.engine import roi_distance
+
+
+@dataclass
+class IndexedScan:
+    user_id: int
+    phash: int
+    roi_signatures: tuple
+    parsed: dict
+    raw_ocr: str
+    ocr_note: str | None
+    indexed_at: float = field(default_factory=time.time)
+
+
+class NearDuplicateIndex:
+    """Bounded in-memory index of recent scans per guild."""
+
+    def __init__(
+        self,
+        *,
+        max_distance: int = 6,
+        roi_threshold: float = 0.4,
+        ttl: float | None = 3600.0,
+        per_guild: int = 256,
+    ):
+        self.max_distance = max_distance
+        self.roi_threshold = roi_threshold
+        self.ttl = ttl
+        self.per_guild = per_guild
+        self._guilds: dict[int, deque[IndexedScan]] = {}
+
+    def find(self, guild_id: int, user_id: int, phash: int, roi_signatures: tuple) -> IndexedScan | None:
+        """Closest fresh scan from the same user whose card and numeric crops all match."""
+        if not roi_signatures:
+            return None
+        oldest = time.time() - self.ttl if self.ttl else None
+        best: IndexedScan | None = None
+        best_distance = self.max_distance + 1
+        for entry in self._guilds.get(guild_id, ()):
+            if entry.user_id != user_id or len(entry.roi_signatures) != len(roi_signatures):
+                continue
+            if oldest is not None and entry.indexed_at < oldest:
+                continue
+            distance = (entry.phash ^ phash).bit_count()
+            if distance >= best_distance:
+                continue
+            if all(
+                roi_distance(old, new) <= self.roi_threshold
+                for old, new in zip(entry.roi_signatures, roi_signatures)
+            ):
+                best, best_distance = entry, distance
+        return best
+
+    def add(
+        self,
+        guild_id: int,
+        user_id: int,
+        phash: int,
+        roi_signatures: tuple,
+        parsed: dict,
+        raw_ocr: str,
+        ocr_note: str | None,
+    ) -> None:
+        entries = self._guilds.setdefault(guild_id, deque(maxlen=self.per_guild))
+        entries.append(IndexedScan(user_id, phash, roi_signatures, parsed, raw_ocr, ocr_note))
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._guilds.values())
+
+
+__all__ = ["IndexedScan", "NearDuplicateIndex"]
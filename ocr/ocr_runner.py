@@ -1,7 +1,25 @@
+"""Run EasyOCR over screenshots in ``shots/``.
+
+Default mode prints each screenshot's fields. ``--batch`` spreads the files
+over worker processes (one reader each), streams one JSON line per image to
+``--output`` as results complete, skips files that already have a successful
+line in that output so an interrupted backfill resumes (and retries the files
+that errored), and reports images/s and ETA.
+
+Usage:
+    python ocr/ocr_runner.py
+    python ocr/ocr_runner.py --batch --workers 4 --output ocr_results.jsonl [--input shots]
+"""
+import argparse
 import importlib.util
 import json
+import multiprocessing
 import os
 import re
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
 
 _CV2_SPEC = importlib.util.find_spec("cv2")
 _EASYOCR_SPEC = importlib.util.find_spec("easyocr")
@@ -15,6 +33,13 @@ if not (_CV2_SPEC and _EASYOCR_SPEC):  # pragma: no cover - CLI helper guard
 import cv2
 import easyocr
 
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from ocr.engine import OcrEngine, ScanImage, default_torch_threads, parse_profile_text  # noqa: E402
+from ocr.jsonl_results import append_record, completed_files, format_eta  # noqa: E402
+
 INPUT_DIR = "shots"
 BOXES_FILE = "boxes_ratios.json"
 
@@ -160,5 +185,108 @@ def main():
     print("Done.\n")
 
 
+# --- Batch mode ---
+
+_batch_engine = None
+
+
+def _batch_init(torch_threads: int) -> None:
+    global _batch_engine
+    _batch_engine = OcrEngine(torch_threads=torch_threads)
+    _batch_engine.load()
+
+
+def _batch_scan(path: str) -> dict:
+    started = time.perf_counter()
+    record = {"file": os.path.basename(path)}
+    try:
+        with open(path, "rb") as fp:
+            result = _batch_engine.scan_easyocr(ScanImage(fp.read()))
+    except Exception as exc:  # keep the batch going; the line records the failure
+        record["error"] = f"{type(exc).__name__}: {exc}"
+        result = None
+
+    if result is None:
+        record.setdefault("error", _batch_engine.failure_reason or "could not read image")
+    else:
+        parsed = dict(result["parsed"])
+        if result.get("full_text"):
+            parsed.update(parse_profile_text(result["full_text"]))
+        record.update(
+            parsed=parsed,
+            raw=result["raw"],
+            layout=result.get("layout"),
+            full_text_used=result.get("full_text_used", False),
+        )
+    record["seconds"] = round(time.perf_counter() - started, 3)
+    return record
+
+
+def batch_main(input_dir: Path, output: Path, workers: int) -> None:
+    files = list_images(str(input_dir))
+    done = completed_files(output)
+    todo = [name for name in files if name not in done]
+    print(f"{len(files)} screenshots, {len(done)} already in {output}, {len(todo)} to scan with {workers} workers")
+    if not todo:
+        return
+
+    started = time.perf_counter()
+    finished = errors = 0
+    pending_paths = iter(str(input_dir / name) for name in todo)
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=context,
+        initializer=_batch_init,
+        initargs=(default_torch_threads(workers),),
+    ) as pool, output.open("a", encoding="utf-8") as out:
+        # Keep a couple of files in flight per worker instead of queueing the whole folder.
+        in_flight = set()
+        for path in pending_paths:
+            in_flight.add(pool.submit(_batch_scan, path))
+            if len(in_flight) >= workers * 2:
+                break
+
+        while in_flight:
+            completed, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in completed:
+                record = future.result()
+                append_record(out, record)
+                finished += 1
+                errors += "error" in record
+
+                next_path = next(pending_paths, None)
+                if next_path is not None:
+                    in_flight.add(pool.submit(_batch_scan, next_path))
+
+            elapsed = time.perf_counter() - started
+            rate = finished / elapsed if elapsed else 0.0
+            eta = (len(todo) - finished) / rate if rate else 0.0
+            print(
+                f"\r[{finished}/{len(todo)}] {rate:.2f} img/s  ETA {format_eta(eta)}  errors {errors}",
+                end="",
+                flush=True,
+            )
+
+    elapsed = time.perf_counter() - started
+    print(f"\nDone: {finished} images in {elapsed:.1f}s ({finished / elapsed:.2f} img/s). Results in {output}")
+
+
+def cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch", action="store_true", help="parallel, resumable JSONL mode")
+    parser.add_argument("--input", type=Path, default=REPO_ROOT / INPUT_DIR, help="screenshot folder (batch mode)")
+    parser.add_argument("--output", type=Path, default=Path("ocr_results.jsonl"), help="JSONL results (batch mode)")
+    parser.add_argument(
+        "--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2), help="worker processes (batch mode)"
+    )
+    args = parser.parse_args()
+
+    if args.batch:
+        batch_main(args.input, args.output, max(1, args.workers))
+    else:
+        main()
+
+
 if __name__ == "__main__":
-    main()
+    cli()
@@ -0,0 +1,190 @@
+"""Shared OCR.space client with keep-alive, a concurrency cap, and a circuit breaker.
+
+One ``httpx.AsyncClient`` lives for the whole cog, so fallback scans reuse warm
+TLS connections instead of handshaking per request. After
+``failure_threshold`` consecutive transport/HTTP failures the breaker opens and
+scans skip the endpoint for ``cooldown`` seconds, then a single trial request
+decides whether to close it again. Latencies land in a fixed-bucket histogram
+for ``/ocr_status``.
+
+Point ``OCR_SPACE_ENDPOINT`` at ``python ocr/ocr_space_stub.py`` to exercise it locally.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import time
+from collections import Counter
+
+import httpx
+
+logger = logging.getLogger("MarciaOS.OCRSpace")
+
+DEFAULT_ENDPOINT = "https://api.ocr.space/parse/image"
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0)
+
+
+class CircuitBreaker:
+    """Closed → open after N consecutive failures → half-open (one trial) after ``cooldown``."""
+
+    def __init__(self, *, failure_threshold: int = 3, cooldown: float = 60.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: float | None = None
+        self._trial_in_flight = False
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            return "half-open"
+        return "open"
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "half-open" and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def abandon_trial(self) -> None:
+        """A cancelled trial decides nothing; let the next call try again."""
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        # A failed half-open trial re-opens immediately; otherwise wait for the threshold.
+        if self._trial_in_flight or (self.opened_at is None and self.failures >= self.failure_threshold):
+            logger.warning("⛔ OCR.space circuit opened after %d consecutive failure(s)", self.failures)
+            self.opened_at = time.monotonic()
+        self._trial_in_flight = False
+
+
+class OcrSpaceClient:
+    """Async OCR.space caller owned by the profile scanner cog."""
+
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        endpoint: str = DEFAULT_ENDPOINT,
+        timeout: float = 8.0,
+        max_concurrency: int = 2,
+        failure_threshold: int = 3,
+        cooldown: float = 60.0,
+    ):
+        self.api_key = api_key
+        self.endpoint = endpoint
+        self.timeout = timeout
+        self.max_concurrency = max(1, max_concurrency)
+        self.breaker = CircuitBreaker(failure_threshold=failure_threshold, cooldown=cooldown)
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._client: httpx.AsyncClient | None = None
+        self.counters: Counter[str] = Counter()
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    @classmethod
+    def from_env(cls, api_key: str) -> "OcrSpaceClient":
+        return cls(
+            api_key,
+            endpoint=os.getenv("OCR_SPACE_ENDPOINT", DEFAULT_ENDPOINT),
+            timeout=float(os.getenv("OCR_SPACE_TIMEOUT", "8")),
+            max_concurrency=int(os.getenv("OCR_SPACE_CONCURRENCY", "2")),
+            failure_threshold=int(os.getenv("OCR_SPACE_BREAKER_FAILURES", "3")),
+            cooldown=float(os.getenv("OCR_SPACE_BREAKER_COOLDOWN", "60")),
+        )
+
+    def _http(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                timeout=httpx.Timeout(self.timeout, connect=min(3.0, self.timeout)),
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                    keepalive_expiry=60.0,
+                ),
+            )
+        return self._client
+
+    def _observe(self, seconds: float) -> None:
+        for index, limit in enumerate(LATENCY_BUCKETS):
+            if seconds <= limit:
+                self.histogram[index] += 1
+                return
+        self.histogram[-1] += 1
+
+    async def parse(self, image_bytes: bytes, filename: str | None = None) -> tuple[str, str | None]:
+        """Return ``(text, note)``; ``note`` explains an empty result."""
+        if not self.breaker.allow():
+            self.counters["short_circuited"] += 1
+            return "", "External OCR is temporarily paused after repeated failures."
+
+        headers = {"apikey": self.api_key}
+        data = {"language": "eng", "isOverlayRequired": False}
+        files = {"file": (filename or "profile.png", image_bytes, "application/octet-stream")}
+
+        async with self._semaphore:
+            started = time.perf_counter()
+            try:
+                resp = await self._http().post(self.endpoint, headers=headers, data=data, files=files)
+                resp.raise_for_status()
+            except asyncio.CancelledError:
+                self.breaker.abandon_trial()
+                raise
+            except Exception as exc:  # pragma: no cover - network edge
+                self._observe(time.perf_counter() - started)
+                self.counters["failed"] += 1
+                self.breaker.record_failure()
+                logger.warning("OCR.space request failed: %s", exc)
+                return "", "External OCR request failed."
+            self._observe(time.perf_counter() - started)
+
+        self.counters["succeeded"] += 1
+        self.breaker.record_success()
+        try:
+            payload = resp.json()
+        except ValueError:
+            logger.warning("OCR.space returned non-JSON response")
+            return "", "External OCR response was malformed."
+
+        if payload.get("IsErroredOnProcessing"):
+            msg = payload.get("ErrorMessage") or payload.get("ErrorMessageText")
+            note = msg if isinstance(msg, str) else "External OCR service reported an error."
+            return "", note
+
+        results = payload.get("ParsedResults") or []
+        text_blocks = [item.get("ParsedText", "") for item in results if item]
+        combined = "\n".join(filter(None, text_blocks)).strip()
+
+        if not combined:
+            return "", "External OCR did not return any text."
+
+        return combined, None
+
+    def snapshot(self) -> dict:
+        """Breaker state, request counters, and ``{bucket label: count}`` latencies."""
+        labels = [f"≤{limit:g}s" for limit in LATENCY_BUCKETS] + [f">{LATENCY_BUCKETS[-1]:g}s"]
+        return {
+            "state": self.breaker.state,
+            "consecutive_failures": self.breaker.failures,
+            **{name: self.counters[name] for name in ("succeeded", "failed", "short_circuited")},
+            "latency": dict(zip(labels, self.histogram)),
+        }
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+__all__ = ["CircuitBreaker", "OcrSpaceClient"]
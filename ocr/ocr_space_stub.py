@@ -0,0 +1,70 @@
+"""Local stand-in for the OCR.space parse endpoint.
+
+Answers ``POST /parse/image`` with a canned profile card so the fallback path,
+its connection reuse, and the circuit breaker can be exercised offline:
+
+    python ocr/ocr_space_stub.py --port 8765 [--delay 0.2] [--fail-rate 0.5] [--status 503]
+    OCR_SPACE_ENDPOINT=http://127.0.0.1:8765/parse/image OCR_SPACE_API_KEY=stub python main.py
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+SAMPLE_TEXT = "Commander Stub\nCP 12,345,678\nKills 4,321\nLikes 99\nVIP 8\nAlliance [STB] Stubbers\nServer #1234"
+
+
+def make_handler(*, delay: float, fail_rate: float, status: int, text: str):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real endpoint
+
+        def do_POST(self):  # noqa: N802 - http.server naming
+            length = int(self.headers.get("Content-Length") or 0)
+            self.rfile.read(length)
+            if delay:
+                time.sleep(delay)
+
+            if random.random() < fail_rate:
+                body = b'{"error": "stubbed failure"}'
+                self.send_response(status)
+            else:
+                body = json.dumps(
+                    {"IsErroredOnProcessing": False, "ParsedResults": [{"ParsedText": text}]}
+                ).encode()
+                self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt, *args):
+            print(f"{self.client_address[0]}:{self.client_address[1]} {fmt % args}")
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to wait before answering")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="fraction of requests answered with --status")
+    parser.add_argument("--status", type=int, default=503, help="HTTP status for failed requests")
+    args = parser.parse_args()
+
+    handler = make_handler(delay=args.delay, fail_rate=args.fail_rate, status=args.status, text=SAMPLE_TEXT)
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    print(f"OCR.space stub listening on http://{args.host}:{args.port}/parse/image")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""Bulk rescan of stored profile screenshots after template or engine upgrades.
+
+Snapshots keep the parse from the day they were uploaded; the original image
+stays under ``shots/profiles/<guild>/`` (``local_image_path``). A rescan walks
+those rows in ``(guild_id, user_id)`` pages, OCRs a bounded window of images at
+a time, and writes only the columns whose value changed, skipping rows the
+member re-uploaded since the page was read. Each page's updates
+and the job checkpoint commit together, so an interrupted run resumes after the
+last written page as long as ``boxes_ratios.json`` has not changed since.
+
+Usage:
+    python ocr/rescan.py [--guild 123] [--workers 2] [--job default] [--restart]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import logging
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from database import (  # noqa: E402
+    apply_profile_rescans,
+    clear_rescan_checkpoint,
+    count_rescannable_profiles,
+    get_rescan_checkpoint,
+    get_rescannable_profiles,
+    init_db,
+)
+from ocr.engine import BOXES_PATH, OcrEngine, ScanImage, parse_profile_text, template_version  # noqa: E402
+from ocr.worker_pool import OcrWorkerPool  # noqa: E402
+
+logger = logging.getLogger("MarciaOS.OCRRescan")
+
+RESCAN_PAGE_SIZE = 100
+SNAPSHOT_FIELDS = ("player_name", "alliance", "server", "cp", "kills", "likes", "vip_level", "ownership_verified")
+
+ScanFn = Callable[[bytes], Awaitable[dict | None]]
+
+
+@dataclass
+class RescanProgress:
+    total: int
+    processed: int = 0
+    changed: int = 0
+    # Rows re-uploaded while the job ran; their fresh scan wins over the rescan.
+    superseded: int = 0
+    missing: int = 0
+    failed: int = 0
+    resumed_from: int = 0
+    started: float = field(default_factory=time.perf_counter)
+    finished: bool = False
+
+    @property
+    def rate(self) -> float:
+        """Images per second in this run (resumed rows excluded)."""
+        elapsed = time.perf_counter() - self.started
+        done = self.processed - self.resumed_from
+        return done / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta_seconds(self) -> float | None:
+        rate = self.rate
+        return (self.total - self.processed) / rate if rate else None
+
+    def summary(self) -> str:
+        eta = self.eta_seconds
+        eta_text = "done" if self.finished else f"ETA {eta:.0f}s" if eta is not None else "ETA —"
+        return (
+            f"{self.processed}/{self.total} scanned | {self.changed} changed | {self.superseded} superseded | "
+            f"{self.missing} missing | {self.failed} failed | {self.rate:.2f} img/s | {eta_text}"
+        )
+
+
+def merge_scan_result(result: dict | None) -> tuple[dict, str]:
+    """Parsed fields and raw text, combined the same way a live scan combines them."""
+    if not result:
+        return {}, ""
+    parsed = dict(result.get("parsed") or {})
+    raw_text = result.get("raw") or ""
+    full_text = result.get("full_text")
+    if full_text:
+        raw_text = raw_text or full_text
+        parsed.update(parse_profile_text(full_text))
+    return parsed, raw_text
+
+
+def changed_fields(row: dict, parsed: dict, raw_text: str) -> dict:
+    """Columns whose new reading differs from the stored one; unread fields never clear old values."""
+    changes = {}
+    for column in SNAPSHOT_FIELDS:
+        value = parsed.get(column)
+        if value is None:
+            continue
+        if column == "ownership_verified":
+            value = int(bool(value))
+        if row.get(column) != value:
+            changes[column] = value
+    if changes and raw_text:
+        changes["raw_ocr"] = raw_text
+    return changes
+
+
+async def _rescan_row(scan: ScanFn, row: dict, progress: RescanProgress) -> dict | None:
+    path = Path(row["local_image_path"])
+    try:
+        image_bytes = await asyncio.to_thread(path.read_bytes)
+    except OSError:
+        progress.missing += 1
+        return None
+
+    try:
+        result = await scan(image_bytes)
+    except Exception:
+        logger.exception("Rescan failed for guild %s user %s", row["guild_id"], row["user_id"])
+        progress.failed += 1
+        return None
+
+    parsed, raw_text = merge_scan_result(result)
+    return changed_fields(row, parsed, raw_text) or None
+
+
+async def rescan_profiles(
+    scan: ScanFn,
+    *,
+    job: str = "default",
+    guild_id: int | None = None,
+    window: int = 2,
+    page_size: int = RESCAN_PAGE_SIZE,
+    resume: bool = True,
+    on_progress: Callable[[RescanProgress], object] | None = None,
+) -> RescanProgress:
+    """Rescan stored images with at most ``window`` in flight and upsert changed fields per page."""
+    version = template_version(BOXES_PATH)
+    checkpoint = await get_rescan_checkpoint(job) if resume else None
+    if checkpoint and checkpoint["template_version"] != version:
+        logger.info("Templates changed since rescan '%s' was checkpointed; starting over", job)
+        checkpoint = None
+
+    after = (checkpoint["guild_id"], checkpoint["user_id"]) if checkpoint else None
+    done_before = checkpoint["processed"] if checkpoint else 0
+    remaining = await count_rescannable_profiles(guild_id, after)
+    progress = RescanProgress(
+        total=done_before + remaining,
+        processed=done_before,
+        changed=checkpoint["changed"] if checkpoint else 0,
+        resumed_from=done_before,
+    )
+    logger.info("🔁 Profile rescan '%s' starting: %d remaining of %d", job, remaining, progress.total)
+
+    # The semaphore caps images held in memory; each page is fully written before the next loads.
+    slots = asyncio.Semaphore(max(1, window))
+
+    async def _bounded(row: dict) -> dict | None:
+        async with slots:
+            return await _rescan_row(scan, row, progress)
+
+    while True:
+        rows = await get_rescannable_profiles(guild_id, after, page_size)
+        if not rows:
+            break
+
+        outcomes = await asyncio.gather(*(_bounded(row) for row in rows))
+        updates = [
+            (row["guild_id"], row["user_id"], row["last_updated"], changes)
+            for row, changes in zip(rows, outcomes)
+            if changes
+        ]
+        after = (rows[-1]["guild_id"], rows[-1]["user_id"])
+        progress.processed += len(rows)
+        applied = await apply_profile_rescans(
+            updates,
+            job=job,
+            template_version=version,
+            last_key=after,
+            processed=progress.processed,
+            changed=progress.changed,
+        )
+        progress.changed += applied
+        progress.superseded += len(updates) - applied
+
+        if on_progress is not None:
+            outcome = on_progress(progress)
+            if inspect.isawaitable(outcome):
+                await outcome
+
+    progress.finished = True
+    await clear_rescan_checkpoint(job)
+    logger.info("🔁 Profile rescan '%s' finished: %s", job, progress.summary())
+    return progress
+
+
+async def _cli_main(args: argparse.Namespace) -> None:
+    await init_db()
+    if args.restart:
+        await clear_rescan_checkpoint(args.job)
+
+    pool = OcrWorkerPool(args.workers) if args.workers > 0 else None
+    engine = None if pool else OcrEngine()
+
+    async def _scan(image_bytes: bytes) -> dict | None:
+        if pool:
+            return await pool.scan(image_bytes)
+        return await asyncio.to_thread(engine.scan_easyocr, ScanImage(image_bytes))
+
+    try:
+        progress = await rescan_profiles(
+            _scan,
+            job=args.job,
+            guild_id=args.guild,
+            # Two images per worker keeps every process busy without buffering a whole page.
+            window=max(1, args.workers) * 2,
+            page_size=args.page_size,
+            on_progress=lambda state: print(state.summary(), flush=True),
+        )
+    finally:
+        if pool:
+            pool.shutdown(wait=True)
+    print(f"Finished: {progress.summary()}")
+
+
+def cli() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--guild", type=int, help="only rescan this guild")
+    parser.add_argument("--workers", type=int, default=2, help="OCR worker processes (0 = in-process)")
+    parser.add_argument("--job", default="default", help="checkpoint name; reuse it to resume")
+    parser.add_argument("--page-size", type=int, default=RESCAN_PAGE_SIZE, help="rows per transaction")
+    parser.add_argument("--restart", action="store_true", help="ignore any saved checkpoint for --job")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+    asyncio.run(_cli_main(args))
+
+
+__all__ = ["RescanProgress", "changed_fields", "merge_scan_result", "rescan_profiles"]
+
+
+if __name__ == "__main__":
+    cli()
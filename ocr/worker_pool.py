@@ -0,0 +1,154 @@
+"""Dedicated OCR worker processes, each holding its own EasyOCR reader.
+
+Torch inference is CPU-bound; running it in the default thread pool makes it
+fight the event loop for the GIL and queue behind every other
+``run_in_executor`` user. Workers are spawned (not forked) so torch never
+inherits the bot's threads, load their reader once in the initializer, and
+receive raw image bytes so only small parsed results travel back.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+from ocr.engine import (
+    BOXES_PATH,
+    QUANTIZE,
+    TORCH_INTEROP_THREADS,
+    OcrEngine,
+    ScanImage,
+    default_torch_threads,
+    easyocr_installed,
+)
+
+logger = logging.getLogger("MarciaOS.OCRPool")
+
+_worker_engine: OcrEngine | None = None
+
+
+def _init_worker(boxes_path: str, warm_up: bool, engine_options: dict) -> None:
+    global _worker_engine
+    _worker_engine = OcrEngine(Path(boxes_path), **engine_options)
+    if warm_up:
+        _worker_engine.warm_up()
+    else:
+        _worker_engine.load()
+
+
+def _worker_status() -> dict:
+    engine = _worker_engine
+    return {
+        "pid": os.getpid(),
+        "ready": bool(engine and engine.ready),
+        "failure_reason": engine.failure_reason if engine else "Worker not initialized.",
+        "load_seconds": engine.load_seconds if engine else None,
+        "warm": bool(engine and engine.warm),
+        "warmup_seconds": engine.warmup_seconds if engine else None,
+        "torch_threads": engine.torch_threads if engine else None,
+        "quantize": engine.quantize if engine else None,
+    }
+
+
+def _worker_scan(image_bytes: bytes) -> dict | None:
+    engine = _worker_engine
+    if engine is None:
+        return None
+    # Decode once here; template and full-text passes share the same arrays.
+    image = ScanImage(image_bytes)
+    result = engine.scan_easyocr(image)
+    if result is not None:
+        result["decoded_bytes"] = image.nbytes
+    return result
+
+
+def configured_worker_count() -> int:
+    """``OCR_WORKERS`` if set, else ``PROFILE_SCAN_CONCURRENCY``; 0 keeps OCR in-process."""
+    raw = os.getenv("OCR_WORKERS") or os.getenv("PROFILE_SCAN_CONCURRENCY", "2")
+    try:
+        return max(0, int(raw))
+    except ValueError:
+        logger.warning("Invalid OCR_WORKERS value %r; keeping OCR in-process", raw)
+        return 0
+
+
+class OcrWorkerPool:
+    """Async facade over a spawn-based ``ProcessPoolExecutor``."""
+
+    def __init__(
+        self,
+        workers: int,
+        boxes_path: Path = BOXES_PATH,
+        *,
+        warm_up: bool = False,
+        torch_threads: int | None = None,
+        interop_threads: int = TORCH_INTEROP_THREADS,
+        quantize: bool = QUANTIZE,
+    ):
+        self.workers = workers
+        self.boxes_path = Path(boxes_path)
+        # Warm workers run a dummy inference in the initializer, before their first job.
+        self.warm_up = warm_up
+        # Each worker gets its share of the cores so N workers don't each spin up N-core torch pools.
+        self.engine_options = {
+            "torch_threads": torch_threads or default_torch_threads(workers),
+            "interop_threads": interop_threads,
+            "quantize": quantize,
+        }
+        self._executor: ProcessPoolExecutor | None = None
+
+    @classmethod
+    def from_env(cls, *, warm_up: bool = False) -> "OcrWorkerPool | None":
+        workers = configured_worker_count()
+        if workers <= 0 or not easyocr_installed():
+            return None
+        return cls(workers, warm_up=warm_up)
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(str(self.boxes_path), self.warm_up, self.engine_options),
+            )
+            logger.info(
+                "🧠 OCR worker pool started with %d process(es), %d torch thread(s) each",
+                self.workers,
+                self.engine_options["torch_threads"],
+            )
+        return self._executor
+
+    async def _submit(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._ensure_executor(), fn, *args)
+        except BrokenProcessPool:
+            # A worker died (OOM, segfault); drop the pool so the next scan respawns it.
+            logger.exception("OCR worker pool broke; restarting on next scan")
+            self.shutdown(wait=False)
+            raise
+
+    async def status(self) -> dict:
+        """Initialize a worker (if needed) and report whether its reader loaded."""
+        return await self._submit(_worker_status)
+
+    async def warm_all(self) -> list[dict]:
+        """Start every worker (each warms itself in the initializer) and return their statuses."""
+        return await asyncio.gather(*(self.status() for _ in range(self.workers)))
+
+    async def scan(self, image_bytes: bytes) -> dict | None:
+        """Template scan plus full-text fallback (see ``OcrEngine.scan_easyocr``)."""
+        return await self._submit(_worker_scan, image_bytes)
+
+    def shutdown(self, *, wait: bool = False) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+
+__all__ = ["OcrWorkerPool", "configured_worker_count"]
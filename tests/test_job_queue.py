@@ -0,0 +1,67 @@
+import asyncio
+
+import pytest
+
+from ocr.job_queue import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_INTAKE,
+    PRIORITY_INTERACTIVE,
+    OcrJobQueue,
+    OcrJobSuperseded,
+    OcrQueueFull,
+)
+
+
+def test_reserve_rejects_before_download_and_release_frees_room():
+    async def scenario():
+        queue = OcrJobQueue(workers=1, max_pending=3, interactive_reserve=1)
+        first = queue.reserve((1, 1), PRIORITY_INTAKE)
+        queue.reserve((1, 2), PRIORITY_INTAKE)
+        with pytest.raises(OcrQueueFull):
+            queue.reserve((1, 3), PRIORITY_INTAKE)
+        queue.release(first)
+        queue.reserve((1, 3), PRIORITY_INTAKE)
+        # Intake is full again, but the interactive reserve is still open.
+        interactive = queue.reserve((1, 4), PRIORITY_INTERACTIVE)
+        with pytest.raises(OcrQueueFull):
+            queue.reserve((1, 5), PRIORITY_INTERACTIVE)
+        assert not interactive.superseded
+        assert queue.snapshot()["rejected"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_newer_upload_supersedes_reserved_slot_without_taking_more_room():
+    async def scenario():
+        queue = OcrJobQueue(workers=1, max_pending=2, interactive_reserve=1)
+        older = queue.reserve((1, 1), PRIORITY_INTAKE)
+        newer = queue.reserve((1, 1), PRIORITY_INTAKE)
+        assert older.superseded and not newer.superseded
+
+        with pytest.raises(OcrJobSuperseded):
+            queue.submit(older.key, older.priority, lambda: asyncio.sleep(0), slot=older)
+        queue.release(older)  # no-op: the newer upload keeps the slot
+        with pytest.raises(OcrQueueFull):
+            queue.reserve((1, 2), PRIORITY_INTAKE)
+
+    asyncio.run(scenario())
+
+
+def test_background_jobs_run_after_uploads_and_do_not_use_intake_room():
+    async def scenario():
+        queue = OcrJobQueue(workers=1, max_pending=2, interactive_reserve=1)
+        order = []
+
+        async def job(name):
+            order.append(name)
+
+        rescans = [queue.submit(("rescan", n), PRIORITY_BACKGROUND, lambda n=n: job(f"rescan{n}")) for n in range(3)]
+        slot = queue.reserve((1, 1), PRIORITY_INTAKE)
+        upload = queue.submit(slot.key, slot.priority, lambda: job("upload"), slot=slot)
+
+        queue.start()
+        await asyncio.gather(upload, *rescans)
+        queue.stop()
+        assert order == ["upload", "rescan0", "rescan1", "rescan2"]
+
+    asyncio.run(scenario())
@@ -0,0 +1,42 @@
+import json
+
+from ocr.jsonl_results import append_record, completed_files, format_eta
+
+
+def test_resume_retries_errored_files(tmp_path):
+    output = tmp_path / "ocr_results.jsonl"
+    records = [
+        {"file": "ok.png", "parsed": {"cp": 123}, "raw": "", "seconds": 0.2},
+        {"file": "broken.png", "error": "could not read image", "seconds": 0.1},
+        {"file": "retried.png", "error": "RuntimeError: boom", "seconds": 0.1},
+        {"file": "retried.png", "parsed": {"kills": 4}, "raw": "", "seconds": 0.3},
+    ]
+    lines = [json.dumps(record) for record in records]
+    # A crash mid-write leaves a truncated last line.
+    output.write_text("\n".join(lines) + '\n{"file": "half', encoding="utf-8")
+
+    assert completed_files(output) == {"ok.png", "retried.png"}
+
+
+def test_appended_error_is_retried_until_it_succeeds(tmp_path):
+    output = tmp_path / "ocr_results.jsonl"
+    files = ["a.png", "b.png", "c.png"]
+
+    with output.open("a", encoding="utf-8") as out:
+        append_record(out, {"file": "a.png", "parsed": {"cp": 1}})
+        append_record(out, {"file": "b.png", "error": "ValueError: bad crop"})
+    todo = [name for name in files if name not in completed_files(output)]
+    assert todo == ["b.png", "c.png"]
+
+    with output.open("a", encoding="utf-8") as out:
+        for name in todo:
+            append_record(out, {"file": name, "parsed": {"cp": 2}})
+    assert completed_files(output) == set(files)
+
+
+def test_missing_output_means_nothing_done(tmp_path):
+    assert completed_files(tmp_path / "absent.jsonl") == set()
+
+
+def test_format_eta():
+    assert format_eta(3725.9) == "1:02:05"
@@ -0,0 +1,29 @@
+from ocr.layouts import DEFAULT_LAYOUT, LayoutRegistry
+
+
+def _registry(*keys: str) -> LayoutRegistry:
+    return LayoutRegistry(default={"cp": [0, 0, 1, 1]}, layouts={key: {"cp": [0, 0, 0.5, 0.5]} for key in keys})
+
+
+def test_exact_bucket_wins():
+    layout, _ = _registry("0.46@low", "0.46@mid", "0.46@high").select(720, 1560)
+    assert layout == "0.46@mid"
+
+
+def test_missing_resolution_falls_back_to_nearest_bucket():
+    registry = _registry("0.46@low", "0.46@high")
+    assert registry.select(1440, 3120)[0] == "0.46@high"
+    # Alphabetical order would hand this "low" capture the "high" boxes.
+    assert registry.select(400, 867)[0] == "0.46@low"
+
+    registry = _registry("0.46@high", "0.46@mid")
+    assert registry.select(400, 867)[0] == "0.46@mid"
+
+
+def test_equidistant_buckets_prefer_the_larger_resolution():
+    assert _registry("0.46@low", "0.46@high").select(720, 1560)[0] == "0.46@high"
+
+
+def test_unknown_aspect_uses_default_boxes():
+    layout, boxes = _registry("0.46@mid").select(1080, 1920)
+    assert layout == DEFAULT_LAYOUT and boxes == {"cp": [0, 0, 1, 1]}
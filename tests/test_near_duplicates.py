@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+cv2 = pytest.importorskip("cv2")
+np = pytest.importorskip("numpy")
+
+from ocr.engine import OcrEngine, ScanImage  # noqa: E402
+from ocr.near_duplicates import NearDuplicateIndex  # noqa: E402
+
+WIDTH, HEIGHT = 720, 1560
+
+
+def _card(
+    engine: OcrEngine, values: dict[str, str], *, quality: int | None = None, scale: float = 1.0
+) -> ScanImage:
+    card = np.full((HEIGHT, WIDTH, 3), 40, dtype=np.uint8)
+    cv2.rectangle(card, (30, 80), (WIDTH - 30, 420), (90, 70, 50), -1)
+    cv2.putText(card, "PROFILE", (60, 60), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (230, 230, 230), 2, cv2.LINE_AA)
+    _, plan = engine.crop_plan(WIDTH, HEIGHT)
+    for field, ((x1, y1, x2, y2), _) in plan.items():
+        text = values.get(field, "Survivor")
+        # Fit the text inside its box, as the game does, so every digit lands in the crop.
+        width = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 1.0, 2)[0][0]
+        font_scale = min((y2 - y1) / 40, (x2 - x1 - 4) / width)
+        cv2.putText(card, text, (x1 + 2, y2 - 4), cv2.FONT_HERSHEY_SIMPLEX, font_scale, (255, 255, 255), 2, cv2.LINE_AA)
+    if scale != 1.0:
+        card = cv2.resize(card, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    if quality is None:
+        encoded = cv2.imencode(".png", card)[1]
+    else:
+        encoded = cv2.imencode(".jpg", card, [cv2.IMWRITE_JPEG_QUALITY, quality])[1]
+    return ScanImage(encoded.tobytes())
+
+
+@pytest.fixture(scope="module")
+def engine() -> OcrEngine:
+    engine = OcrEngine()
+    if not engine.load_templates():
+        pytest.skip("no OCR templates")
+    return engine
+
+
+BASE = {"cp": "1,234,567", "kills": "234,567", "likes": "12,345", "vip": "12"}
+# One digit changed per field, in the leading, middle, and trailing positions.
+ONE_DIGIT = {
+    "cp": ["1,284,567", "1,234,967", "1,234,568"],
+    "kills": ["284,567", "234,967", "234,568"],
+    "likes": ["18,345", "12,945", "12,346"],
+    "vip": ["92", "19", "13"],
+}
+
+
+def test_digit_change_is_not_a_near_duplicate(engine):
+    before = _card(engine, BASE)
+    after = _card(engine, {"cp": "9,876,043", "kills": "870,101", "likes": "64,210", "vip": "7"})
+    index = NearDuplicateIndex()
+    index.add(1, 2, *engine.near_duplicate_key(before), {"cp": 1234567}, "", None)
+
+    assert index.find(1, 2, *engine.near_duplicate_key(after)) is None
+
+
+@pytest.mark.parametrize("field", sorted(ONE_DIGIT))
+def test_single_digit_change_is_not_a_near_duplicate(engine, field):
+    index = NearDuplicateIndex()
+    index.add(1, 2, *engine.near_duplicate_key(_card(engine, BASE)), {}, "", None)
+
+    for changed in ONE_DIGIT[field]:
+        after = _card(engine, {**BASE, field: changed})
+        assert index.find(1, 2, *engine.near_duplicate_key(after)) is None, changed
+
+
+def test_reencoded_card_still_matches(engine):
+    values = BASE
+    index = NearDuplicateIndex()
+    index.add(1, 2, *engine.near_duplicate_key(_card(engine, values)), {"cp": 1234567}, "", None)
+
+    for quality, scale in ((60, 1.0), (85, 0.9), (70, 0.6)):
+        reupload = _card(engine, values, quality=quality, scale=scale)
+        hit = index.find(1, 2, *engine.near_duplicate_key(reupload))
+        assert hit is not None and hit.parsed == {"cp": 1234567}
+
+
+def test_expired_entries_are_ignored(engine):
+    key = engine.near_duplicate_key(_card(engine, BASE))
+    index = NearDuplicateIndex(ttl=60)
+    index.add(1, 2, *key, {}, "", None)
+    assert index.find(1, 2, *key) is not None
+
+    index._guilds[1][0].indexed_at = time.time() - 61
+    assert index.find(1, 2, *key) is None
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+
+aiosqlite = pytest.importorskip("aiosqlite")
+
+import database  # noqa: E402
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / "marcia.db")
+    monkeypatch.setattr(database, "DB_PATH", path)
+    asyncio.run(database.init_db())
+    return path
+
+
+async def _point_snapshot_at(db_path: str, guild_id: int, user_id: int, image_path: str) -> None:
+    async with aiosqlite.connect(db_path) as db:
+        await db.execute(
+            "INSERT INTO profile_snapshots (guild_id, user_id, local_image_path, last_updated) VALUES (?, ?, ?, 1)",
+            (guild_id, user_id, image_path),
+        )
+        await db.commit()
+
+
+def test_budget_eviction_keeps_current_snapshot_images(db_path):
+    async def scenario():
+        await database.record_profile_image(1, 10, "a" * 64, "/store/a.png", 100)
+        await _point_snapshot_at(db_path, 1, 10, "/store/a.png")
+        await database.record_profile_image(1, 20, "b" * 64, "/store/b.png", 100)
+
+        evicted = await database.record_profile_image(1, 30, "c" * 64, "/store/c.png", 100, max_bytes=150)
+
+        # b is the only blob no snapshot points at; a stays even though it is older.
+        assert evicted == ["/store/b.png"]
+        assert await database.get_profile_image_blob("a" * 64) is not None
+
+    asyncio.run(scenario())
+
+
+def test_history_trim_keeps_the_snapshot_screenshot(db_path):
+    async def scenario():
+        await database.record_profile_image(1, 10, "0" * 64, "/store/0.png", 10, history=2)
+        await _point_snapshot_at(db_path, 1, 10, "/store/0.png")
+        evicted = []
+        # Later uploads were rejected, so the snapshot still points at the first one.
+        for n in range(1, 4):
+            evicted += await database.record_profile_image(1, 10, str(n) * 64, f"/store/{n}.png", 10, history=2)
+
+        assert "/store/0.png" not in evicted
+        assert evicted == ["/store/1.png"]
+
+    asyncio.run(scenario())
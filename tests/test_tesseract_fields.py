@@ -0,0 +1,24 @@
+from ocr.engine import interpret_tesseract_fields
+
+
+def test_single_button_read_gives_no_ownership_verdict():
+    parsed = interpret_tesseract_fields({"account_btn": ("Account", 0.91), "cp": ("1,234,567", 0.88)})
+
+    assert parsed["ownership_verified"] is None
+    assert parsed["cp"] == 1234567
+
+
+def test_both_button_reads_verify_ownership():
+    parsed = interpret_tesseract_fields({"account_btn": ("Account", 0.91), "settings_btn": ("Settings", 0.77)})
+
+    assert parsed["ownership_verified"] is True
+
+
+def test_both_buttons_read_but_one_too_weak_fails_ownership():
+    parsed = interpret_tesseract_fields({"account_btn": ("Account", 0.91), "settings_btn": ("~", 0.10)})
+
+    assert parsed["ownership_verified"] is False
+
+
+def test_no_button_reads_leave_ownership_unknown():
+    assert interpret_tesseract_fields({"kills": ("4,200", 0.8)})["ownership_verified"] is None
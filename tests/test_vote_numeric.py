@@ -0,0 +1,60 @@
+from ocr.engine import EASYOCR_MIN_CONF, vote_numeric
+
+
+def test_correlated_low_confidence_reads_stay_below_threshold():
+    detections = {"cp": ("1,234,567", 0.12)}
+    for variant in ("otsu", "inverted", "sharpened"):
+        detections[f"cp#{variant}"] = ("1,234,567", 0.12)
+
+    merged, overrides = vote_numeric(detections)
+
+    assert merged["cp"] == ("1,234,567", 0.12)
+    assert merged["cp"][1] < EASYOCR_MIN_CONF
+    assert overrides == 0
+
+
+def test_most_agreed_digits_win_over_one_confident_read():
+    merged, overrides = vote_numeric(
+        {
+            "kills": ("234,567", 0.30),
+            "kills#otsu": ("284,567", 0.95),
+            "kills#inverted": ("234,567", 0.40),
+            "kills#sharpened": ("234,567", 0.35),
+        }
+    )
+
+    assert merged["kills"] == ("234,567", 0.40)
+    assert overrides == 0
+
+
+def test_single_variant_cannot_override_base_reading():
+    merged, overrides = vote_numeric(
+        {
+            "likes": ("12,345", 0.20),
+            "likes#otsu": ("12,845", 0.90),
+            "likes#inverted": ("2,345", 0.50),
+        }
+    )
+
+    assert merged["likes"] == ("12,345", 0.20)
+    assert overrides == 0
+
+
+def test_agreeing_variants_rescue_low_confidence_base():
+    merged, overrides = vote_numeric(
+        {
+            "cp": ("1,234,561", 0.20),
+            "cp#otsu": ("1,234,567", 0.60),
+            "cp#sharpened": ("1,234,567", 0.50),
+        }
+    )
+
+    assert merged["cp"] == ("1,234,567", 0.60)
+    assert overrides == 1
+
+
+def test_variant_fills_missing_base_and_non_numeric_fields_pass_through():
+    merged, overrides = vote_numeric({"vip#otsu": ("VIP 12", 0.70), "name": ("Survivor", 0.90)})
+
+    assert merged == {"vip": ("VIP 12", 0.70), "name": ("Survivor", 0.90)}
+    assert overrides == 1
@@ -6,7 +6,13 @@ This package contains shared helper functions and constants used across the bot:
 - time_utils: Game timezone helpers (UTC-2 conversion)
 - bug_logging: Error logging and Discord notification system
 - patch_notes: Release notes persistence and formatting
+- command_sync: Slash command tree fingerprinting to skip redundant syncs
+- process_stats: RSS helpers for boot and health reports
+- boot_timeline: Startup phase profiler and boot timeline report
+- loop_monitor: Event-loop lag watchdog with blocking-call stack capture
+- jsonio: Pluggable JSON backend (stdlib or orjson)
+- leaderboard_export: Streaming gzip TSV leaderboard exports split under the upload cap
 """
 
-__all__ = ['assets', 'time_utils', 'bug_logging', 'patch_notes']
+__all__ = ['assets', 'time_utils', 'bug_logging', 'patch_notes', 'command_sync', 'process_stats', 'boot_timeline', 'loop_monitor', 'jsonio', 'leaderboard_export']
 
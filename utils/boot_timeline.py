@@ -0,0 +1,147 @@
+"""
+Boot timeline recorder.
+
+Timestamps each startup phase (database init, view registration, cog loads,
+command sync) plus the ready work cogs kick off after connecting, then writes
+``data/logs/boot_timeline.json`` and a condensed log summary so deploys show
+where time-to-first-response goes.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+from utils import jsonio
+
+logger = logging.getLogger("MarciaOS.Boot")
+
+DEFAULT_REPORT_PATH = Path("data/logs/boot_timeline.json")
+
+
+class BootTimeline:
+    """Collect named spans and instant marks relative to process start."""
+
+    def __init__(self, origin: float | None = None, *, report_path: Path | str = DEFAULT_REPORT_PATH):
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.started_at = datetime.now(timezone.utc)
+        self.report_path = Path(report_path)
+        self.spans: list[dict[str, Any]] = []
+        self.marks: dict[str, float] = {}
+        self._open = 0
+        self._report_written = False
+        self._closed = False
+
+    def _offset(self, value: float | None = None) -> float:
+        return round((value if value is not None else time.perf_counter()) - self.origin, 4)
+
+    @contextmanager
+    def span(self, name: str, *, kind: str = "phase", **meta: Any) -> Iterator[dict[str, Any]]:
+        """Time a block; usable inside coroutines since it never awaits.
+
+        Spans opened after the report is finalized are not recorded, so reconnects
+        and later channel backfills do not grow the timeline forever.
+        """
+        if self._closed:
+            yield {}
+            return
+
+        entry: dict[str, Any] = {"name": name, "kind": kind, "start": self._offset(), **meta}
+        started = time.perf_counter()
+        self.spans.append(entry)
+        self._open += 1
+        try:
+            yield entry
+            entry.setdefault("status", "ok")
+        except asyncio.CancelledError:
+            entry["status"] = "cancelled"
+            raise
+        except Exception as exc:
+            entry["status"] = f"error: {type(exc).__name__}"
+            raise
+        finally:
+            entry["seconds"] = round(time.perf_counter() - started, 4)
+            self._open -= 1
+
+    def record(self, name: str, *, start: float, seconds: float, kind: str = "phase", **meta: Any) -> None:
+        """Add an already-measured span (``start`` is a ``perf_counter`` value)."""
+        if self._closed:
+            return
+        self.spans.append(
+            {"name": name, "kind": kind, "start": self._offset(start), "seconds": round(seconds, 4), "status": "ok", **meta}
+        )
+
+    def mark(self, name: str) -> None:
+        """Record an instant event such as ``gateway_ready``; the first call wins."""
+        if name in self.marks:
+            return
+        self.marks[name] = self._offset()
+        if self._report_written:
+            self.write_report()
+
+    @property
+    def idle(self) -> bool:
+        return self._open == 0
+
+    async def finalize(self, *, grace: float = 5.0, timeout: float = 300.0) -> None:
+        """Wait for tracked ready work to settle, then write the report."""
+        await asyncio.sleep(grace)
+        deadline = time.perf_counter() + timeout
+        while not self.idle and time.perf_counter() < deadline:
+            await asyncio.sleep(1)
+        self._closed = True
+        self.write_report()
+        self.log_summary()
+
+    def as_dict(self) -> dict[str, Any]:
+        groups: dict[str, dict[str, Any]] = {}
+        for entry in self.spans:
+            group = groups.setdefault(
+                entry["name"], {"name": entry["name"], "kind": entry["kind"], "count": 0, "total": 0.0, "max": 0.0}
+            )
+            seconds = entry.get("seconds")
+            group["count"] += 1
+            if seconds is not None:
+                group["total"] = round(group["total"] + seconds, 4)
+                group["max"] = max(group["max"], seconds)
+
+        return {
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "marks": dict(self.marks),
+            "open_spans": self._open,
+            "spans": list(self.spans),
+            "summary": sorted(groups.values(), key=lambda g: g["total"], reverse=True),
+        }
+
+    def write_report(self) -> None:
+        try:
+            self.report_path.parent.mkdir(parents=True, exist_ok=True)
+            self.report_path.write_text(jsonio.dumps(self.as_dict(), indent=2, default=str), encoding="utf-8")
+            self._report_written = True
+        except Exception:
+            logger.exception("Failed to write boot timeline to %s", self.report_path)
+
+    def log_summary(self, top: int = 10) -> None:
+        report = self.as_dict()
+        marks = ", ".join(f"{name} @ {offset:.2f}s" for name, offset in report["marks"].items())
+        logger.info("⏱️ Boot timeline (%s) → %s", marks or "no marks", self.report_path)
+        for group in report["summary"][:top]:
+            suffix = f" ×{group['count']} (max {group['max']:.2f}s)" if group["count"] > 1 else ""
+            logger.info("   %-28s %-10s %7.2fs%s", group["name"], group["kind"], group["total"], suffix)
+        if report["open_spans"]:
+            logger.info("   %d ready task(s) still running when the report was written.", report["open_spans"])
+
+
+def boot_span(bot: Any, name: str, **meta: Any):
+    """Return a timeline span for ``bot`` or a no-op context when none is attached."""
+    timeline = getattr(bot, "boot_timeline", None)
+    if timeline is None:
+        return nullcontext()
+    return timeline.span(name, kind="ready_task", **meta)
+
+
+__all__ = ["BootTimeline", "boot_span"]
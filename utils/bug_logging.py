@@ -2,10 +2,10 @@
 Centralized bug/error logging utilities.
 - Writes structured JSON lines to data/logs/bug_events.log
 - Optionally mirrors critical errors to a Discord channel via BUG_LOG_CHANNEL_ID env var
+- Records event-loop stalls sampled by utils.loop_monitor
 """
 from __future__ import annotations
 
-import json
 import logging
 import os
 import traceback
@@ -15,6 +15,8 @@ from typing import Any
 
 import discord
 
+from utils import jsonio
+
 logger = logging.getLogger("MarciaOS.BugLog")
 
 LOG_FILE = Path("data/logs/bug_events.log")
@@ -46,7 +48,7 @@ def _serialize_error(error: Exception) -> dict[str, Any]:
 def _write_local_log(payload: dict[str, Any]) -> None:
     try:
         with LOG_FILE.open("a", encoding="utf-8") as fp:
-            fp.write(json.dumps(payload, ensure_ascii=False) + "\n")
+            fp.write(jsonio.dumps(payload, ensure_ascii=False) + "\n")
     except Exception:
         logger.exception("Failed to persist bug log payload")
 
@@ -128,4 +130,32 @@ async def log_command_exception(
     await _mirror_to_discord(bot, payload)
 
 
-__all__ = ["log_command_exception"]
+def log_event_loop_stall(
+    stalled_seconds: float,
+    *,
+    call_site: str,
+    stack: list[str],
+) -> None:
+    """Record a blocked event loop with the call site sampled by the lag watchdog.
+
+    Runs on the watchdog thread, so it only writes the local log; mirroring to
+    Discord would need the (blocked) loop.
+    """
+    payload = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "source": "event-loop-lag",
+        "guild_id": None,
+        "channel_id": None,
+        "user_id": None,
+        "command": None,
+        "note": call_site,
+        "error": {
+            "type": "EventLoopStall",
+            "message": f"Event loop blocked for {stalled_seconds * 1000:.0f}ms at {call_site}",
+            "trace": stack,
+        },
+    }
+    _write_local_log(payload)
+
+
+__all__ = ["log_command_exception", "log_event_loop_stall"]
@@ -0,0 +1,107 @@
+"""
+Slash command sync bookkeeping.
+
+Global ``tree.sync()`` calls are slow and rate-limited, so the bot only pushes
+its command tree when the serialized payload actually changed. The last synced
+fingerprint lives in ``data/command_sync.json`` alongside how long that sync
+took, which lets boot logs report the time saved by skipping it.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from discord import app_commands
+
+logger = logging.getLogger("MarciaOS.CommandSync")
+
+DEFAULT_STATE_PATH = Path("data/command_sync.json")
+
+
+@dataclass
+class CommandSyncState:
+    """Details about the last successful global sync."""
+
+    fingerprint: str
+    application_id: Optional[int]
+    command_count: int
+    synced_at: str
+    sync_seconds: float
+
+
+def tree_fingerprint(tree: app_commands.CommandTree) -> tuple[str, int]:
+    """Return a stable SHA-256 of the global command payload and its command count."""
+    payload = [command.to_dict(tree) for command in tree.get_commands()]
+    payload.sort(key=lambda item: (item.get("type", 1), item.get("name", "")))
+    blob = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest(), len(payload)
+
+
+def load_sync_state(path: Path | str = DEFAULT_STATE_PATH) -> CommandSyncState | None:
+    """Read the last recorded sync, ignoring missing or malformed files."""
+    path = Path(path)
+    if not path.exists():
+        return None
+
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return CommandSyncState(
+            fingerprint=str(data["fingerprint"]),
+            application_id=data.get("application_id"),
+            command_count=int(data.get("command_count", 0)),
+            synced_at=str(data.get("synced_at", "")),
+            sync_seconds=float(data.get("sync_seconds", 0.0)),
+        )
+    except Exception:
+        logger.warning("Ignoring unreadable command sync state at %s", path)
+        return None
+
+
+def save_sync_state(
+    fingerprint: str,
+    *,
+    application_id: int | None,
+    command_count: int,
+    sync_seconds: float,
+    path: Path | str = DEFAULT_STATE_PATH,
+) -> CommandSyncState:
+    """Persist the fingerprint of a tree that was just synced."""
+    state = CommandSyncState(
+        fingerprint=fingerprint,
+        application_id=application_id,
+        command_count=command_count,
+        synced_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        sync_seconds=round(sync_seconds, 3),
+    )
+    path = Path(path)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(asdict(state), indent=2), encoding="utf-8")
+    except Exception:
+        logger.exception("Failed to persist command sync state to %s", path)
+    return state
+
+
+def needs_sync(
+    state: CommandSyncState | None, fingerprint: str, application_id: int | None
+) -> bool:
+    """True when the stored fingerprint no longer matches this bot's tree."""
+    if state is None:
+        return True
+    if state.application_id is not None and state.application_id != application_id:
+        return True
+    return state.fingerprint != fingerprint
+
+
+__all__ = [
+    "CommandSyncState",
+    "load_sync_state",
+    "needs_sync",
+    "save_sync_state",
+    "tree_fingerprint",
+]
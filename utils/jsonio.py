@@ -0,0 +1,90 @@
+"""
+Pluggable JSON backend.
+
+Hot paths (bug logs, archive dumps, trade seed, patch notes, OCR templates) call
+these helpers instead of ``json`` directly. ``MARCIA_JSON_BACKEND`` picks the
+codec: ``stdlib`` (default), ``orjson``, or ``auto`` (orjson when installed).
+Output is always ``str`` so callers can keep writing text files.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import os
+from importlib.util import find_spec
+from typing import IO, Any, Callable
+
+logger = logging.getLogger("MarciaOS.JSON")
+
+_BACKENDS = ("stdlib", "orjson")
+_orjson = None
+_backend = "stdlib"
+
+
+def set_backend(name: str) -> str:
+    """Switch codecs at runtime; unknown or missing backends fall back to stdlib."""
+    global _backend, _orjson
+
+    name = (name or "stdlib").strip().lower()
+    if name == "auto":
+        name = "orjson" if find_spec("orjson") else "stdlib"
+    if name not in _BACKENDS:
+        logger.warning("Unknown JSON backend %r; using stdlib", name)
+        name = "stdlib"
+    if name == "orjson":
+        if not find_spec("orjson"):
+            logger.warning("orjson is not installed; using stdlib JSON")
+            name = "stdlib"
+        elif _orjson is None:
+            import orjson
+
+            _orjson = orjson
+
+    _backend = name
+    return _backend
+
+
+def backend_name() -> str:
+    return _backend
+
+
+def dumps(
+    obj: Any,
+    *,
+    indent: int | None = None,
+    sort_keys: bool = False,
+    ensure_ascii: bool = True,
+    default: Callable[[Any], Any] | None = None,
+) -> str:
+    """Encode ``obj``; orjson renders any ``indent`` as two spaces and never escapes non-ASCII."""
+    if _backend == "orjson":
+        option = _orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= _orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= _orjson.OPT_SORT_KEYS
+        return _orjson.dumps(obj, default=default, option=option).decode("utf-8")
+
+    return json.dumps(
+        obj, indent=indent, sort_keys=sort_keys, ensure_ascii=ensure_ascii, default=default
+    )
+
+
+def loads(data: str | bytes) -> Any:
+    if _backend == "orjson":
+        return _orjson.loads(data)
+    return json.loads(data)
+
+
+def dump(obj: Any, fp: IO[str], **kwargs: Any) -> None:
+    fp.write(dumps(obj, **kwargs))
+
+
+def load(fp: IO[str]) -> Any:
+    return loads(fp.read())
+
+
+set_backend(os.getenv("MARCIA_JSON_BACKEND", "stdlib"))
+
+
+__all__ = ["backend_name", "dump", "dumps", "load", "loads", "set_backend"]
@@ -0,0 +1,163 @@
+"""
+Streaming leaderboard exports.
+
+Rows arrive in chunks from a database cursor and are written straight into
+gzip-compressed TSV parts inside a temporary directory, so memory stays flat no
+matter how many survivors are ranked. Each part is a complete ``.tsv.gz`` with
+its own header row. When the next chunk would push the current part past the
+attachment budget, the writer starts a new part.
+"""
+from __future__ import annotations
+
+import asyncio
+import gzip
+import os
+import shutil
+import tempfile
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import AsyncIterator, Callable, Iterable, Sequence
+
+# Discord's smallest upload cap (DMs from non-Nitro users); leave headroom for multipart overhead.
+DEFAULT_PART_BYTES = int(float(os.getenv("LEADERBOARD_EXPORT_PART_MB", "8")) * 1024 * 1024)
+EXPORT_CHUNK_ROWS = 1000
+MAX_ATTACHMENTS_PER_MESSAGE = 10
+
+
+def _cell(value) -> str:
+    if value is None:
+        return "—"
+    # Tabs/newlines inside player names would shift columns in spreadsheet imports.
+    return str(value).replace("\t", " ").replace("\n", " ").replace("\r", " ")
+
+
+def format_tsv(rows: Iterable[Sequence]) -> bytes:
+    return "".join("\t".join(map(_cell, row)) + "\n" for row in rows).encode("utf-8")
+
+
+class ChunkedGzipWriter:
+    """Write TSV chunks into ``<stem>.tsv.gz`` parts that each stay under ``part_bytes``."""
+
+    def __init__(self, directory: Path, stem: str, header: Sequence[str], *, part_bytes: int = DEFAULT_PART_BYTES):
+        self.directory = Path(directory)
+        self.stem = stem
+        self.header = format_tsv([header])
+        self.part_bytes = part_bytes
+        self.parts: list[Path] = []
+        self.rows = 0
+        self._raw = None
+        self._gzip: gzip.GzipFile | None = None
+        self._part_rows = 0
+        self._last_chunk_bytes = 0
+
+    def _open_part(self) -> None:
+        path = self.directory / f"{self.stem}.part{len(self.parts) + 1}.tsv.gz"
+        self._raw = path.open("wb")
+        self._gzip = gzip.GzipFile(filename=f"{self.stem}.tsv", mode="wb", fileobj=self._raw, compresslevel=6)
+        self._gzip.write(self.header)
+        self._part_rows = 0
+        self.parts.append(path)
+
+    def _close_part(self) -> None:
+        if self._gzip is not None:
+            self._gzip.close()
+            self._raw.close()
+            self._gzip = self._raw = None
+
+    def write_chunk(self, rows: Sequence[Sequence]) -> None:
+        """Compress one chunk, rolling to a new part first if it would not fit."""
+        if not rows:
+            return
+        if self._gzip is None:
+            self._open_part()
+        elif self._part_rows and self._raw.tell() + self._last_chunk_bytes > self.part_bytes:
+            self._close_part()
+            self._open_part()
+
+        before = self._raw.tell()
+        self._gzip.write(format_tsv(rows))
+        # A sync flush pushes buffered deflate output to disk so tell() is the true compressed size.
+        self._gzip.flush(zlib.Z_SYNC_FLUSH)
+        self._last_chunk_bytes = self._raw.tell() - before
+        self._part_rows += len(rows)
+        self.rows += len(rows)
+
+    def close(self) -> list[Path]:
+        self._close_part()
+        if len(self.parts) == 1:
+            # A single part keeps the plain name.
+            single = self.parts[0].with_name(f"{self.stem}.tsv.gz")
+            self.parts[0].rename(single)
+            self.parts = [single]
+        return self.parts
+
+
+@dataclass
+class LeaderboardExport:
+    """Compressed export parts on disk; call ``cleanup()`` once they are sent."""
+
+    directory: Path
+    parts: list[Path]
+    rows: int
+    note: str
+    filenames: list[str] = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.filenames = [part.name for part in self.parts]
+
+    @property
+    def total_bytes(self) -> int:
+        return sum(part.stat().st_size for part in self.parts)
+
+    def batches(self, size: int = MAX_ATTACHMENTS_PER_MESSAGE) -> list[list[Path]]:
+        return [self.parts[i : i + size] for i in range(0, len(self.parts), size)]
+
+    def cleanup(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+async def stream_export(
+    chunks: AsyncIterator[list],
+    *,
+    stem: str,
+    header: Sequence[str],
+    render: Callable[[int, object], Sequence],
+    note: Callable[[int], str],
+    part_bytes: int = DEFAULT_PART_BYTES,
+) -> LeaderboardExport | None:
+    """Render each cursor chunk in the loop, compress it in a thread, and return the parts.
+
+    ``render(rank, row)`` turns one database row into TSV cells; ``note(rows)``
+    builds the DM text once the total is known. Returns None when no rows exist.
+    """
+    directory = Path(tempfile.mkdtemp(prefix="leaderboard_export_"))
+    writer = ChunkedGzipWriter(directory, stem, header, part_bytes=part_bytes)
+    rank = 0
+    try:
+        async for chunk in chunks:
+            rendered = []
+            for row in chunk:
+                rank += 1
+                rendered.append(render(rank, row))
+            await asyncio.to_thread(writer.write_chunk, rendered)
+        parts = await asyncio.to_thread(writer.close)
+    except BaseException:
+        writer._close_part()
+        shutil.rmtree(directory, ignore_errors=True)
+        raise
+
+    if not writer.rows:
+        shutil.rmtree(directory, ignore_errors=True)
+        return None
+    return LeaderboardExport(directory=directory, parts=parts, rows=writer.rows, note=note(writer.rows))
+
+
+__all__ = [
+    "ChunkedGzipWriter",
+    "DEFAULT_PART_BYTES",
+    "EXPORT_CHUNK_ROWS",
+    "LeaderboardExport",
+    "format_tsv",
+    "stream_export",
+]
@@ -0,0 +1,169 @@
+"""
+Event-loop lag watchdog.
+
+A probe coroutine sleeps on a fixed interval and records how late it wakes up
+(scheduling lag). A helper thread watches the probe's heartbeat; when the loop
+stalls past the threshold it samples the loop thread's stack so the blocking
+call site lands in the bug log instead of showing up as a vague slow command.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from pathlib import Path
+
+from utils.bug_logging import log_event_loop_stall
+
+logger = logging.getLogger("MarciaOS.LoopMonitor")
+
+_REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def _repo_call_site(frames: list[traceback.FrameSummary]) -> str | None:
+    """Return the innermost frame that lives in this repo (not asyncio/discord internals)."""
+    for frame in reversed(frames):
+        path = Path(frame.filename)
+        try:
+            relative = path.resolve().relative_to(_REPO_ROOT)
+        except ValueError:
+            continue
+        if relative.parts and relative.parts[0] in {".venv", "venv", ".local"}:
+            continue
+        return f"{relative.as_posix()}:{frame.lineno} in {frame.name}"
+    return None
+
+
+class LoopLagMonitor:
+    """Measure loop scheduling lag and capture stacks of calls that block it."""
+
+    def __init__(
+        self,
+        *,
+        interval: float = 0.25,
+        threshold: float = 0.25,
+        sample_size: int = 2400,
+    ):
+        self.interval = interval
+        self.threshold = threshold
+        self.samples: deque[float] = deque(maxlen=sample_size)
+        self.stalls = 0
+        self.call_sites: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._heartbeat = time.monotonic()
+        self._beat = 0
+        self._captured_beat = -1
+        self._loop_thread_id: int | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    @classmethod
+    def from_env(cls) -> "LoopLagMonitor | None":
+        """Build a monitor from ``MARCIA_LOOP_MONITOR`` / ``MARCIA_LOOP_LAG_THRESHOLD_MS``."""
+        if os.getenv("MARCIA_LOOP_MONITOR", "1").lower() in {"0", "false", "no"}:
+            return None
+        try:
+            threshold_ms = float(os.getenv("MARCIA_LOOP_LAG_THRESHOLD_MS", "250"))
+        except ValueError:
+            logger.warning("Invalid MARCIA_LOOP_LAG_THRESHOLD_MS; using 250")
+            threshold_ms = 250.0
+        return cls(threshold=max(0.01, threshold_ms / 1000))
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start the probe on the running loop and the watchdog thread."""
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._probe())
+        self._thread = threading.Thread(target=self._watch, name="marcia-loop-watchdog", daemon=True)
+        self._thread.start()
+        logger.info(
+            "⏱️ Loop lag monitor armed (interval %.0fms, threshold %.0fms)",
+            self.interval * 1000,
+            self.threshold * 1000,
+        )
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    async def _probe(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            with self._lock:
+                self.samples.append(lag)
+                self._heartbeat = time.monotonic()
+                self._beat += 1
+
+    def _watch(self) -> None:
+        poll = max(0.01, self.threshold / 4)
+        while not self._stop.wait(poll):
+            with self._lock:
+                stalled_for = time.monotonic() - self._heartbeat - self.interval
+                beat = self._beat
+            if stalled_for < self.threshold or beat == self._captured_beat:
+                continue
+
+            # One capture per stall; the heartbeat moving again re-arms the watchdog.
+            self._captured_beat = beat
+            self._capture(stalled_for)
+
+    def _capture(self, stalled_for: float) -> None:
+        frame = sys._current_frames().get(self._loop_thread_id or -1)
+        if frame is None:
+            return
+        frames = traceback.extract_stack(frame)
+        call_site = _repo_call_site(frames) or "unknown"
+        with self._lock:
+            self.stalls += 1
+            self.call_sites[call_site] += 1
+
+        logger.warning("🐢 Event loop blocked for %.0fms at %s", stalled_for * 1000, call_site)
+        log_event_loop_stall(
+            stalled_for,
+            call_site=call_site,
+            stack=traceback.format_list(frames[-15:]),
+        )
+
+    def snapshot(self) -> dict:
+        """Return lag percentiles (seconds), stall count, and the noisiest call sites."""
+        with self._lock:
+            ordered = sorted(self.samples)
+            top_sites = self.call_sites.most_common(5)
+            stalls = self.stalls
+        return {
+            "samples": len(ordered),
+            "p50": _percentile(ordered, 50),
+            "p90": _percentile(ordered, 90),
+            "p99": _percentile(ordered, 99),
+            "max": ordered[-1] if ordered else 0.0,
+            "stalls": stalls,
+            "top_call_sites": top_sites,
+        }
+
+
+__all__ = ["LoopLagMonitor"]
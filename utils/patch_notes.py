@@ -8,12 +8,13 @@ hard-coded lists inside the cog. Notes are lightweight dictionaries:
 """
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Iterable, List, Optional
 
+from utils import jsonio
+
 DEFAULT_PATCH_PATH = Path("data/patch_notes.json")
 
 
@@ -39,7 +40,7 @@ class PatchNotesStore:
             return []
 
         try:
-            data = json.loads(self.path.read_text())
+            data = jsonio.loads(self.path.read_text(encoding="utf-8"))
         except Exception:
             return []
 
@@ -91,4 +92,4 @@ class PatchNotesStore:
             for n in notes
             if n.note
         ]
-        self.path.write_text(json.dumps(serialisable, indent=2))
+        self.path.write_text(jsonio.dumps(serialisable, indent=2), encoding="utf-8")
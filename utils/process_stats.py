@@ -0,0 +1,52 @@
+"""
+Lightweight process metrics used by boot and health reports.
+
+Only the standard library is used so the helpers work on lite installs.
+"""
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+_STATM = Path("/proc/self/statm")
+
+
+def current_rss_bytes() -> int | None:
+    """Return the resident set size of this process, or None when unknown."""
+    try:
+        resident_pages = int(_STATM.read_text().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except Exception:
+        pass
+
+    # Fallback: peak RSS is the best portable approximation outside Linux.
+    return peak_rss_bytes()
+
+
+def peak_rss_bytes() -> int | None:
+    """Return the peak resident set size of this process, or None when unknown."""
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - Windows
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS reports bytes.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def format_bytes(value: int | None) -> str:
+    """Human-friendly byte count like ``12.3 MB``; signed values keep their sign."""
+    if value is None:
+        return "n/a"
+    sign = "-" if value < 0 else ""
+    size = float(abs(value))
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{sign}{size:.1f} {unit}" if unit != "B" else f"{sign}{int(size)} B"
+        size /= 1024
+    return f"{sign}{size:.1f} GB"
+
+
+__all__ = ["current_rss_bytes", "format_bytes", "peak_rss_bytes"]